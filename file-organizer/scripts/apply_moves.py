@@ -0,0 +1,488 @@
+"""
+Execute an approved move plan with a journal, so it can be undone or resumed.
+
+A plan is JSON: `{"moves": [{"src": ..., "dst": ...}, ...]}` (what
+`catalog.py propose` writes) or a bare list of such moves. Paths may be relative
+to the plan file.
+
+1. `validate` checks the whole plan before anything is touched: missing sources,
+   destinations that already exist or are used twice, moves that depend on each
+   other, and directories moved across filesystems.
+2. `apply` creates the destination folders, then renames same-filesystem moves
+   in journaled batches, then copies cross-filesystem files in a thread pool. Each
+   copy is hashed while written, re-read and compared before the source is removed.
+3. Every step is recorded in `<plan>.journal.jsonl` (fsynced per batch). Running
+   `apply` again after a crash reconciles half-finished steps and continues;
+   `undo` moves everything back and removes the folders it created.
+
+The report lists throughput and the slowest operations.
+
+Usage:
+  python apply_moves.py validate plan.json
+  python apply_moves.py apply plan.json [--dry-run] [--workers 4] [--keep-going] [--json]
+  python apply_moves.py undo plan.json
+  python apply_moves.py status plan.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+RENAME_BATCH_SIZE = 256
+COPY_CHUNK_SIZE = 1024 * 1024
+SLOWEST_REPORTED = 10
+
+
+class PlanError(Exception):
+    """The plan file cannot be read, or its journal belongs to another plan."""
+
+
+def load_plan(path):
+    """[(src, dst)] with absolute paths, in plan order."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise PlanError(f"cannot read plan {path}: {e}") from e
+    moves = data.get("moves") if isinstance(data, dict) else data
+    if not isinstance(moves, list):
+        raise PlanError(f"{path}: expected a list of moves or an object with a `moves` list")
+    base = os.path.dirname(os.path.abspath(path))
+    out = []
+    for i, move in enumerate(moves):
+        if not isinstance(move, dict) or not move.get("src") or not move.get("dst"):
+            raise PlanError(f"{path}: move #{i} needs `src` and `dst`")
+        out.append(tuple(os.path.normpath(os.path.join(base, os.path.expanduser(move[k]))) for k in ("src", "dst")))
+    return out
+
+
+def plan_id(moves):
+    return hashlib.sha256(json.dumps(moves, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _existing_ancestor(path):
+    while not os.path.exists(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def validate(moves):
+    """
+    Returns (ops, problems). Each op is {"i", "src", "dst", "kind" (rename/copy), "size", "is_dir"};
+    `problems` is a list of (move index, message), empty when the plan can run.
+    """
+    ops, problems = [], []
+    sources = {}
+    targets = {}
+    for i, (src, dst) in enumerate(moves):
+        if src in sources:
+            problems.append((i, f"{src} is already moved by #{sources[src]}"))
+            continue
+        sources[src] = i
+        if dst in targets:
+            problems.append((i, f"{dst} is also the destination of #{targets[dst]}"))
+            continue
+        targets[dst] = i
+        if src == dst:
+            continue
+        try:
+            st = os.lstat(src)
+        except OSError:
+            problems.append((i, f"source missing: {src}"))
+            continue
+        is_dir = os.path.isdir(src) and not os.path.islink(src)
+        if is_dir and (dst + os.sep).startswith(src + os.sep):
+            problems.append((i, f"cannot move {src} into itself"))
+            continue
+        if os.path.lexists(dst):
+            problems.append((i, f"destination exists: {dst}"))
+            continue
+        kind = "rename" if os.stat(_existing_ancestor(os.path.dirname(dst))).st_dev == st.st_dev else "copy"
+        if kind == "copy" and is_dir:
+            problems.append((i, f"moving directory {src} across filesystems is not supported; move its files instead"))
+            continue
+        if kind == "copy" and not os.path.isfile(src):
+            problems.append((i, f"only regular files can be copied across filesystems: {src}"))
+            continue
+        ops.append({"i": i, "src": src, "dst": dst, "kind": kind, "size": st.st_size, "is_dir": is_dir})
+
+    # A destination that another move vacates (or a chain through moved folders) needs ordering
+    for op in ops:
+        if op["dst"] in sources:
+            problems.append((op["i"], f"{op['dst']} is the source of #{sources[op['dst']]}; split the plan in two"))
+        parent = os.path.dirname(op["src"])
+        while parent != os.path.dirname(parent):
+            if parent in sources and sources[parent] != op["i"]:
+                problems.append((op["i"], f"{op['src']} is inside {parent}, which #{sources[parent]} moves"))
+                break
+            parent = os.path.dirname(parent)
+    return ops, problems
+
+
+class Journal:
+    """Append-only JSON lines: a header with the plan id, then per-op state records."""
+
+    def __init__(self, path, plan_hash):
+        self.path = path
+        self.plan_hash = plan_hash
+        self.states = {}
+        self.created_dirs = []
+        if os.path.exists(path):
+            with open(path, "r+", encoding="utf-8") as f:
+                text = f.read()
+                if text and not text.endswith("\n"):
+                    # Torn last record from a crash: drop it so later appends stay parseable
+                    text = text[: text.rfind("\n") + 1]
+                    f.seek(0)
+                    f.truncate(len(text.encode("utf-8")))
+            records = [json.loads(line) for line in text.splitlines() if line.strip()]
+            if not records or records[0].get("plan") != plan_hash:
+                raise PlanError(f"{path} belongs to a different plan; move it away to start over")
+            for record in records[1:]:
+                if "mkdir" in record:
+                    self.created_dirs.append(record["mkdir"])
+                elif "rmdir" in record:
+                    if record["rmdir"] in self.created_dirs:
+                        self.created_dirs.remove(record["rmdir"])
+                else:
+                    self.states[record["i"]] = {**self.states.get(record["i"], {}), **record}
+        else:
+            self.write([{"plan": plan_hash, "created": time.time()}])
+
+    def write(self, records):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+            f.flush()
+            os.fsync(f.fileno())
+        for record in records:
+            if "mkdir" in record:
+                self.created_dirs.append(record["mkdir"])
+            elif "rmdir" in record:
+                self.created_dirs.remove(record["rmdir"])
+            elif "i" in record:
+                self.states[record["i"]] = {**self.states.get(record["i"], {}), **record}
+
+    def state(self, i):
+        return self.states.get(i, {}).get("state")
+
+
+def _temp_path(dst):
+    return os.path.join(os.path.dirname(dst), f".{os.path.basename(dst)}.moving")
+
+
+def _file_hash(path):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def copy_verified(src, dst):
+    """
+    Copy `src` to `dst` through a temp file, hashing while writing and re-reading the
+    copy to compare, then remove `src`. `dst` only appears once its content is verified.
+    """
+    tmp = _temp_path(dst)
+    h = hashlib.blake2b(digest_size=20)
+    with open(src, "rb") as fin, open(tmp, "wb") as fout:
+        for chunk in iter(lambda: fin.read(COPY_CHUNK_SIZE), b""):
+            h.update(chunk)
+            fout.write(chunk)
+        fout.flush()
+        os.fsync(fout.fileno())
+    try:
+        if _file_hash(tmp) != h.hexdigest():
+            raise OSError(f"verification failed for copy of {src}")
+        shutil.copystat(src, tmp)
+        if os.path.lexists(dst):
+            raise FileExistsError(f"destination appeared while copying: {dst}")
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    os.unlink(src)
+
+
+def _reconcile(op, src, dst):
+    """
+    Settle an op whose last record is `begin` (interrupted). Returns True when it
+    turns out to be complete, False when it must run again.
+    """
+    if op["kind"] == "copy":
+        tmp = _temp_path(dst)
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        if os.path.lexists(dst) and os.path.lexists(src):
+            # Copied and renamed into place, but the source was not removed yet
+            if _file_hash(src) == _file_hash(dst):
+                os.unlink(src)
+                return True
+            os.unlink(dst)
+            return False
+    return os.path.lexists(dst) and not os.path.lexists(src)
+
+
+def _make_parents(ops, journal, reverse=False):
+    missing = set()
+    for op in ops:
+        parent = os.path.dirname(op["src"] if reverse else op["dst"])
+        while not os.path.exists(parent) and parent not in missing:
+            missing.add(parent)
+            parent = os.path.dirname(parent)
+    for path in sorted(missing):
+        os.mkdir(path)
+        journal.write([{"mkdir": path}])
+    return len(missing)
+
+
+def run_ops(ops, journal, workers=4, keep_going=False, reverse=False):
+    """
+    Run pending ops (forward, or `reverse` for undo) and return the report entries.
+    Renames go first in journaled batches, then copies in parallel.
+    """
+    done_state, begin_state = ("undone", "undo-begin") if reverse else ("done", "begin")
+    timings = []
+    failures = []
+    skipped = 0
+    pending = []
+    for op in ops:
+        src, dst = (op["dst"], op["src"]) if reverse else (op["src"], op["dst"])
+        if journal.state(op["i"]) == done_state:
+            skipped += 1
+            continue
+        if journal.state(op["i"]) == begin_state and _reconcile(op, src, dst):
+            journal.write([{"i": op["i"], "state": done_state, "reconciled": True}])
+            skipped += 1
+            continue
+        pending.append((op, src, dst))
+    dirs_created = _make_parents(ops, journal, reverse) if pending else 0
+
+    def fail(op, error):
+        failures.append({"i": op["i"], "src": op["src"], "dst": op["dst"], "error": str(error)})
+        journal.write([{"i": op["i"], "state": "failed", "error": str(error)}])
+
+    renames = [p for p in pending if p[0]["kind"] == "rename"]
+    copies = [p for p in pending if p[0]["kind"] == "copy"]
+    for start in range(0, len(renames), RENAME_BATCH_SIZE):
+        if failures and not keep_going:
+            break
+        batch = renames[start:start + RENAME_BATCH_SIZE]
+        journal.write([{"i": op["i"], "state": begin_state, "kind": "rename"} for op, _, _ in batch])
+        finished = []
+        for op, src, dst in batch:
+            if failures and not keep_going:
+                break
+            t = time.perf_counter()
+            try:
+                if os.path.lexists(dst):
+                    raise FileExistsError(f"destination exists: {dst}")
+                os.rename(src, dst)
+            except OSError as e:
+                fail(op, e)
+                continue
+            timings.append((time.perf_counter() - t, op, 0))
+            finished.append({"i": op["i"], "state": done_state})
+        journal.write(finished)
+
+    def copy(item):
+        op, src, dst = item
+        t = time.perf_counter()
+        try:
+            copy_verified(src, dst)
+            return op, None, time.perf_counter() - t
+        except OSError as e:
+            return op, e, time.perf_counter() - t
+
+    if copies and (keep_going or not failures):
+        journal.write([{"i": op["i"], "state": begin_state, "kind": "copy"} for op, _, _ in copies])
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            for op, error, seconds in pool.map(copy, copies):
+                if error is not None:
+                    fail(op, error)
+                else:
+                    timings.append((seconds, op, op["size"]))
+                    journal.write([{"i": op["i"], "state": done_state}])
+
+    return {
+        "renamed": sum(1 for _, op, _ in timings if op["kind"] == "rename"),
+        "copied": sum(1 for _, op, _ in timings if op["kind"] == "copy"),
+        "bytes_copied": sum(size for _, _, size in timings),
+        "copy_seconds": sum(seconds for seconds, op, _ in timings if op["kind"] == "copy"),
+        "already_done": skipped,
+        "not_run": len(pending) - len(timings) - len(failures),
+        "dirs_created": dirs_created,
+        "failed": failures,
+        "slowest": [
+            {"i": op["i"], "kind": op["kind"], "src": op["src"], "seconds": round(seconds, 4), "bytes": size}
+            for seconds, op, size in sorted(timings, key=lambda t: -t[0])[:SLOWEST_REPORTED]
+        ],
+    }
+
+
+def _journal_path(plan_path, journal=None):
+    return journal or plan_path + JOURNAL_SUFFIX
+
+
+def _report(report, started, args):
+    elapsed = time.perf_counter() - started
+    moved = report["renamed"] + report["copied"]
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["ops_per_second"] = round(moved / elapsed, 1) if elapsed > 0 else None
+    copy_seconds = report.pop("copy_seconds")
+    # Copies overlap in the pool; wall-clock throughput is bytes over elapsed time
+    report["copy_mb_per_second"] = round(report["bytes_copied"] / elapsed / 1e6, 1) if report["bytes_copied"] and elapsed > 0 else None
+    report["copy_busy_seconds"] = round(copy_seconds, 3)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    print(
+        f"{report['renamed']} renamed, {report['copied']} copied ({report['bytes_copied']} bytes), "
+        f"{report['already_done']} already done, {len(report['failed'])} failed, {report['not_run']} not run "
+        f"in {elapsed:.2f}s ({report['ops_per_second']} ops/s"
+        + (f", {report['copy_mb_per_second']} MB/s copied)" if report["copy_mb_per_second"] else ")")
+    )
+    for f in report["failed"]:
+        print(f"  FAILED #{f['i']} {f['src']} -> {f['dst']}: {f['error']}")
+    if report["slowest"] and moved > 1:
+        print("Slowest:")
+        for s in report["slowest"]:
+            print(f"  {s['seconds']:.3f}s {s['kind']:<6} {s['src']}")
+    print(f"Journal: {report['journal']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="apply_moves.py")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    for name, help_text in (
+        ("validate", "Check the plan without changing anything."),
+        ("apply", "Run the plan (resumes from the journal if one exists)."),
+        ("undo", "Move everything the journal records back and remove created folders."),
+        ("status", "Show how far the journal got."),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("plan")
+        p.add_argument("--journal", help=f"Journal path (default: <plan>{JOURNAL_SUFFIX}).")
+        p.add_argument("--json", action="store_true")
+        if name in ("apply", "undo"):
+            p.add_argument("--workers", type=int, default=4, help="Cross-filesystem copies run in parallel.")
+            p.add_argument("--keep-going", action="store_true", help="Continue after a failed operation.")
+        if name == "apply":
+            p.add_argument("--dry-run", action="store_true", help="Validate and show what would happen.")
+    args = parser.parse_args()
+
+    try:
+        moves = load_plan(args.plan)
+    except PlanError as e:
+        print(e, file=sys.stderr)
+        return 2
+    journal_path = _journal_path(args.plan, args.journal)
+    pid = plan_id(moves)
+
+    if args.cmd in ("status", "undo"):
+        if not os.path.exists(journal_path):
+            print(f"No journal at {journal_path}; nothing has run.", file=sys.stderr)
+            return 2
+        try:
+            journal = Journal(journal_path, pid)
+        except PlanError as e:
+            print(e, file=sys.stderr)
+            return 2
+        # Rebuild ops from the plan; the kind recorded when the op began decides how to move it back
+        ops = [
+            {"i": i, "src": src, "dst": dst, "kind": journal.states.get(i, {}).get("kind", "rename"), "size": 0}
+            for i, (src, dst) in enumerate(moves)
+        ]
+        if args.cmd == "status":
+            counts = {}
+            for op in ops:
+                state = journal.state(op["i"]) or "pending"
+                counts[state] = counts.get(state, 0) + 1
+            result = {"journal": journal_path, "moves": len(ops), "states": counts, "created_dirs": len(journal.created_dirs)}
+            print(json.dumps(result, indent=2) if args.json else ", ".join(f"{n} {s}" for s, n in sorted(counts.items())))
+            return 0
+
+        started = time.perf_counter()
+        for op in ops:
+            # Settle moves interrupted mid-apply first so they are undone too
+            if journal.state(op["i"]) == "begin" and _reconcile(op, op["src"], op["dst"]):
+                journal.write([{"i": op["i"], "state": "done", "reconciled": True}])
+        undoable = [op for op in reversed(ops) if journal.state(op["i"]) in ("done", "undo-begin", "undone")]
+        for op in undoable:
+            if op["kind"] == "copy":
+                op["size"] = os.path.getsize(op["dst"]) if os.path.exists(op["dst"]) else 0
+        report = run_ops(undoable, journal, args.workers, args.keep_going, reverse=True)
+        removed = 0
+        for path in sorted(journal.created_dirs, reverse=True):
+            try:
+                os.rmdir(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue  # not empty: something else lives there now
+            journal.write([{"rmdir": path}])
+            removed += 1
+        report.update(journal=journal_path, dirs_removed=removed)
+        _report(report, started, args)
+        return 1 if report["failed"] else 0
+
+    ops, problems = validate(moves)
+    journal = None
+    if os.path.exists(journal_path):
+        try:
+            journal = Journal(journal_path, pid)
+        except PlanError as e:
+            print(e, file=sys.stderr)
+            return 2
+        # Moves the journal already settled naturally fail "source missing / destination exists"
+        settled = {i for i in journal.states if journal.state(i) in ("done", "begin", "failed")}
+        problems = [(i, message) for i, message in problems if i not in settled]
+        ops_by_index = {op["i"]: op for op in ops}
+        for i in settled:
+            if i not in ops_by_index:
+                src, dst = moves[i]
+                kind = journal.states[i].get("kind", "rename")
+                ops_by_index[i] = {"i": i, "src": src, "dst": dst, "kind": kind, "size": 0, "is_dir": False}
+        ops = [ops_by_index[i] for i in sorted(ops_by_index)]
+
+    if args.cmd == "validate" or args.dry_run or problems:
+        kinds = {}
+        for op in ops:
+            kinds[op["kind"]] = kinds.get(op["kind"], 0) + 1
+        result = {
+            "moves": len(moves),
+            "renames": kinds.get("rename", 0),
+            "copies": kinds.get("copy", 0),
+            "copy_bytes": sum(op["size"] for op in ops if op["kind"] == "copy"),
+            "problems": [{"i": i, "message": message} for i, message in problems],
+        }
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        else:
+            for i, message in problems:
+                print(f"#{i}: {message}")
+            print(
+                f"{'INVALID' if problems else 'OK'}: {result['renames']} renames, {result['copies']} cross-filesystem "
+                f"copies ({result['copy_bytes']} bytes), {len(problems)} problems"
+            )
+        return 1 if problems else 0
+
+    started = time.perf_counter()
+    journal = journal or Journal(journal_path, pid)
+    report = run_ops(ops, journal, args.workers, args.keep_going)
+    report["journal"] = journal_path
+    _report(report, started, args)
+    return 1 if report["failed"] or report["not_run"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,465 @@
+"""
+Persistent file catalog for the file-organizer skill.
+
+`refresh` walks a directory tree with parallel `os.scandir` calls into a SQLite
+catalog (default `~/.cache/file-organizer/catalog.sqlite`). Later refreshes stat
+each directory and only re-list the ones whose mtime changed; unchanged
+directories reuse their catalogued subdirectories and files. A directory's mtime
+moves when entries are added, removed or renamed, not when a file inside it is
+rewritten, so pass `--full` to re-stat every file.
+
+Queries read the catalog with indexed SQL instead of re-scanning:
+  largest   biggest files
+  stale     files not modified for N days
+  types     count and size per category / extension
+  summary   totals and date range
+  propose   a JSON move plan (by type, year or month; old files to Archive/)
+
+Hashes already computed by find_duplicates.py are copied into the `hash` column.
+
+Usage:
+  python catalog.py refresh ~/Downloads [--full] [--workers 16]
+  python catalog.py largest ~/Downloads [--limit 20] [--json]
+  python catalog.py stale ~/Documents --days 180
+  python catalog.py types ~/Downloads
+  python catalog.py propose ~/Downloads --by type [--archive-days 365] [--output plan.json]
+"""
+import os
+import sys
+import json
+import time
+import sqlite3
+import argparse
+import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from find_duplicates import DEFAULT_CACHE_PATH as HASH_CACHE_PATH, PARTIAL_BLOCK_SIZE
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.expanduser("~"), ".cache", "file-organizer", "catalog.sqlite")
+
+# Category -> extensions, following the groupings in SKILL.md
+FILE_TYPES = {
+    "Documents": {"pdf", "doc", "docx", "txt", "md", "rtf", "odt", "pages", "epub", "tex"},
+    "Spreadsheets": {"xls", "xlsx", "csv", "ods", "numbers", "tsv"},
+    "Presentations": {"ppt", "pptx", "key", "odp"},
+    "Images": {"jpg", "jpeg", "png", "gif", "svg", "webp", "heic", "bmp", "tif", "tiff", "raw", "cr2", "nef", "psd"},
+    "Videos": {"mp4", "mov", "mkv", "avi", "wmv", "webm", "m4v", "flv"},
+    "Audio": {"mp3", "wav", "flac", "aac", "m4a", "ogg", "opus"},
+    "Archives": {"zip", "tar", "gz", "tgz", "bz2", "xz", "7z", "rar", "zst"},
+    "Installers": {"dmg", "pkg", "exe", "msi", "deb", "rpm", "appimage", "apk", "iso"},
+    "Code": {"py", "js", "ts", "tsx", "jsx", "java", "c", "h", "cpp", "go", "rs", "rb", "php", "sh", "sql",
+             "html", "css", "json", "yaml", "yml", "toml", "xml", "ipynb"},
+}
+TYPE_BY_EXT = {ext: category for category, exts in FILE_TYPES.items() for ext in exts}
+OTHER_TYPE = "Other"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roots (path TEXT PRIMARY KEY, include_hidden INTEGER NOT NULL, refreshed_at REAL);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, dir TEXT NOT NULL, name TEXT NOT NULL, ext TEXT NOT NULL, type TEXT NOT NULL,
+    size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, dev INTEGER, ino INTEGER, hash TEXT
+);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_size ON files (size);
+CREATE INDEX IF NOT EXISTS files_mtime ON files (mtime_ns);
+CREATE INDEX IF NOT EXISTS files_type ON files (type, ext);
+"""
+
+
+def file_type(name):
+    """(category, lower-case extension without the dot)"""
+    ext = os.path.splitext(name)[1][1:].lower()
+    if name.lower().endswith((".tar.gz", ".tar.bz2", ".tar.xz")):
+        return "Archives", "tar." + ext
+    return TYPE_BY_EXT.get(ext, OTHER_TYPE), ext
+
+
+def open_catalog(path=DEFAULT_CATALOG_PATH):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _under(column, root):
+    """SQL condition (and params) for `column` being `root` or inside it; uses the column's index."""
+    prefix = root.rstrip(os.sep) + os.sep
+    # Every path inside `root` sorts between "<root>/" and "<root>0" ("0" follows "/")
+    return f"({column} = ? OR ({column} >= ? AND {column} < ?))", [root, prefix, prefix[:-1] + chr(ord(os.sep) + 1)]
+
+
+def _list_dir(path, known_mtime, known_subdirs, include_hidden, full):
+    """
+    Worker: stat `path` and, when its mtime changed (or `full`), list it.
+    Returns (path, mtime_ns, files or None if unchanged, subdirs).
+    """
+    mtime = os.stat(path).st_mtime_ns
+    if not full and known_mtime == mtime:
+        return path, mtime, None, known_subdirs
+    files, subdirs = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if not include_hidden and entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    files.append((entry.name, st.st_size, st.st_mtime_ns, st.st_dev, st.st_ino))
+            except OSError:
+                continue
+    return path, mtime, files, subdirs
+
+
+def _delete_subtree(conn, path):
+    cond, params = _under("path", path)
+    conn.execute(f"DELETE FROM dirs WHERE {cond}", params)
+    cond, params = _under("dir", path)
+    conn.execute(f"DELETE FROM files WHERE {cond}", params)
+
+
+def _apply_listing(conn, path, files, subdirs, stats):
+    """Diff a fresh listing of `path` against the catalog and write the changes."""
+    old = {
+        name: (size, mtime_ns)
+        for name, size, mtime_ns in conn.execute("SELECT name, size, mtime_ns FROM files WHERE dir = ?", (path,))
+    }
+    upserts = []
+    for name, size, mtime_ns, dev, ino in files:
+        if old.pop(name, None) == (size, mtime_ns):
+            continue
+        category, ext = file_type(name)
+        upserts.append((os.path.join(path, name), path, name, ext, category, size, mtime_ns, dev, ino))
+    if upserts:
+        # A changed file loses its hash; it is refilled from the hash cache when still valid
+        conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)", upserts)
+    if old:
+        conn.executemany("DELETE FROM files WHERE path = ?", [(os.path.join(path, name),) for name in old])
+    stats["files_updated"] += len(upserts)
+    stats["files_removed"] += len(old)
+
+    current = set(subdirs)
+    for (gone,) in conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,)).fetchall():
+        if gone not in current:
+            _delete_subtree(conn, gone)
+
+
+def refresh(conn, root, workers=16, full=False, include_hidden=None, hash_cache=HASH_CACHE_PATH):
+    """Bring the catalog for `root` up to date. Returns stats."""
+    started = time.perf_counter()
+    root = os.path.abspath(root)
+    row = conn.execute("SELECT include_hidden FROM roots WHERE path = ?", (root,)).fetchone()
+    if include_hidden is None:
+        include_hidden = bool(row[0]) if row else False
+    elif row and bool(row[0]) != include_hidden:
+        full = True  # a different visibility rule invalidates every listing
+
+    cond, params = _under("path", root)
+    known_mtime = {}
+    known_children = {}
+    for path, parent, mtime_ns in conn.execute(f"SELECT path, parent, mtime_ns FROM dirs WHERE {cond}", params):
+        known_mtime[path] = mtime_ns
+        known_children.setdefault(parent, []).append(path)
+
+    stats = {"dirs_seen": 0, "dirs_listed": 0, "dirs_unchanged": 0, "dirs_removed": 0, "files_updated": 0, "files_removed": 0}
+    with conn, ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        def submit(path):
+            return pool.submit(_list_dir, path, known_mtime.get(path), known_children.get(path, []), include_hidden, full)
+
+        pending = {submit(root): root}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                stats["dirs_seen"] += 1
+                try:
+                    path, mtime, files, subdirs = future.result()
+                except OSError:
+                    # Vanished or unreadable since its parent was listed
+                    _delete_subtree(conn, path)
+                    stats["dirs_removed"] += 1
+                    continue
+                if files is None:
+                    stats["dirs_unchanged"] += 1
+                else:
+                    stats["dirs_listed"] += 1
+                    _apply_listing(conn, path, files, subdirs, stats)
+                    parent = os.path.dirname(path) if path != root else None
+                    conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)", (path, parent, mtime))
+                for sub in subdirs:
+                    pending[submit(sub)] = sub
+        conn.execute(
+            "INSERT OR REPLACE INTO roots VALUES (?, ?, ?)", (root, int(include_hidden), time.time())
+        )
+    stats["hashes_filled"] = fill_hashes(conn, root, hash_cache)
+    stats["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def fill_hashes(conn, root, hash_cache=HASH_CACHE_PATH):
+    """Copy still-valid BLAKE2b hashes from find_duplicates.py's cache into the catalog."""
+    if not hash_cache or not os.path.exists(hash_cache):
+        return 0
+    cond, params = _under("path", root)
+    conn.execute("ATTACH DATABASE ? AS hc", (hash_cache,))
+    try:
+        with conn:
+            # Files up to one partial block were hashed completely by the partial pass
+            known = f"""
+                SELECT COALESCE(h.full, CASE WHEN files.size <= {PARTIAL_BLOCK_SIZE} THEN h.partial END) FROM hc.hashes h
+                WHERE h.dev = files.dev AND h.ino = files.ino AND h.algorithm = 'blake2b'
+                  AND h.size = files.size AND h.mtime_ns = files.mtime_ns
+            """
+            cur = conn.execute(
+                f"UPDATE files SET hash = ({known}) WHERE hash IS NULL AND {cond} AND ({known}) IS NOT NULL", params
+            )
+            return cur.rowcount
+    except sqlite3.DatabaseError:
+        return 0
+    finally:
+        conn.execute("DETACH DATABASE hc")
+
+
+def catalog_root(conn, path):
+    """The catalogued root containing `path`, or None."""
+    path = os.path.abspath(path)
+    for (root,) in conn.execute("SELECT path FROM roots ORDER BY length(path) DESC"):
+        if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+            return root
+    return None
+
+
+def human_size(n):
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if n < 1024 or unit == "TB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def _iso(mtime_ns):
+    return datetime.datetime.fromtimestamp(mtime_ns / 1e9).isoformat(timespec="seconds")
+
+
+def _file_rows(cursor):
+    return [
+        {"path": path, "size": size, "modified": _iso(mtime_ns), "type": category, "hash": hash_}
+        for path, size, mtime_ns, category, hash_ in cursor
+    ]
+
+
+def query_largest(conn, path, limit=20, types=None):
+    cond, params = _under("path", os.path.abspath(path))
+    if types:
+        cond += f" AND type IN ({', '.join('?' * len(types))})"
+        params += list(types)
+    return _file_rows(conn.execute(
+        f"SELECT path, size, mtime_ns, type, hash FROM files WHERE {cond} ORDER BY size DESC LIMIT ?", params + [limit]
+    ))
+
+
+def query_stale(conn, path, days, limit=100):
+    cond, params = _under("path", os.path.abspath(path))
+    cutoff = int((time.time() - days * 86400) * 1e9)
+    return _file_rows(conn.execute(
+        f"SELECT path, size, mtime_ns, type, hash FROM files WHERE mtime_ns < ? AND {cond} ORDER BY mtime_ns LIMIT ?",
+        [cutoff] + params + [limit],
+    ))
+
+
+def query_types(conn, path):
+    cond, params = _under("path", os.path.abspath(path))
+    breakdown = {}
+    for category, ext, count, size in conn.execute(
+        f"SELECT type, ext, COUNT(*), SUM(size) FROM files WHERE {cond} GROUP BY type, ext", params
+    ):
+        entry = breakdown.setdefault(category, {"type": category, "count": 0, "bytes": 0, "extensions": {}})
+        entry["count"] += count
+        entry["bytes"] += size
+        entry["extensions"][ext or "(none)"] = count
+    return sorted(breakdown.values(), key=lambda e: -e["bytes"])
+
+
+def query_summary(conn, path):
+    path = os.path.abspath(path)
+    cond, params = _under("path", path)
+    files, size, oldest, newest = conn.execute(
+        f"SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(mtime_ns), MAX(mtime_ns) FROM files WHERE {cond}", params
+    ).fetchone()
+    dirs = conn.execute(f"SELECT COUNT(*) FROM dirs WHERE {cond}", params).fetchone()[0]
+    refreshed = conn.execute("SELECT refreshed_at FROM roots WHERE path = ?", (catalog_root(conn, path),)).fetchone()
+    return {
+        "path": path,
+        "files": files,
+        "dirs": max(0, dirs - 1),
+        "bytes": size,
+        "oldest": _iso(oldest) if oldest else None,
+        "newest": _iso(newest) if newest else None,
+        "refreshed_at": datetime.datetime.fromtimestamp(refreshed[0]).isoformat(timespec="seconds") if refreshed else None,
+    }
+
+
+def _free_name(dst, taken):
+    """`dst`, or `name (2).ext`, `name (3).ext`, ... if something already lives there."""
+    if dst not in taken:
+        return dst
+    stem, ext = os.path.splitext(dst)
+    n = 2
+    while f"{stem} ({n}){ext}" in taken:
+        n += 1
+    return f"{stem} ({n}){ext}"
+
+
+def propose_moves(conn, path, by="type", archive_days=None, recursive=False):
+    """
+    Move plan for the files in `path` (only its top level unless `recursive`):
+    into `<path>/<Category>/`, `<path>/<YYYY>/` or `<path>/<YYYY>/<MM>/`, and files
+    older than `archive_days` into `<path>/Archive/<YYYY>/`. Destinations never collide
+    with catalogued files or with each other.
+    """
+    path = os.path.abspath(path)
+    if recursive:
+        cond, params = _under("dir", path)
+    else:
+        cond, params = "dir = ?", [path]
+    taken_cond, taken_params = _under("path", path)
+    taken = {p for (p,) in conn.execute(f"SELECT path FROM files WHERE {taken_cond}", taken_params)}
+    cutoff = int((time.time() - archive_days * 86400) * 1e9) if archive_days else None
+    folders = set(FILE_TYPES) | {OTHER_TYPE, "Archive"}
+
+    moves = []
+    for src, name, category, size, mtime_ns in conn.execute(
+        f"SELECT path, name, type, size, mtime_ns FROM files WHERE {cond} ORDER BY path", params
+    ):
+        rel_dir = os.path.relpath(os.path.dirname(src), path)
+        if recursive and rel_dir != "." and rel_dir.split(os.sep)[0] in folders:
+            continue  # already organized
+        modified = datetime.datetime.fromtimestamp(mtime_ns / 1e9)
+        if cutoff is not None and mtime_ns < cutoff:
+            folder, reason = os.path.join("Archive", f"{modified:%Y}"), f"not modified since {modified:%Y-%m-%d}"
+        elif by == "year":
+            folder, reason = f"{modified:%Y}", f"modified {modified:%Y-%m-%d}"
+        elif by == "month":
+            folder, reason = os.path.join(f"{modified:%Y}", f"{modified:%m}"), f"modified {modified:%Y-%m-%d}"
+        else:
+            folder, reason = category, f"type {category}"
+        dst = os.path.join(path, folder, name)
+        if dst == src:
+            continue
+        dst = _free_name(dst, taken)
+        taken.add(dst)
+        moves.append({"src": src, "dst": dst, "size": size, "reason": reason})
+    return {
+        "version": 1,
+        "root": path,
+        "generated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "moves": moves,
+    }
+
+
+def _print_files(rows):
+    for r in rows:
+        print(f"{human_size(r['size']):>10}  {r['modified'][:10]}  {r['path']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="catalog.py")
+    parser.add_argument("--catalog", default=os.environ.get("FILE_ORGANIZER_CATALOG", DEFAULT_CATALOG_PATH))
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("refresh", help="Create or incrementally update the catalog for a directory.")
+    p.add_argument("path")
+    p.add_argument("--full", action="store_true", help="List every directory and re-stat every file.")
+    p.add_argument("--workers", type=int, default=16, help="Directories listed in parallel.")
+    p.add_argument("--include-hidden", action="store_true", default=None, help="Catalog dot files and dot directories.")
+    p.add_argument(
+        "--hash-cache",
+        default=os.environ.get("FILE_ORGANIZER_HASH_CACHE", HASH_CACHE_PATH),
+        help="find_duplicates.py cache to copy known hashes from.",
+    )
+    p.add_argument("--json", action="store_true")
+
+    for name, help_text in (
+        ("largest", "Largest files."),
+        ("stale", "Files not modified for --days days, oldest first."),
+        ("types", "File count and size per category and extension."),
+        ("summary", "Totals and date range."),
+        ("propose", "JSON move plan for the top level (or --recursive) of a directory."),
+    ):
+        q = sub.add_parser(name, help=help_text)
+        q.add_argument("path")
+        q.add_argument("--refresh", action="store_true", help="Run an incremental refresh first.")
+        q.add_argument("--json", action="store_true")
+        if name == "largest":
+            q.add_argument("--limit", type=int, default=20)
+            q.add_argument("--type", action="append", choices=sorted(set(FILE_TYPES) | {OTHER_TYPE}))
+        elif name == "stale":
+            q.add_argument("--days", type=int, default=180)
+            q.add_argument("--limit", type=int, default=100)
+        elif name == "propose":
+            q.add_argument("--by", choices=("type", "year", "month"), default="type")
+            q.add_argument("--archive-days", type=int, help="Send files older than this to Archive/<YYYY>/.")
+            q.add_argument("--recursive", action="store_true", help="Include files in subfolders (organized folders are skipped).")
+            q.add_argument("--output", help="Write the plan here (JSON) instead of stdout.")
+
+    args = parser.parse_args()
+    conn = open_catalog(args.catalog)
+    try:
+        if args.cmd == "refresh":
+            if not os.path.isdir(args.path):
+                parser.error(f"not a directory: {args.path}")
+            stats = refresh(conn, args.path, args.workers, args.full, args.include_hidden, args.hash_cache)
+            if args.json:
+                print(json.dumps(stats, indent=2))
+            else:
+                print(
+                    f"{stats['dirs_seen']} dirs ({stats['dirs_listed']} listed, {stats['dirs_unchanged']} unchanged), "
+                    f"{stats['files_updated']} files updated, {stats['files_removed']} removed, "
+                    f"{stats['hashes_filled']} hashes filled in {stats['elapsed_seconds']:.2f}s"
+                )
+            return 0
+
+        if args.refresh:
+            refresh(conn, catalog_root(conn, args.path) or args.path)
+        elif catalog_root(conn, args.path) is None:
+            print(f"{os.path.abspath(args.path)} is not catalogued yet; run `catalog.py refresh {args.path}` first.", file=sys.stderr)
+            return 2
+
+        if args.cmd == "largest":
+            result = query_largest(conn, args.path, args.limit, args.type)
+        elif args.cmd == "stale":
+            result = query_stale(conn, args.path, args.days, args.limit)
+        elif args.cmd == "types":
+            result = query_types(conn, args.path)
+        elif args.cmd == "summary":
+            result = query_summary(conn, args.path)
+        else:
+            result = propose_moves(conn, args.path, args.by, args.archive_days, args.recursive)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+                print(f"{len(result['moves'])} moves proposed. Plan: {args.output}")
+                return 0
+            args.json = True
+
+        if args.json:
+            print(json.dumps(result, indent=2, ensure_ascii=False))
+        elif args.cmd in ("largest", "stale"):
+            _print_files(result)
+        elif args.cmd == "types":
+            for entry in result:
+                top = ", ".join(f"{ext} {n}" for ext, n in sorted(entry["extensions"].items(), key=lambda kv: -kv[1])[:5])
+                print(f"{entry['type']:<14} {entry['count']:>8} files {human_size(entry['bytes']):>10}  ({top})")
+        else:
+            for key, value in result.items():
+                print(f"{key:<13} {human_size(value) if key == 'bytes' else value}")
+        return 0
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,301 @@
+"""
+Find duplicate files under one or more directories and print them as JSON.
+
+Candidates are narrowed in stages so most files are never read in full:
+1. Group by size; files with a unique size cannot have a duplicate.
+2. Hash the first and last block of each remaining file.
+3. Fully hash (streaming, mmap for large files) only the files whose partial
+   hash still collides, in a thread pool.
+
+Hashes are cached in `~/.cache/file-organizer/hashes.sqlite`, keyed by device and
+inode and validated against size and mtime, so re-scanning an unchanged tree only
+stats files. Hard links to the same inode are one file, not duplicates.
+
+Usage:
+  python find_duplicates.py <dir> [<dir> ...] [--min-size 1] [--workers 8] [--output dupes.json]
+"""
+import os
+import sys
+import json
+import mmap
+import time
+import hashlib
+import sqlite3
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "file-organizer", "hashes.sqlite")
+PARTIAL_BLOCK_SIZE = 64 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 16 * 1024 * 1024
+ALGORITHMS = ("blake2b", "xxh3_128")
+
+
+def new_hasher(algorithm):
+    if algorithm == "xxh3_128":
+        try:
+            import xxhash
+        except ImportError:
+            sys.exit("xxh3_128 needs the xxhash package (pip install xxhash); use --algorithm blake2b instead")
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=20)
+
+
+class HashCache:
+    """(dev, inode) -> partial/full hashes, valid while size and mtime are unchanged."""
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self.entries = {}
+        self.dirty = {}
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.conn = sqlite3.connect(path)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS hashes (dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER,"
+                " algorithm TEXT, partial TEXT, full TEXT, PRIMARY KEY (dev, ino, algorithm))"
+            )
+
+    def load(self, algorithm):
+        if self.conn is None:
+            return
+        rows = self.conn.execute(
+            "SELECT dev, ino, size, mtime_ns, partial, full FROM hashes WHERE algorithm = ?", (algorithm,)
+        )
+        self.entries = {(dev, ino): [size, mtime_ns, partial, full] for dev, ino, size, mtime_ns, partial, full in rows}
+
+    def get(self, f, kind):
+        entry = self.entries.get((f["dev"], f["ino"]))
+        if entry and entry[0] == f["size"] and entry[1] == f["mtime_ns"]:
+            return entry[2] if kind == "partial" else entry[3]
+        return None
+
+    def put(self, f, kind, digest):
+        key = (f["dev"], f["ino"])
+        entry = self.entries.get(key)
+        if not entry or entry[0] != f["size"] or entry[1] != f["mtime_ns"]:
+            entry = [f["size"], f["mtime_ns"], None, None]
+            self.entries[key] = entry
+        entry[2 if kind == "partial" else 3] = digest
+        self.dirty[key] = entry
+
+    def save(self, algorithm):
+        if self.conn is None or not self.dirty:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(dev, ino, e[0], e[1], algorithm, e[2], e[3]) for (dev, ino), e in self.dirty.items()],
+            )
+        self.dirty = {}
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+
+
+def walk_files(roots, min_size=1, include_hidden=False, errors=None):
+    """
+    Yield a dict per regular file (symlinks are not followed). Each inode is yielded
+    once; further hard links to it are skipped.
+    """
+    seen = set()
+    stack = [os.path.abspath(r) for r in reversed(roots)]
+    while stack:
+        top = stack.pop()
+        try:
+            with os.scandir(top) as it:
+                entries = list(it)
+        except OSError as e:
+            if errors is not None:
+                errors.append({"path": top, "error": str(e)})
+            continue
+        subdirs = []
+        for entry in entries:
+            if not include_hidden and entry.name.startswith("."):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=False):
+                    continue
+                st = entry.stat(follow_symlinks=False)
+            except OSError as e:
+                if errors is not None:
+                    errors.append({"path": entry.path, "error": str(e)})
+                continue
+            key = (st.st_dev, st.st_ino)
+            if st.st_size < min_size or key in seen:
+                continue
+            seen.add(key)
+            yield {"path": entry.path, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "dev": st.st_dev, "ino": st.st_ino}
+        stack.extend(sorted(subdirs, reverse=True))
+
+
+def partial_hash(f, algorithm):
+    """Hash of the size plus the first and last block; for files up to one block this is the whole content."""
+    h = new_hasher(algorithm)
+    h.update(str(f["size"]).encode())
+    with open(f["path"], "rb") as fh:
+        h.update(fh.read(PARTIAL_BLOCK_SIZE))
+        if f["size"] > PARTIAL_BLOCK_SIZE:
+            fh.seek(max(PARTIAL_BLOCK_SIZE, f["size"] - PARTIAL_BLOCK_SIZE))
+            h.update(fh.read(PARTIAL_BLOCK_SIZE))
+    return h.hexdigest()
+
+
+def full_hash(f, algorithm):
+    h = new_hasher(algorithm)
+    with open(f["path"], "rb") as fh:
+        if f["size"] >= MMAP_THRESHOLD:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    for start in range(0, len(view), READ_CHUNK_SIZE * 8):
+                        h.update(view[start:start + READ_CHUNK_SIZE * 8])
+                finally:
+                    view.release()
+        else:
+            buf = bytearray(READ_CHUNK_SIZE)
+            view = memoryview(buf)
+            while True:
+                n = fh.readinto(buf)
+                if not n:
+                    break
+                h.update(view[:n])
+    return h.hexdigest()
+
+
+def _hash_stage(files, kind, algorithm, cache, pool, stats, errors):
+    """Hash `files` (cache first, the rest in `pool`) and return {(size, digest): [files]} with 2+ members."""
+    fn = partial_hash if kind == "partial" else full_hash
+    digests = {}
+    todo = []
+    for f in files:
+        cached = cache.get(f, kind)
+        if cached:
+            digests.setdefault((f["size"], cached), []).append(f)
+            stats["cache_hits"] += 1
+        else:
+            todo.append(f)
+
+    def run(f):
+        try:
+            return f, fn(f, algorithm), None
+        except (OSError, ValueError) as e:
+            return f, None, str(e)
+
+    for f, digest, error in pool.map(run, todo):
+        if error is not None:
+            errors.append({"path": f["path"], "error": error})
+            continue
+        stats[f"{kind}_hashed"] += 1
+        stats[f"{kind}_bytes"] += min(f["size"], 2 * PARTIAL_BLOCK_SIZE) if kind == "partial" else f["size"]
+        cache.put(f, kind, digest)
+        digests.setdefault((f["size"], digest), []).append(f)
+    return {key: group for key, group in digests.items() if len(group) > 1}
+
+
+def find_duplicates(roots, min_size=1, workers=8, algorithm="blake2b", cache_path=DEFAULT_CACHE_PATH, include_hidden=False):
+    """Returns the report dict printed by the CLI."""
+    started = time.perf_counter()
+    errors = []
+    stats = {
+        "files_scanned": 0,
+        "bytes_scanned": 0,
+        "size_candidates": 0,
+        "partial_hashed": 0,
+        "partial_bytes": 0,
+        "full_hashed": 0,
+        "full_bytes": 0,
+        "cache_hits": 0,
+    }
+
+    by_size = {}
+    for f in walk_files(roots, min_size, include_hidden, errors):
+        stats["files_scanned"] += 1
+        stats["bytes_scanned"] += f["size"]
+        by_size.setdefault(f["size"], []).append(f)
+    candidates = [f for group in by_size.values() if len(group) > 1 for f in group]
+    stats["size_candidates"] = len(candidates)
+
+    cache = HashCache(cache_path)
+    groups = []
+    try:
+        cache.load(algorithm)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            still_colliding = []
+            for (size, digest), group in _hash_stage(candidates, "partial", algorithm, cache, pool, stats, errors).items():
+                if size <= PARTIAL_BLOCK_SIZE:
+                    # The partial hash already covered every byte
+                    groups.append((digest, group))
+                else:
+                    still_colliding.extend(group)
+            for (_size, digest), group in _hash_stage(still_colliding, "full", algorithm, cache, pool, stats, errors).items():
+                groups.append((digest, group))
+        cache.save(algorithm)
+    finally:
+        cache.close()
+
+    report_groups = []
+    for digest, dupes in groups:
+        dupes.sort(key=lambda f: (-f["mtime_ns"], f["path"]))
+        size = dupes[0]["size"]
+        report_groups.append({
+            "hash": digest,
+            "size": size,
+            "count": len(dupes),
+            "wasted_bytes": size * (len(dupes) - 1),
+            "files": [
+                {"path": f["path"], "mtime": datetime.datetime.fromtimestamp(f["mtime_ns"] / 1e9).isoformat(timespec="seconds")}
+                for f in dupes
+            ],
+        })
+    report_groups.sort(key=lambda g: (-g["wasted_bytes"], g["files"][0]["path"]))
+
+    return {
+        "roots": [os.path.abspath(r) for r in roots],
+        "algorithm": algorithm,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "stats": stats,
+        "duplicate_groups": len(report_groups),
+        "duplicate_files": sum(g["count"] - 1 for g in report_groups),
+        "wasted_bytes": sum(g["wasted_bytes"] for g in report_groups),
+        "groups": report_groups,
+        "errors": errors,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="find_duplicates.py")
+    parser.add_argument("roots", nargs="+", metavar="dir")
+    parser.add_argument("--min-size", type=int, default=1, help="Ignore files smaller than this many bytes (default: skip empty files).")
+    parser.add_argument("--workers", type=int, default=min(8, (os.cpu_count() or 1) * 2), help="Files hashed in parallel.")
+    parser.add_argument("--algorithm", choices=ALGORITHMS, default="blake2b", help="xxh3_128 needs the xxhash package.")
+    parser.add_argument("--cache", default=os.environ.get("FILE_ORGANIZER_HASH_CACHE", DEFAULT_CACHE_PATH), help="Hash cache database.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the hash cache.")
+    parser.add_argument("--include-hidden", action="store_true", help="Also scan dot files and dot directories.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    args = parser.parse_args()
+
+    for root in args.roots:
+        if not os.path.isdir(root):
+            parser.error(f"not a directory: {root}")
+
+    report = find_duplicates(
+        args.roots, args.min_size, args.workers, args.algorithm, None if args.no_cache else args.cache, args.include_hidden
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(
+            f"{report['duplicate_groups']} duplicate groups, {report['duplicate_files']} extra copies, "
+            f"{report['wasted_bytes']} bytes reclaimable ({report['elapsed_seconds']:.2f}s). Report: {args.output}",
+            file=sys.stderr,
+        )
+    else:
+        json.dump(report, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
@@ -0,0 +1,228 @@
+"""
+Local analysis stage: dependencies and CLI entry points of a repository, without a full clone.
+
+Each repository gets a mirror under a shared directory (default
+`~/.cache/github-to-skills/mirrors`). The mirror is a blobless (`--filter=blob:none`),
+shallow clone with a sparse checkout of just the manifest files, so only those
+blobs are ever downloaded. Re-analysing a repository whose mirror already sits at
+the requested commit needs no network at all, and local bare repositories work
+as remotes (offline).
+
+Usage: python analyze_repo.py <github_url> [--rev HASH] [--mirror-dir DIR] [--merge-into info.json]
+"""
+import os
+import re
+import sys
+import json
+import hashlib
+import pathlib
+import argparse
+import subprocess
+import configparser
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+DEFAULT_MIRROR_DIR = os.path.join(os.path.expanduser("~"), ".cache", "github-to-skills", "mirrors")
+GIT_TIMEOUT = 300
+
+# Non-cone sparse patterns: manifests at the root, entry-point modules anywhere
+SPARSE_PATTERNS = [
+    "/requirements*.txt",
+    "/pyproject.toml",
+    "/setup.cfg",
+    "/setup.py",
+    "/package.json",
+    "**/__main__.py",
+]
+
+REQUIREMENT_NAME_RE = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)")
+SETUP_PY_SCRIPT_RE = re.compile(r"""['"]\s*([A-Za-z0-9][\w.-]*)\s*=\s*([\w.]+:[\w.]+)\s*['"]""")
+
+
+def _git(args, cwd=None):
+    return subprocess.run(
+        ["git", *args], cwd=cwd, capture_output=True, text=True, check=True, timeout=GIT_TIMEOUT
+    ).stdout.strip()
+
+
+def remote_url(url):
+    """Local paths become file:// URLs so shallow and filtered clones are honoured."""
+    if "://" in url or re.match(r"^[\w.-]+@[\w.-]+:", url):
+        return url
+    return pathlib.Path(url).resolve().as_uri()
+
+
+def mirror_path(url, mirror_dir=DEFAULT_MIRROR_DIR):
+    clean_url = url.rstrip("/")
+    if clean_url.endswith(".git"):
+        clean_url = clean_url[:-4]
+    name = re.sub(r"[^\w.-]", "-", clean_url.replace("\\", "/").split("/")[-1])
+    return os.path.join(mirror_dir, f"{name}-{hashlib.sha256(clean_url.encode('utf-8')).hexdigest()[:12]}")
+
+
+def sync_mirror(url, rev=None, mirror_dir=DEFAULT_MIRROR_DIR):
+    """
+    Create or update the sparse, blobless mirror of `url` at `rev` (default: remote HEAD).
+    Returns (mirror path, checked-out commit hash).
+    """
+    path = mirror_path(url, mirror_dir)
+    if not os.path.isdir(os.path.join(path, ".git")):
+        os.makedirs(mirror_dir, exist_ok=True)
+        _git(["clone", "--quiet", "--filter=blob:none", "--no-checkout", "--depth", "1", remote_url(url), path])
+        _git(["sparse-checkout", "set", "--no-cone", *SPARSE_PATTERNS], cwd=path)
+        head = _git(["rev-parse", "HEAD"], cwd=path)
+        if rev is None or rev == head:
+            # --no-checkout left the sparse working tree empty; populate it at the cloned commit
+            _git(["checkout", "--quiet", "--detach", head], cwd=path)
+            return path, head
+
+    # A mirror at `rev` is only reusable once it has been checked out (an unpopulated
+    # clone has no index yet); anything else fetches `rev` and checks it out.
+    populated = os.path.exists(os.path.join(path, ".git", "index"))
+    current = _git(["rev-parse", "HEAD"], cwd=path) if rev else None
+    if rev is None or current != rev or not populated:
+        _git(["fetch", "--quiet", "--filter=blob:none", "--depth", "1", "origin", rev or "HEAD"], cwd=path)
+        _git(["checkout", "--quiet", "--detach", "FETCH_HEAD"], cwd=path)
+    return path, _git(["rev-parse", "HEAD"], cwd=path)
+
+
+# --- Manifest parsers ---------------------------------------------------------
+
+def requirement_name(spec):
+    """`requests>=2.0 ; python_version>"3"` -> `requests`; options and URLs give None."""
+    spec = spec.split("#", 1)[0].strip()
+    if not spec or spec.startswith("-") or "://" in spec:
+        return None
+    match = REQUIREMENT_NAME_RE.match(spec)
+    return match.group(1) if match else None
+
+
+def parse_requirements(text):
+    return [n for n in (requirement_name(line) for line in text.splitlines()) if n]
+
+
+def parse_pyproject(text):
+    if tomllib is None:
+        return [], []
+    data = tomllib.loads(text)
+    project = data.get("project", {})
+    poetry = data.get("tool", {}).get("poetry", {})
+    deps = [requirement_name(d) for d in project.get("dependencies", [])]
+    deps += [name for name in poetry.get("dependencies", {}) if name.lower() != "python"]
+    scripts = dict(poetry.get("scripts", {}))
+    scripts.update(project.get("scripts", {}))
+    entry_points = [{"name": n, "target": t, "kind": "console_script"} for n, t in scripts.items() if isinstance(t, str)]
+    return [d for d in deps if d], entry_points
+
+
+def parse_setup_cfg(text):
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.read_string(text)
+    deps = []
+    if parser.has_option("options", "install_requires"):
+        deps = [requirement_name(d) for d in parser.get("options", "install_requires").splitlines()]
+    entry_points = []
+    if parser.has_option("options.entry_points", "console_scripts"):
+        for line in parser.get("options.entry_points", "console_scripts").splitlines():
+            name, sep, target = line.partition("=")
+            if sep:
+                entry_points.append({"name": name.strip(), "target": target.strip(), "kind": "console_script"})
+    return [d for d in deps if d], entry_points
+
+
+def parse_setup_py(text):
+    """Best effort: only literal `"name = module:func"` console script strings."""
+    return [], [{"name": n, "target": t, "kind": "console_script"} for n, t in SETUP_PY_SCRIPT_RE.findall(text)]
+
+
+def parse_package_json(text):
+    data = json.loads(text)
+    deps = list(data.get("dependencies", {}))
+    bin_field = data.get("bin")
+    if isinstance(bin_field, str):
+        bin_field = {data.get("name", "").split("/")[-1]: bin_field}
+    entry_points = [{"name": n, "target": t, "kind": "node_bin"} for n, t in (bin_field or {}).items()]
+    return deps, entry_points
+
+
+def analyze_checkout(path):
+    """Parse whatever manifests the sparse checkout contains."""
+    result = {"dependencies": {"python": [], "node": []}, "entry_points": [], "manifests": []}
+
+    def read(rel):
+        with open(os.path.join(path, rel), "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+
+    def add(kind, deps, entry_points):
+        for dep in deps:
+            if dep not in result["dependencies"][kind]:
+                result["dependencies"][kind].append(dep)
+        known = {e["name"] for e in result["entry_points"]}
+        result["entry_points"].extend(e for e in entry_points if e["name"] not in known)
+
+    for rel in sorted(os.listdir(path)):
+        if rel == ".git" or not os.path.isfile(os.path.join(path, rel)):
+            continue
+        try:
+            if rel == "pyproject.toml":
+                add("python", *parse_pyproject(read(rel)))
+            elif rel == "setup.cfg":
+                add("python", *parse_setup_cfg(read(rel)))
+            elif rel == "setup.py":
+                add("python", *parse_setup_py(read(rel)))
+            elif rel.startswith("requirements") and rel.endswith(".txt"):
+                if rel != "requirements.txt":
+                    continue  # dev/test extras are not runtime prerequisites
+                add("python", parse_requirements(read(rel)), [])
+            elif rel == "package.json":
+                add("node", *parse_package_json(read(rel)))
+            else:
+                continue
+        except (ValueError, configparser.Error) as e:
+            print(f"Warning: could not parse {rel}: {e}", file=sys.stderr)
+            continue
+        result["manifests"].append(rel)
+
+    # `python -m <package>` entry points from __main__.py files
+    for dirpath, dirnames, filenames in os.walk(path):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        if "__main__.py" in filenames:
+            rel = os.path.relpath(dirpath, path).replace(os.sep, "/")
+            if rel == ".":
+                continue
+            module = rel[len("src/"):] if rel.startswith("src/") else rel
+            result["entry_points"].append({"name": module.replace("/", "."), "target": f"{rel}/__main__.py", "kind": "python_module"})
+    return result
+
+
+def analyze_repo(url, rev=None, mirror_dir=DEFAULT_MIRROR_DIR):
+    path, commit = sync_mirror(url, rev, mirror_dir)
+    result = analyze_checkout(path)
+    result["commit"] = commit
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="analyze_repo.py")
+    parser.add_argument("url", metavar="github_url")
+    parser.add_argument("--rev", help="Commit to analyse (default: remote HEAD).")
+    parser.add_argument("--mirror-dir", default=os.environ.get("GITHUB_TO_SKILLS_MIRRORS", DEFAULT_MIRROR_DIR))
+    parser.add_argument("--merge-into", metavar="INFO_JSON", help="Add the result as `analysis` to a fetch_github_info.py output file.")
+    args = parser.parse_args()
+
+    try:
+        analysis = analyze_repo(args.url, args.rev, args.mirror_dir)
+    except subprocess.CalledProcessError as e:
+        print(f"Error: git {' '.join(e.cmd[1:3])} failed: {e.stderr.strip()}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.merge_into:
+        with open(args.merge_into, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        info["analysis"] = analysis
+        with open(args.merge_into, "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+    print(json.dumps(analysis, indent=2))
@@ -0,0 +1,235 @@
+"""
+Scaffold skills for many GitHub repositories in one run.
+
+1. `git ls-remote` runs for every URL in parallel.
+2. Repos whose HEAD hash equals the `github_hash` of an existing skill in the
+   output directory are skipped.
+3. The rest have their metadata fetched concurrently (one shared HTTP connection
+   pool and cache) and are scaffolded in parallel.
+4. Re-scaffolding replaces SKILL.md, so updated skills that have an
+   `evolution.json` are re-stitched with skill-evolution-manager's smart_stitch;
+   when that is not installed (or fails) the entry is flagged `needs_restitch`.
+5. A manifest with per-repo status and timings is written (default:
+   `<output_dir>/.github-skills-manifest.json`).
+
+Usage:
+  python batch_github_skills.py <output_skills_dir> <url> [<url> ...]
+  python batch_github_skills.py <output_skills_dir> --urls-file repos.txt [--workers 8] [--analyze]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from analyze_repo import DEFAULT_MIRROR_DIR, analyze_repo
+from create_github_skill import create_skill, safe_skill_name
+from fetch_github_info import DEFAULT_CACHE_DIR, HTTP_TIMEOUT, HttpCache, HttpClient, get_repo_info, ls_remote
+
+MANIFEST_FILE_NAME = ".github-skills-manifest.json"
+# Sibling skill that owns the "User-Learned Best Practices" section of SKILL.md
+EVOLUTION_SCRIPTS_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "skill-evolution-manager", "scripts",
+)
+
+
+def read_urls(path):
+    """One URL per line; blank lines and `#` comments are ignored."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.split("#", 1)[0].strip() for line in f if line.split("#", 1)[0].strip()]
+
+
+def existing_hashes(output_dir):
+    """{skill folder name: github_hash} from the frontmatter of skills already in `output_dir`."""
+    hashes = {}
+    if not os.path.isdir(output_dir):
+        return hashes
+    for entry in os.scandir(output_dir):
+        if not entry.is_dir() or entry.name.startswith("."):
+            continue
+        try:
+            with open(os.path.join(entry.path, "SKILL.md"), "r", encoding="utf-8") as f:
+                if f.readline().strip() != "---":
+                    continue
+                for line in f:
+                    if line.strip() == "---":
+                        break
+                    key, sep, value = line.partition(":")
+                    if sep and key.strip() == "github_hash":
+                        hashes[entry.name] = value.strip().strip("'\"")
+        except OSError:
+            continue
+    return hashes
+
+
+def repo_name_from_url(url):
+    clean_url = url.rstrip("/")
+    if clean_url.endswith(".git"):
+        clean_url = clean_url[:-4]
+    return clean_url.replace("\\", "/").split("/")[-1]
+
+
+def restitch(skill_dir):
+    """
+    Stitches evolution.json back into a freshly re-scaffolded SKILL.md.
+    Returns smart_stitch's (status, message), or ("error", reason) when it is unavailable.
+    """
+    if EVOLUTION_SCRIPTS_DIR not in sys.path:
+        sys.path.append(EVOLUTION_SCRIPTS_DIR)
+    try:
+        from smart_stitch import stitch
+    except ImportError as e:
+        return "error", f"smart_stitch not available ({e})"
+    try:
+        return stitch(skill_dir)
+    except Exception as e:
+        return "error", str(e) or type(e).__name__
+
+
+def process_repo(url, output_dir, known, client, raw_base=None, mirror_dir=None):
+    """
+    Runs ls-remote, fetch, optional analysis (when `mirror_dir` is set) and scaffold
+    for one URL; returns its manifest entry.
+    """
+    started = time.perf_counter()
+    name = safe_skill_name(repo_name_from_url(url))
+    entry = {"url": url, "skill": name, "status": None, "github_hash": None, "error": None, "timings": {}}
+
+    def lap(stage, since):
+        entry["timings"][stage] = round(time.perf_counter() - since, 3)
+
+    try:
+        t = time.perf_counter()
+        remote = ls_remote(url)
+        lap("ls_remote", t)
+        entry["github_hash"] = remote[0]
+
+        if known.get(name) == remote[0]:
+            entry["status"] = "skipped"
+        else:
+            t = time.perf_counter()
+            info = get_repo_info(url, client, raw_base, remote=remote)
+            lap("fetch", t)
+
+            if mirror_dir:
+                t = time.perf_counter()
+                try:
+                    info["analysis"] = analyze_repo(url, remote[0] if remote[0] != "unknown" else None, mirror_dir)
+                except Exception as e:
+                    # The scaffold is still useful without it; keep going with TODO placeholders
+                    entry["warning"] = f"analysis failed: {getattr(e, 'stderr', None) or e}".strip()
+                lap("analyze", t)
+
+            t = time.perf_counter()
+            skill_dir = create_skill(info, output_dir, verbose=False)
+            lap("scaffold", t)
+            entry["status"] = "updated" if name in known else "created"
+
+            # The new SKILL.md no longer carries the stitched evolution section
+            if entry["status"] == "updated" and os.path.exists(os.path.join(skill_dir, "evolution.json")):
+                t = time.perf_counter()
+                status, message = restitch(skill_dir)
+                lap("restitch", t)
+                entry["restitch"] = status
+                if status == "error":
+                    entry["needs_restitch"] = True
+                    warning = f"evolution.json not re-stitched: {message}"
+                    entry["warning"] = f"{entry['warning']}; {warning}" if entry.get("warning") else warning
+    except Exception as e:
+        entry["status"] = "failed"
+        entry["error"] = str(e).strip() or type(e).__name__
+    lap("total", started)
+    return entry
+
+
+def batch_create(urls, output_dir, workers=8, client=None, raw_base=None, mirror_dir=None):
+    """Returns the manifest dict; URLs mapping to the same skill name are only processed once."""
+    started = time.perf_counter()
+    os.makedirs(output_dir, exist_ok=True)
+    known = existing_hashes(output_dir)
+
+    unique = []
+    duplicates = []
+    seen = set()
+    for url in urls:
+        name = safe_skill_name(repo_name_from_url(url))
+        if name in seen:
+            duplicates.append({"url": url, "skill": name, "status": "failed", "github_hash": None,
+                               "error": f"duplicate skill name '{name}' in this batch", "timings": {}})
+            continue
+        seen.add(name)
+        unique.append(url)
+
+    own_client = client is None
+    client = client or HttpClient(HttpCache())
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            entries = list(executor.map(lambda u: process_repo(u, output_dir, known, client, raw_base, mirror_dir), unique))
+    finally:
+        if own_client:
+            client.close()
+    entries.extend(duplicates)
+
+    counts = {}
+    for entry in entries:
+        counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+    return {
+        "generated_at": datetime.datetime.now().isoformat(),
+        "output_dir": os.path.abspath(output_dir),
+        "total": len(entries),
+        "counts": counts,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "http": dict(client.stats),
+        "repos": entries,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="batch_github_skills.py")
+    parser.add_argument("output_dir", metavar="output_skills_dir")
+    parser.add_argument("urls", nargs="*", metavar="github_url")
+    parser.add_argument("--urls-file", help="File with one repository URL per line.")
+    parser.add_argument("--workers", type=int, default=8, help="Repositories processed in parallel.")
+    parser.add_argument("--manifest", help=f"Manifest path (default: <output_dir>/{MANIFEST_FILE_NAME}).")
+    parser.add_argument("--cache-dir", default=os.environ.get("GITHUB_TO_SKILLS_CACHE", DEFAULT_CACHE_DIR))
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the HTTP cache.")
+    parser.add_argument("--timeout", type=float, default=HTTP_TIMEOUT, help="Per-request HTTP timeout in seconds.")
+    parser.add_argument("--analyze", action="store_true", help="Fill dependencies and entry points from a sparse clone (analyze_repo.py).")
+    parser.add_argument("--mirror-dir", default=os.environ.get("GITHUB_TO_SKILLS_MIRRORS", DEFAULT_MIRROR_DIR))
+    parser.add_argument("--raw-base", help="Raw file host (default: $GITHUB_RAW_BASE or raw.githubusercontent.com).")
+    args = parser.parse_args()
+
+    urls = list(args.urls)
+    if args.urls_file:
+        urls.extend(read_urls(args.urls_file))
+    if not urls:
+        parser.error("no repository URLs given")
+
+    client = HttpClient(None if args.no_cache else HttpCache(args.cache_dir), timeout=args.timeout)
+    try:
+        manifest = batch_create(
+            urls, args.output_dir, args.workers, client, args.raw_base, args.mirror_dir if args.analyze else None
+        )
+    finally:
+        client.close()
+
+    manifest_path = args.manifest or os.path.join(args.output_dir, MANIFEST_FILE_NAME)
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    for entry in manifest["repos"]:
+        detail = entry["error"] or f"{entry['timings'].get('total', 0):.2f}s"
+        if entry.get("restitch") and not entry.get("needs_restitch"):
+            detail += " (evolution.json re-stitched)"
+        if entry.get("warning"):
+            detail += f" (warning: {entry['warning']})"
+        print(f"[{entry['status']:>7}] {entry['skill']:<30} {detail}")
+    summary = ", ".join(f"{n} {status}" for status, n in sorted(manifest["counts"].items()))
+    print(f"\n{manifest['total']} repos in {manifest['elapsed_seconds']:.2f}s ({summary}). Manifest: {manifest_path}")
+    pending = [entry["skill"] for entry in manifest["repos"] if entry.get("needs_restitch")]
+    if pending:
+        print(f"Run smart_stitch.py on {', '.join(pending)} to restore their evolution sections.")
+    sys.exit(1 if manifest["counts"].get("failed") else 0)
@@ -1,89 +1,164 @@
 import sys
 import os
 import json
+import shutil
+import argparse
 import datetime
-import subprocess
+import tempfile
 
-def create_skill(repo_info, output_dir):
+from template_engine import TemplateError, available_types, render_scaffold
+
+SCAFFOLD_DIRS = ["scripts", "references", "assets"]
+
+def safe_skill_name(repo_name):
+    """Kebab-case folder/skill name derived from the repository name."""
+    return "".join(c if c.isalnum() or c in ('-','_') else '-' for c in repo_name).lower()
+
+def analysis_sections(repo_info):
+    """
+    Frontmatter/markdown fragments from the optional `analysis` key (see analyze_repo.py).
+    Returns (dependencies, prerequisites_md, entry_points_md, example_command).
+    """
+    analysis = repo_info.get('analysis') or {}
+    deps = analysis.get('dependencies', {})
+    python_deps = deps.get('python', [])
+    node_deps = deps.get('node', [])
+    entry_points = analysis.get('entry_points', [])
+
+    lines = [f"- Python: `{d}`" for d in python_deps] + [f"- Node.js: `{d}`" for d in node_deps]
+    if not analysis:
+        lines = ["- [TODO: List dependencies based on requirements.txt]"]
+    elif not lines:
+        lines = ["- No dependencies declared in the repository manifests."]
+    prerequisites = "\n".join(lines)
+
+    entry_lines = []
+    for ep in entry_points:
+        if ep['kind'] == 'python_module':
+            entry_lines.append(f"- `python -m {ep['name']}` ({ep['target']})")
+        else:
+            entry_lines.append(f"- `{ep['name']}` -> `{ep['target']}`")
+    entry_md = ""
+    if entry_lines:
+        entry_md = "\n### Command-Line Entry Points\n\n" + "\n".join(entry_lines) + "\n"
+
+    if entry_points and entry_points[0]['kind'] == 'python_module':
+        example = ['python', '-m', entry_points[0]['name']]
+    elif entry_points:
+        example = [entry_points[0]['name']]
+    else:
+        example = [repo_info['name']]
+    return python_deps + node_deps, prerequisites, entry_md, example
+
+def detect_skill_type(repo_info):
+    """Pick a template set from the analysis: Node bin -> node-tool, no CLI but Python deps -> python-library."""
+    analysis = repo_info.get('analysis') or {}
+    kinds = [ep['kind'] for ep in analysis.get('entry_points', [])]
+    if kinds and kinds[0] == 'node_bin':
+        return 'node-tool'
+    if not kinds and analysis.get('dependencies', {}).get('python') and not analysis.get('dependencies', {}).get('node'):
+        return 'python-library'
+    return 'cli-wrapper'
+
+def template_variables(repo_info, safe_name, skill_type):
+    dependencies, prerequisites, entry_points_md, example = analysis_sections(repo_info)
+    return {
+        'name': safe_name,
+        'repo_name': repo_info['name'],
+        'url': repo_info['url'],
+        'github_hash': repo_info['latest_hash'],
+        'created_at': datetime.datetime.now().isoformat(),
+        'skill_type': skill_type,
+        'dependencies_json': json.dumps(dependencies),
+        'readme_excerpt': repo_info['readme'][:500],
+        'entry_points_md': entry_points_md,
+        'prerequisites': prerequisites,
+        'example_command': repr(example),
+        'example_args': ", ".join(repr(arg) for arg in example),
+        'module_name': repo_info['name'].replace('-', '_').lower(),
+    }
+
+def write_scaffold(files, skill_path):
+    """
+    Writes all files into a hidden temp directory next to `skill_path`, then renames it
+    into place, so a half-written skill never shows up in the skills root. When the
+    skill already exists, each generated file is swapped in with os.replace instead
+    and everything else in the folder (evolution.json, references, ...) is kept.
+    """
+    output_dir = os.path.dirname(skill_path)
+    os.makedirs(output_dir, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=output_dir, prefix=f".{os.path.basename(skill_path)}.", suffix=".tmp")
+    try:
+        for sub in SCAFFOLD_DIRS:
+            os.makedirs(os.path.join(tmp_dir, sub), exist_ok=True)
+        for rel, content in files.items():
+            path = os.path.join(tmp_dir, *rel.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        os.chmod(tmp_dir, 0o777 & ~_umask())
+
+        try:
+            os.rename(tmp_dir, skill_path)
+            return
+        except OSError:
+            if not os.path.isdir(skill_path):
+                raise
+        # Existing skill: replace generated files one by one
+        for sub in SCAFFOLD_DIRS:
+            os.makedirs(os.path.join(skill_path, sub), exist_ok=True)
+        for rel in files:
+            target = os.path.join(skill_path, *rel.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(os.path.join(tmp_dir, *rel.split('/')), target)
+    finally:
+        if os.path.isdir(tmp_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def _umask():
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+def create_skill(repo_info, output_dir, verbose=True, skill_type=None):
     """
     Scaffolds a new skill directory based on GitHub repository info.
+    `skill_type` selects a template set under templates/ (default: detected from
+    the analysis). Returns the path of the skill directory.
     """
     repo_name = repo_info['name']
-    safe_name = "".join(c if c.isalnum() or c in ('-','_') else '-' for c in repo_name).lower()
+    safe_name = safe_skill_name(repo_name)
     skill_path = os.path.join(output_dir, safe_name)
-    
-    # 1. Create Directory Structure
-    os.makedirs(os.path.join(skill_path, "scripts"), exist_ok=True)
-    os.makedirs(os.path.join(skill_path, "references"), exist_ok=True)
-    os.makedirs(os.path.join(skill_path, "assets"), exist_ok=True)
-    
-    # 2. Create SKILL.md with Extended Metadata
-    skill_md_content = f"""---
-name: {safe_name}
-description: Skill wrapper for {repo_info['name']}. Generated from {repo_info['url']}.
-github_url: {repo_info['url']}
-github_hash: {repo_info['latest_hash']}
-version: 0.1.0
-created_at: {datetime.datetime.now().isoformat()}
-entry_point: scripts/wrapper.py
----
-
-# {repo_info['name']} Skill
-
-This skill wraps the capabilities of [{repo_info['name']}]({repo_info['url']}).
-
-## Overview
-
-(Auto-generated context from README)
-{repo_info['readme'][:500]}...
-
-## Usage
-
-This skill provides a Python wrapper to interface with the tool. 
-
-### Prerequisites
-
-Ensure the following dependencies are installed:
-- [TODO: List dependencies based on requirements.txt]
-
-## Implementation Details
-
-The wrapper script in `scripts/wrapper.py` handles the invocation of the underlying tool.
-"""
-    
-    with open(os.path.join(skill_path, "SKILL.md"), "w", encoding="utf-8") as f:
-        f.write(skill_md_content)
-        
-    # 3. Create Placeholder Wrapper Script
-    wrapper_content = f"""import sys
-import subprocess
-
-def main():
-    print("This is a placeholder wrapper for {repo_name}.")
-    # TODO: Implement actual invocation logic here based on {repo_name} usage
-    # Example: subprocess.run(['{repo_name}', *sys.argv[1:]])
+    skill_type = skill_type or detect_skill_type(repo_info)
 
-if __name__ == "__main__":
-    main()
-"""
-    with open(os.path.join(skill_path, "scripts", "wrapper.py"), "w", encoding="utf-8") as f:
-        f.write(wrapper_content)
+    # 1. Render SKILL.md (extended metadata) and the type's scripts from templates
+    files = render_scaffold(skill_type, template_variables(repo_info, safe_name, skill_type))
 
-    print(f"Skill scaffolded at: {skill_path}")
-    print("Next steps:")
-    print("1. Review SKILL.md and refine the description.")
-    print("2. Implement the actual logic in scripts/wrapper.py.")
-    print(f"3. Run: python package_skill.py {skill_path}")
+    # 2. Write everything at once
+    write_scaffold(files, skill_path)
+
+    if verbose:
+        entry_point = next((rel for rel in sorted(files) if rel.startswith("scripts/")), "scripts/")
+        print(f"Skill scaffolded at: {skill_path} ({skill_type})")
+        print("Next steps:")
+        print("1. Review SKILL.md and refine the description.")
+        print(f"2. Implement the actual logic in {entry_point}.")
+        print(f"3. Run: python package_skill.py {skill_path}")
+    return skill_path
 
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python create_github_skill.py <json_info_file> <output_skills_dir>")
-        sys.exit(1)
-        
-    json_file = sys.argv[1]
-    output_dir = sys.argv[2]
-    
-    with open(json_file, 'r', encoding='utf-8') as f:
+    parser = argparse.ArgumentParser(prog="create_github_skill.py")
+    parser.add_argument("json_file", metavar="json_info_file")
+    parser.add_argument("output_dir", metavar="output_skills_dir")
+    parser.add_argument("--type", dest="skill_type", choices=available_types(),
+                        help="Template set to use (default: detected from the repo analysis).")
+    args = parser.parse_args()
+
+    with open(args.json_file, 'r', encoding='utf-8') as f:
         repo_info = json.load(f)
-        
-    create_skill(repo_info, output_dir)
+
+    try:
+        create_skill(repo_info, args.output_dir, skill_type=args.skill_type)
+    except TemplateError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
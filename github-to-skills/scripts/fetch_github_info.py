@@ -1,75 +1,349 @@
 import sys
 import json
+import base64
+import codecs
+import hashlib
+import argparse
+import datetime
 import subprocess
-import re
+import threading
+import tempfile
+import http.client
+import urllib.parse
 import urllib.request
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-def get_repo_info(url):
+README_LIMIT = 10000  # characters kept from the README, to avoid context blowup
+HTTP_TIMEOUT = 10.0
+GIT_TIMEOUT = 60.0
+READ_CHUNK = 16 * 1024
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+
+# Raw file host; override with GITHUB_RAW_BASE (e.g. a local mirror or test server)
+DEFAULT_RAW_BASE = "https://raw.githubusercontent.com"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "github-to-skills", "http")
+
+# Probed concurrently; the first one that exists in this order wins
+README_BRANCHES = ["main", "master"]
+README_NAMES = ["README.md", "readme.md"]
+
+
+class HttpCache:
+    """
+    On-disk cache of GET responses (one JSON file per URL). Entries are revalidated
+    with If-None-Match / If-Modified-Since, so unchanged files cost a 304 and no body.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def get(self, url):
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if entry.get("url") == url else None
+
+    def put(self, url, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = dict(entry, url=url, fetched_at=datetime.datetime.now().isoformat())
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", delete=False, dir=self.cache_dir, suffix=".tmp") as tmp:
+            json.dump(entry, tmp, ensure_ascii=False)
+            tmp_path = tmp.name
+        os.replace(tmp_path, self._path(url))
+
+
+class HttpClient:
+    """
+    Minimal keep-alive HTTP client. Idle connections are pooled per host and shared
+    by every thread, so fetching many files from one host reuses a few connections.
+
+    Redirects are followed (up to MAX_REDIRECTS hops) and the usual proxy settings
+    are honoured: `proxies` defaults to `urllib.request.getproxies()` (HTTP_PROXY /
+    HTTPS_PROXY / NO_PROXY, or the system settings on Windows and macOS). HTTPS goes
+    through a CONNECT tunnel, plain HTTP through the proxy with absolute request URIs.
+    """
+
+    def __init__(self, cache=None, timeout=HTTP_TIMEOUT, proxies=None):
+        self.cache = cache
+        self.timeout = timeout
+        self.proxies = urllib.request.getproxies() if proxies is None else proxies
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "not_modified": 0, "connections": 0, "redirects": 0}
+
+    def _proxy_for(self, scheme, netloc):
+        """Returns the proxy URL split into parts, or None for a direct connection."""
+        proxy = self.proxies.get(scheme)
+        if not proxy:
+            return None
+        host = urllib.parse.urlsplit(f"//{netloc}").hostname or netloc
+        if "no" in self.proxies:
+            bypass = urllib.request.proxy_bypass_environment(host, self.proxies)
+        else:
+            bypass = urllib.request.proxy_bypass(host)
+        if bypass:
+            return None
+        return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    @staticmethod
+    def _proxy_headers(proxy):
+        if proxy.username is None:
+            return {}
+        credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+        return {"Proxy-Authorization": "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")}
+
+    def _acquire(self, scheme, netloc):
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop()
+            self.stats["connections"] += 1
+        proxy = self._proxy_for(scheme, netloc)
+        if proxy is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            return cls(netloc, timeout=self.timeout)
+        proxy_netloc = proxy.netloc.rpartition("@")[2]
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(proxy_netloc, timeout=self.timeout)
+            conn.set_tunnel(netloc, headers=self._proxy_headers(proxy))
+            return conn
+        return http.client.HTTPConnection(proxy_netloc, timeout=self.timeout)
+
+    def _release(self, scheme, netloc, conn):
+        with self._lock:
+            self._idle.setdefault((scheme, netloc), []).append(conn)
+
+    def close(self):
+        with self._lock:
+            conns = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for conn in conns:
+            conn.close()
+
+    def _send(self, url, headers):
+        """One GET on a pooled connection. Returns (parts, connection, response)."""
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+        proxy = self._proxy_for(parts.scheme, parts.netloc) if parts.scheme == "http" else None
+        if proxy is not None:
+            # Plain HTTP through a forward proxy: absolute URI plus proxy credentials
+            path = urllib.parse.urlunsplit((parts.scheme, parts.netloc, path or "/", "", ""))
+            headers = dict(headers, **self._proxy_headers(proxy))
+
+        # A pooled connection may have been closed by the server; retry once on a fresh one
+        for attempt in range(2):
+            conn = self._acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", path or "/", headers=headers)
+                response = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                if attempt:
+                    raise
+            except Exception:
+                conn.close()
+                raise
+        with self._lock:
+            self.stats["requests"] += 1
+        return parts, conn, response
+
+    def get_text(self, url, limit=README_LIMIT):
+        """
+        GET `url` and return its body decoded as UTF-8 and cut to `limit` characters,
+        or None if the server does not return 200/304. Redirects are followed; the
+        cache entry stays under the requested URL. Only as much of the body as
+        needed is read; the rest of the stream is discarded with its connection.
+        """
+        cached = self.cache.get(url) if self.cache else None
+        headers = {"User-Agent": "github-to-skills", "Accept-Encoding": "identity"}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        target = url
+        for _ in range(MAX_REDIRECTS + 1):
+            parts, conn, response = self._send(target, headers)
+            location = response.getheader("Location")
+            if response.status not in REDIRECT_STATUSES or not location:
+                break
+            response.read()
+            self._release(parts.scheme, parts.netloc, conn)
+            with self._lock:
+                self.stats["redirects"] += 1
+            target = urllib.parse.urljoin(target, location)
+        else:
+            return None  # too many redirects
+
+        if response.status == 304 and cached:
+            response.read()
+            self._release(parts.scheme, parts.netloc, conn)
+            with self._lock:
+                self.stats["not_modified"] += 1
+            return cached["body"][:limit]
+
+        if response.status != 200:
+            response.read()
+            self._release(parts.scheme, parts.netloc, conn)
+            return None
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pieces = []
+        length = 0
+        truncated = True
+        while length < limit:
+            chunk = response.read(READ_CHUNK)
+            if not chunk:
+                pieces.append(decoder.decode(b"", final=True))
+                truncated = False
+                break
+            text = decoder.decode(chunk)
+            pieces.append(text)
+            length += len(text)
+        body = "".join(pieces)[:limit]
+        if truncated and response.length == 0:
+            truncated = False
+
+        if response.isclosed():
+            self._release(parts.scheme, parts.netloc, conn)
+        else:
+            conn.close()  # unread remainder; do not reuse the connection
+
+        if self.cache:
+            self.cache.put(url, {
+                "etag": response.getheader("ETag"),
+                "last_modified": response.getheader("Last-Modified"),
+                "body": body,
+                "truncated": truncated,
+            })
+        return body
+
+
+def raw_base_url(url, raw_base=None):
+    """`https://github.com/<owner>/<repo>` -> `<raw_base>/<owner>/<repo>`."""
+    raw_base = (raw_base or os.environ.get("GITHUB_RAW_BASE") or DEFAULT_RAW_BASE).rstrip("/")
+    path = urllib.parse.urlsplit(url).path if "://" in url else url.replace("\\", "/")
+    owner_repo = [p for p in path.split("/") if p][-2:]
+    return f"{raw_base}/" + "/".join(owner_repo)
+
+
+def ls_remote(url, timeout=GIT_TIMEOUT):
+    """Returns (latest_hash, default_branch) for the remote HEAD without cloning."""
+    result = subprocess.run(
+        ['git', 'ls-remote', '--symref', url, 'HEAD'],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=timeout,
+    )
+    # Output format: "ref: refs/heads/<branch>\tHEAD" then "<hash>\tHEAD"
+    latest_hash, branch = "unknown", None
+    for line in result.stdout.splitlines():
+        if line.startswith("ref: refs/heads/"):
+            branch = line[len("ref: refs/heads/"):].split("\t")[0]
+        elif line.endswith("\tHEAD"):
+            latest_hash = line.split()[0]
+    return latest_hash, branch
+
+
+def fetch_readme(client, base, branches, executor):
+    """Probe README candidates concurrently; return the first hit in preference order."""
+    candidates = [f"{base}/{b}/{n}" for n in README_NAMES for b in branches]
+    futures = [executor.submit(client.get_text, c) for c in candidates]
+    for future in futures:
+        try:
+            body = future.result()
+        except Exception:
+            continue
+        if body is not None:
+            for other in futures:
+                other.cancel()
+            return body
+    return ""
+
+
+def get_repo_info(url, client=None, raw_base=None, remote=None):
     """
     Fetches repository information using git ls-remote and direct HTTP requests.
     Returns a dictionary with name, description, latest_hash, and readme content.
+    `remote` may pass in an earlier ls_remote() result to skip that round trip.
     """
-    
+    own_client = client is None
+    client = client or HttpClient(HttpCache())
+
     # Normalize URL (remove .git suffix if present)
     clean_url = url.rstrip('/')
     if clean_url.endswith('.git'):
         clean_url = clean_url[:-4]
-        
-    repo_name = clean_url.split('/')[-1]
-    
-    # 1. Get Latest Commit Hash (using git ls-remote to avoid full clone)
-    try:
-        # Use git ls-remote to get HEAD
-        result = subprocess.run(
-            ['git', 'ls-remote', url, 'HEAD'], 
-            capture_output=True, 
-            text=True, 
-            check=True
-        )
-        # Output format: <hash>\tHEAD
-        latest_hash = result.stdout.split()[0]
-    except Exception as e:
-        print(f"Error fetching git info: {e}", file=sys.stderr)
-        latest_hash = "unknown"
-
-    # 2. Fetch README (Try main, then master)
-    readme_content = ""
-    readme_url_base = clean_url.replace("github.com", "raw.githubusercontent.com")
-    
-    for branch in ["main", "master"]:
+
+    repo_name = clean_url.replace('\\', '/').split('/')[-1]
+    base = raw_base_url(clean_url, raw_base)
+
+    workers = len(README_BRANCHES) * len(README_NAMES) + 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 1. Latest commit hash runs alongside the README probes
+        remote_future = executor.submit(ls_remote, url) if remote is None else None
+        # 2. Fetch README (main/master x README.md/readme.md, all at once)
+        readme_content = fetch_readme(client, base, README_BRANCHES, executor)
+
         try:
-            readme_url = f"{readme_url_base}/{branch}/README.md"
-            with urllib.request.urlopen(readme_url) as response:
-                readme_content = response.read().decode('utf-8')
-                break
-        except Exception:
-            continue
-            
-    if not readme_content:
-        # Try lowercase readme
-        for branch in ["main", "master"]:
-            try:
-                readme_url = f"{readme_url_base}/{branch}/readme.md"
-                with urllib.request.urlopen(readme_url) as response:
-                    readme_content = response.read().decode('utf-8')
-                    break
-            except Exception:
-                continue
+            latest_hash, default_branch = remote if remote_future is None else remote_future.result()
+        except Exception as e:
+            print(f"Error fetching git info: {e}", file=sys.stderr)
+            latest_hash, default_branch = "unknown", None
+
+        if not readme_content and default_branch and default_branch not in README_BRANCHES:
+            readme_content = fetch_readme(client, base, [default_branch], executor)
+
+    if own_client:
+        client.close()
 
     # 3. Construct Result
     return {
         "name": repo_name,
         "url": url,
         "latest_hash": latest_hash,
-        "readme": readme_content[:10000] # Truncate if too huge to avoid context blowup
+        "readme": readme_content[:README_LIMIT]
     }
 
+
+def get_many_repo_info(urls, workers=8, client=None, raw_base=None):
+    """Fetches several repositories concurrently over one shared connection pool and cache."""
+    own_client = client is None
+    client = client or HttpClient(HttpCache())
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda u: get_repo_info(u, client, raw_base), urls))
+    finally:
+        if own_client:
+            client.close()
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python fetch_github_info.py <github_url>")
-        sys.exit(1)
-        
-    url = sys.argv[1]
-    info = get_repo_info(url)
+    parser = argparse.ArgumentParser(prog="fetch_github_info.py")
+    parser.add_argument("urls", nargs="+", metavar="github_url")
+    parser.add_argument("--cache-dir", default=os.environ.get("GITHUB_TO_SKILLS_CACHE", DEFAULT_CACHE_DIR))
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the HTTP cache.")
+    parser.add_argument("--timeout", type=float, default=HTTP_TIMEOUT, help="Per-request HTTP timeout in seconds.")
+    parser.add_argument("--workers", type=int, default=8, help="Repositories fetched in parallel.")
+    parser.add_argument("--raw-base", help=f"Raw file host (default: $GITHUB_RAW_BASE or {DEFAULT_RAW_BASE}).")
+    args = parser.parse_args()
+
+    client = HttpClient(None if args.no_cache else HttpCache(args.cache_dir), timeout=args.timeout)
+    try:
+        if len(args.urls) == 1:
+            info = get_repo_info(args.urls[0], client, args.raw_base)
+        else:
+            info = get_many_repo_info(args.urls, args.workers, client, args.raw_base)
+    finally:
+        client.close()
     print(json.dumps(info, indent=2))
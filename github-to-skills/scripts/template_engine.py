@@ -0,0 +1,102 @@
+"""
+Minimal template engine for skill scaffolds.
+
+Templates live in `github-to-skills/templates/<skill_type>/`, mirroring the layout of
+the generated skill with a `.tmpl` suffix (e.g. `scripts/wrapper.py.tmpl`). Files in
+`templates/base/` are shared by every type; a type directory can override them.
+Files whose name starts with `_` are partials: they are rendered first and exposed to
+the other templates as a variable named after the file (`_usage.md.tmpl` -> `{{usage}}`).
+`{{entry_point}}` defaults to the first generated file under `scripts/`.
+
+Placeholders are `{{name}}`. A template is compiled once into literal/variable parts
+and kept in a process-wide cache that is invalidated when the file's mtime or size
+changes, so batch runs do not re-read or re-parse anything.
+"""
+import os
+import re
+import threading
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+BASE_TYPE = "base"
+TEMPLATE_SUFFIX = ".tmpl"
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+class TemplateError(Exception):
+    """A template is missing, or refers to a variable that was not provided."""
+
+
+class CompiledTemplate:
+    def __init__(self, path, text):
+        self.path = path
+        # Even indexes are literals, odd indexes are variable names
+        self.parts = PLACEHOLDER_RE.split(text)
+
+    def render(self, variables):
+        out = list(self.parts)
+        for i in range(1, len(out), 2):
+            try:
+                out[i] = str(variables[out[i]])
+            except KeyError:
+                raise TemplateError(f"{self.path}: unknown variable '{out[i]}'") from None
+        return "".join(out)
+
+
+def load_template(path):
+    """Compiled template for `path`, recompiled only when the file changed on disk."""
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        raise TemplateError(f"template not found: {path}") from e
+    key = (st.st_mtime_ns, st.st_size)
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+    with open(path, "r", encoding="utf-8") as f:
+        compiled = CompiledTemplate(path, f.read())
+    with _cache_lock:
+        _cache[path] = (key, compiled)
+    return compiled
+
+
+def available_types(templates_dir=TEMPLATES_DIR):
+    return sorted(
+        e.name for e in os.scandir(templates_dir)
+        if e.is_dir() and e.name != BASE_TYPE and not e.name.startswith(".")
+    )
+
+
+def template_files(skill_type, templates_dir=TEMPLATES_DIR):
+    """{relative output path: template path} for a skill type, with base files as fallback."""
+    type_dir = os.path.join(templates_dir, skill_type)
+    if skill_type == BASE_TYPE or not os.path.isdir(type_dir):
+        raise TemplateError(f"unknown skill type '{skill_type}' (available: {', '.join(available_types(templates_dir))})")
+    files = {}
+    for root in (os.path.join(templates_dir, BASE_TYPE), type_dir):
+        if not os.path.isdir(root):
+            continue
+        for dirpath, _dirnames, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith(TEMPLATE_SUFFIX):
+                    path = os.path.join(dirpath, filename)
+                    rel = os.path.relpath(path, root)[:-len(TEMPLATE_SUFFIX)].replace(os.sep, "/")
+                    files[rel] = path
+    return files
+
+
+def render_scaffold(skill_type, variables, templates_dir=TEMPLATES_DIR):
+    """Render every file of a skill type. Returns {relative output path: content}."""
+    files = template_files(skill_type, templates_dir)
+    variables = dict(variables)
+    partials = sorted(rel for rel in files if os.path.basename(rel).startswith("_"))
+    outputs = sorted(rel for rel in files if rel not in partials)
+    # The first generated script is what SKILL.md advertises as `entry_point`
+    variables.setdefault("entry_point", next((rel for rel in outputs if rel.startswith("scripts/")), ""))
+    for rel in partials:
+        name = os.path.basename(rel)[1:].split(".", 1)[0]
+        variables[name] = load_template(files[rel]).render(variables).rstrip("\n")
+    return {rel: load_template(files[rel]).render(variables) for rel in outputs}
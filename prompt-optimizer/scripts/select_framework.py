@@ -0,0 +1,393 @@
+"""
+Rank the prompt frameworks in `references/frameworks/` against a prompt and print
+the best matches with only their relevant sections.
+
+Each framework is indexed (BM25 over weighted fields) from its title, 应用场景 list,
+the Frameworks_Summary.md row, the SKILL.md selection tables and its component
+names, with a lower weight for 概述. Chinese text is tokenized into character
+bigrams, other text into lowercase words.
+
+The index is stored in `references/.framework-index.json`. Files are checked by
+mtime/size first and re-hashed only when those change; only frameworks whose hash
+changed are re-tokenized.
+
+Usage:
+  python select_framework.py "帮我写一篇推广健身应用的营销文案" [-k 3] [--sections 2] [--max-chars 3000]
+  echo "<prompt>" | python select_framework.py - [--json]
+  python select_framework.py --rebuild --stats
+"""
+import os
+import re
+import sys
+import json
+import math
+import signal
+import argparse
+
+SKILL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REFERENCES_DIR = os.path.join(SKILL_DIR, "references")
+FRAMEWORKS_DIR = os.path.join(REFERENCES_DIR, "frameworks")
+SUMMARY_FILE = os.path.join(REFERENCES_DIR, "Frameworks_Summary.md")
+SKILL_FILE = os.path.join(SKILL_DIR, "SKILL.md")
+INDEX_FILE_NAME = ".framework-index.json"
+INDEX_VERSION = 1
+
+FIELD_WEIGHTS = {"title": 4.0, "scenarios": 3.0, "keywords": 2.0, "overview": 1.0}
+BM25_K1 = 1.2
+BM25_B = 0.6
+
+# Sections never worth returning as an excerpt
+SKIP_SECTIONS = {"网址"}
+# Returned for every hit, ahead of the best matching sections
+ALWAYS_SECTIONS = ("框架构成",)
+
+TOKEN_RE = re.compile(r"[㐀-䶿一-鿿豈-﫿]+|[a-z0-9]+(?:['’][a-z]+)?")
+CJK_RE = re.compile(r"[㐀-䶿一-鿿豈-﫿]")
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "for", "on", "with", "is", "are", "be",
+    "it", "this", "that", "i", "me", "my", "we", "you", "your", "by", "as", "at", "from", "into",
+    "need", "want", "please", "can", "could", "help", "some", "framework", "prompt",
+}
+
+
+def tokenize(text):
+    """Lowercase words for Latin text, overlapping bigrams for runs of Chinese characters."""
+    tokens = []
+    for run in TOKEN_RE.findall(text.lower()):
+        if CJK_RE.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif run not in STOPWORDS:
+            tokens.append(run)
+    return tokens
+
+
+def normalize_name(name):
+    """'Bloom's Taxonomy Framework' / 'Blooms_Taxonomy' -> 'bloomstaxonomy'."""
+    name = re.sub(r"\(.*?\)|framework|prompting|model$", "", name.lower())
+    return re.sub(r"[^a-z0-9]+", "", name)
+
+
+def split_sections(text):
+    """[(level, heading, body)] for every `#`/`##`/`###` heading, in order."""
+    sections = []
+    for block in re.split(r"(?m)^(?=#{1,3} )", text):
+        if not block.startswith("#"):
+            continue
+        head, _, body = block.partition("\n")
+        level = len(head) - len(head.lstrip("#"))
+        sections.append((level, head.lstrip("#").strip(), body.strip()))
+    return sections
+
+
+def parse_framework(text):
+    """Field texts for one framework file."""
+    sections = split_sections(text)
+    fields = {"title": "", "scenarios": "", "keywords": "", "overview": ""}
+    for level, heading, body in sections:
+        if level == 1 and not fields["title"]:
+            fields["title"] = heading
+        elif heading == "应用场景":
+            fields["scenarios"] = body
+        elif heading == "概述":
+            fields["overview"] = body
+        elif heading == "框架构成":
+            # Component names (both columns of name) from the table
+            names = []
+            for row in body.splitlines():
+                cells = [c.strip() for c in row.strip().strip("|").split("|")]
+                if len(cells) >= 2 and not set(cells[0]) <= set("-: ") and cells[0] != "组成部分":
+                    names.extend(cells[:2])
+            fields["keywords"] = " ".join(names)
+    return fields
+
+
+def _table_rows(text):
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("|") and not set(line) <= set("|-: "):
+            yield [c.strip() for c in line.strip("|").split("|")]
+
+
+def shared_keywords():
+    """
+    {normalized framework name: text} from Frameworks_Summary.md (scenario column) and
+    the SKILL.md selection tables (domain / "user says" column).
+    """
+    extra = {}
+    try:
+        with open(SUMMARY_FILE, "r", encoding="utf-8") as f:
+            for cells in _table_rows(f.read()):
+                if len(cells) >= 4 and cells[0].isdigit():
+                    extra.setdefault(normalize_name(cells[1]), []).append(cells[3])
+    except OSError:
+        pass
+    try:
+        with open(SKILL_FILE, "r", encoding="utf-8") as f:
+            for cells in _table_rows(f.read()):
+                if len(cells) != 2:
+                    continue
+                for name in cells[1].split(","):
+                    extra.setdefault(normalize_name(name), []).append(cells[0])
+    except OSError:
+        pass
+    return {name: " ".join(parts) for name, parts in extra.items()}
+
+
+def _file_sha(path):
+    # hashlib is only needed once a stat changed; an up-to-date index never loads it
+    import hashlib
+
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _shared_sha():
+    """Hash of the files every framework takes keywords from; a change re-indexes all of them."""
+    import hashlib
+
+    return hashlib.sha256(
+        b"".join(_file_sha(p).encode() if os.path.exists(p) else b"-" for p in (SUMMARY_FILE, SKILL_FILE))
+    ).hexdigest()
+
+
+def _stat(path):
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _doc_terms(fields, extra_text):
+    """Weighted term frequencies and weighted length of one framework."""
+    terms = {}
+    length = 0.0
+    texts = dict(fields)
+    texts["keywords"] = f"{fields['keywords']} {extra_text}"
+    for name, weight in FIELD_WEIGHTS.items():
+        tokens = tokenize(texts[name])
+        length += weight * len(tokens)
+        for token in tokens:
+            terms[token] = terms.get(token, 0.0) + weight
+    return terms, length
+
+
+def load_index(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+
+def save_index(path, index):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # A read-only skill folder still works, it just re-indexes every run.
+        print(f"Warning: could not write framework index: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def update_index(index_path=None, force=False):
+    """
+    Bring the index up to date and return (index, number of re-tokenized frameworks).
+
+    Index layout: {"version", "shared": {"sha", "stat"}, "docs": [{"file", "title", "sha",
+    "stat", "length"}], "postings": {term: [doc, weighted tf, doc, weighted tf, ...]}}.
+    """
+    index_path = index_path or os.path.join(REFERENCES_DIR, INDEX_FILE_NAME)
+    index = None if force else load_index(index_path)
+    files = sorted(name for name in os.listdir(FRAMEWORKS_DIR) if name.endswith(".md"))
+
+    shared_stat = [_stat(p) if os.path.exists(p) else None for p in (SUMMARY_FILE, SKILL_FILE)]
+    if index is not None and index["shared"]["stat"] != shared_stat:
+        shared_sha = _shared_sha()
+        if shared_sha != index["shared"]["sha"]:
+            index = None
+        else:
+            index["shared"]["stat"] = shared_stat
+            index["dirty"] = True
+    if index is not None and [d["file"] for d in index["docs"]] != files:
+        index = None
+
+    if index is None:
+        shared_sha = _shared_sha()
+        index = {
+            "version": INDEX_VERSION,
+            "shared": {"sha": shared_sha, "stat": shared_stat},
+            "docs": [{"file": name, "sha": None, "stat": None} for name in files],
+            "postings": {},
+            "dirty": True,
+        }
+
+    extra = None
+    changed = {}
+    for i, doc in enumerate(index["docs"]):
+        path = os.path.join(FRAMEWORKS_DIR, doc["file"])
+        stat = _stat(path)
+        if doc["stat"] == stat:
+            continue
+        index["dirty"] = True
+        sha = _file_sha(path)
+        doc["stat"] = stat
+        if sha == doc["sha"]:
+            continue
+        if extra is None:
+            extra = shared_keywords()
+        with open(path, "r", encoding="utf-8") as f:
+            fields = parse_framework(f.read())
+        title = fields["title"] or doc["file"]
+        stem_name = normalize_name(re.sub(r"^\d+_|_Framework\.md$", "", doc["file"]))
+        extra_text = extra.get(normalize_name(title)) or extra.get(stem_name, "")
+        terms, length = _doc_terms(fields, extra_text)
+        doc.update({"sha": sha, "title": title, "length": length})
+        changed[i] = terms
+
+    if changed:
+        postings = index["postings"]
+        for term in list(postings):
+            flat = postings[term]
+            kept = [x for j in range(0, len(flat), 2) if flat[j] not in changed for x in flat[j:j + 2]]
+            if kept:
+                postings[term] = kept
+            else:
+                del postings[term]
+        for i, terms in changed.items():
+            for term, tf in terms.items():
+                postings.setdefault(term, []).extend((i, round(tf, 2)))
+
+    if index.pop("dirty", False):
+        save_index(index_path, index)
+    return index, len(changed)
+
+
+def rank(index, query, top_k=3):
+    """[(score, doc_index, matched_terms)] best first."""
+    docs = index["docs"]
+    n = len(docs)
+    avg_len = sum(d["length"] for d in docs) / n if n else 1.0
+    scores = {}
+    matched = {}
+    for term in set(tokenize(query)):
+        flat = index["postings"].get(term)
+        if not flat:
+            continue
+        df = len(flat) // 2
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for j in range(0, len(flat), 2):
+            i, tf = flat[j], flat[j + 1]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * docs[i]["length"] / avg_len)
+            scores[i] = scores.get(i, 0.0) + idf * tf * (BM25_K1 + 1) / (tf + norm)
+            matched.setdefault(i, []).append(term)
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], docs[item[0]]["file"]))
+    return [(score, i, sorted(matched[i])) for i, score in ranked[:top_k]]
+
+
+def excerpt(path, terms, max_sections=2, max_chars=1500):
+    """
+    The 应用场景 list, the component table and the `max_sections` other sections that
+    contain the most query terms, truncated to `max_chars` in total.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        sections = split_sections(f.read())
+    term_set = set(terms)
+    picked = []
+    candidates = []
+    for order, (level, heading, body) in enumerate(sections):
+        if level == 1 or heading in SKIP_SECTIONS or not body:
+            continue
+        if heading == "应用场景" or heading in ALWAYS_SECTIONS:
+            picked.append((order, heading, body))
+            continue
+        hits = sum(1 for token in tokenize(f"{heading}\n{body}") if token in term_set)
+        if hits:
+            candidates.append((hits / (1 + len(body) / 400), order, heading, body))
+    candidates.sort(key=lambda c: -c[0])
+    picked.extend((order, heading, body) for _, order, heading, body in candidates[:max_sections])
+    picked.sort()
+
+    out = []
+    budget = max_chars
+    for _, heading, body in picked:
+        if budget <= 0:
+            break
+        text = f"## {heading}\n{body}"
+        if len(text) > budget:
+            text = text[:budget].rstrip() + " …"
+        out.append({"heading": heading, "text": text})
+        budget -= len(text)
+    return out
+
+
+def select(query, top_k=3, max_sections=2, max_chars=3000, index_path=None, force=False):
+    """Report dict printed by the CLI."""
+    index, reindexed = update_index(index_path, force)
+    hits = []
+    results = rank(index, query, top_k)
+    per_hit = max_chars // max(1, len(results))
+    for score, i, terms in results:
+        doc = index["docs"][i]
+        path = os.path.join(FRAMEWORKS_DIR, doc["file"])
+        hits.append({
+            "title": doc["title"],
+            "file": os.path.relpath(path, SKILL_DIR),
+            "score": round(score, 3),
+            "matched": terms,
+            "sections": excerpt(path, terms, max_sections, per_hit),
+        })
+    return {"query": query, "reindexed": reindexed, "frameworks": len(index["docs"]), "hits": hits}
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="select_framework.py", description="Pick prompt frameworks for a prompt.")
+    parser.add_argument("prompt", nargs="?", help='Prompt text, or "-" to read it from stdin.')
+    parser.add_argument("-k", "--top", type=int, default=3, help="Number of frameworks to return (default: 3).")
+    parser.add_argument("--sections", type=int, default=2, help="Best matching sections per framework, besides 应用场景 and 框架构成.")
+    parser.add_argument("--max-chars", type=int, default=3000, help="Excerpt budget shared by all hits (default: 3000).")
+    parser.add_argument("--index", help=f"Index file (default: references/{INDEX_FILE_NAME}).")
+    parser.add_argument("--rebuild", action="store_true", help="Re-index every framework.")
+    parser.add_argument("--stats", action="store_true", help="Print index statistics.")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    if hasattr(signal, "SIGPIPE"):
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)  # `| head` ends the output quietly
+
+    if args.prompt is None and not (args.rebuild or args.stats):
+        parser.error("a prompt is required")
+    if args.prompt is None:
+        index, reindexed = update_index(args.index, args.rebuild)
+        print(f"{len(index['docs'])} frameworks, {len(index['postings'])} terms, {reindexed} re-indexed")
+        return 0
+
+    query = sys.stdin.read() if args.prompt == "-" else args.prompt
+    report = select(query, args.top, args.sections, args.max_chars, args.index, args.rebuild)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+    if not report["hits"]:
+        print("No matching framework; see references/Frameworks_Summary.md.")
+        return 1
+    for n, hit in enumerate(report["hits"], 1):
+        print(f"{n}. {hit['title']} ({hit['file']}, score {hit['score']})")
+        print(f"   matched: {' '.join(hit['matched'])}")
+        for section in hit["sections"]:
+            print()
+            print(section["text"])
+        print()
+    if args.stats:
+        print(f"[{report['frameworks']} frameworks, {report['reindexed']} re-indexed]", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,32 +1,97 @@
 import os
 import sys
-import subprocess
+import json
+import time
+import argparse
+import concurrent.futures
 
-def align_all(skills_root):
-    if not os.path.exists(skills_root):
-        print(f"Error: {skills_root} not found")
-        return
+from smart_stitch import stitch
+
+
+def _align_one(skill_dir):
+    """Stitch one skill and time it. Runs inside a worker thread/process."""
+    start = time.perf_counter()
+    try:
+        status, message = stitch(skill_dir)
+    except Exception as e:
+        status, message = "error", f"{type(e).__name__}: {e}"
+    return {
+        "name": os.path.basename(skill_dir),
+        "status": status,
+        "message": message,
+        "seconds": round(time.perf_counter() - start, 6),
+    }
 
-    stitch_script = os.path.join(os.path.dirname(__file__), "smart_stitch.py")
-    
-    count = 0
-    for item in os.listdir(skills_root):
+
+def find_evolved_skills(skills_root):
+    """Skill folders that carry an evolution.json (hidden folders such as `.trash` are skipped)."""
+    skill_dirs = []
+    for item in sorted(os.listdir(skills_root)):
         skill_dir = os.path.join(skills_root, item)
-        if not os.path.isdir(skill_dir):
+        if item.startswith(".") or not os.path.isdir(skill_dir):
             continue
-            
-        evolution_json = os.path.join(skill_dir, "evolution.json")
-        if os.path.exists(evolution_json):
-            print(f"Aligning {item}...")
-            # Run the smart_stitch script for this skill
-            subprocess.run([sys.executable, stitch_script, skill_dir])
-            count += 1
-            
-    print(f"\nFinished. Aligned {count} skills.")
+        if os.path.exists(os.path.join(skill_dir, "evolution.json")):
+            skill_dirs.append(skill_dir)
+    return skill_dirs
+
+
+def align_all(skills_root, workers=None, use_processes=False, verbose=True):
+    """
+    Re-stitch every skill with an evolution.json, in parallel and in-process.
+    Returns a summary dict with per-skill results.
+    """
+    if not os.path.exists(skills_root):
+        print(f"Error: {skills_root} not found")
+        return None
+
+    start = time.perf_counter()
+    skill_dirs = find_evolved_skills(skills_root)
+    executor_cls = (
+        concurrent.futures.ProcessPoolExecutor if use_processes
+        else concurrent.futures.ThreadPoolExecutor
+    )
+
+    results = []
+    if skill_dirs:
+        with executor_cls(max_workers=workers) as executor:
+            futures = [executor.submit(_align_one, d) for d in skill_dirs]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                results.append(result)
+                if verbose:
+                    print(f"Aligning {result['name']}... {result['status']}")
+                    if result["status"] == "error":
+                        print(f"  {result['message']}")
+
+    results.sort(key=lambda r: r["name"])
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    return {
+        "skills_root": skills_root,
+        "total": len(results),
+        "counts": counts,
+        "errors": [r for r in results if r["status"] == "error"],
+        "elapsed_seconds": round(time.perf_counter() - start, 6),
+        "results": results,
+    }
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="align_all.py")
     # Use standard skills path
-    skills_path = r"C:\Users\20515\.claude\skills"
-    if len(sys.argv) > 1:
-        skills_path = sys.argv[1]
-    align_all(skills_path)
+    parser.add_argument("skills_root", nargs="?", default=r"C:\Users\20515\.claude\skills")
+    parser.add_argument("--workers", type=int, default=None, help="Worker count (default: executor default).")
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads.")
+    parser.add_argument("--json", action="store_true", help="Print the summary report as JSON.")
+    args = parser.parse_args()
+
+    summary = align_all(args.skills_root, args.workers, args.processes, verbose=not args.json)
+    if summary is None:
+        sys.exit(1)
+    if args.json:
+        print(json.dumps(summary, indent=2, ensure_ascii=False))
+    else:
+        aligned = summary["total"] - len(summary["errors"])
+        print(f"\nFinished. Aligned {aligned} skills in {summary['elapsed_seconds']:.2f}s ({len(summary['errors'])} errors).")
+    sys.exit(1 if summary["errors"] else 0)
@@ -0,0 +1,73 @@
+"""
+Benchmark: align_all in-process (thread / process pool) vs the old one-subprocess-per-skill loop.
+
+Builds a synthetic skills root (default 500 skills, each with SKILL.md + evolution.json)
+in a temp directory and times each strategy on a fresh copy.
+
+Usage: python bench_align.py [--skills 500] [--workers N]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+from align_all import align_all, find_evolved_skills
+
+STITCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "smart_stitch.py")
+
+
+def build_root(root, count):
+    for i in range(count):
+        skill_dir = os.path.join(root, f"skill-{i:04d}")
+        os.makedirs(skill_dir)
+        with open(os.path.join(skill_dir, "SKILL.md"), "w", encoding="utf-8") as f:
+            f.write(f"---\nname: skill-{i:04d}\ndescription: synthetic skill {i}\n---\n\n# Skill {i}\n\n" + "Body line.\n" * 200)
+        with open(os.path.join(skill_dir, "evolution.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "preferences": [f"preference {j} for skill {i}" for j in range(10)],
+                "fixes": [f"fix {j} for skill {i}" for j in range(10)],
+                "custom_prompts": "Always print an estimated runtime first.",
+            }, f, ensure_ascii=False)
+
+
+def subprocess_per_skill(root):
+    """The pre-parallel align_all: one interpreter per skill, sequentially."""
+    for skill_dir in find_evolved_skills(root):
+        subprocess.run([sys.executable, STITCH_SCRIPT, skill_dir], capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_align.py")
+    parser.add_argument("--skills", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix="align-bench-")
+    try:
+        template = os.path.join(base, "template")
+        build_root(template, args.skills)
+
+        strategies = [
+            ("subprocess per skill", subprocess_per_skill),
+            ("thread pool", lambda r: align_all(r, args.workers, verbose=False)),
+            ("process pool", lambda r: align_all(r, args.workers, use_processes=True, verbose=False)),
+        ]
+        print(f"{'strategy':<22} | {'seconds':>9} | {'skills/s':>9}")
+        print("-" * 46)
+        for label, fn in strategies:
+            root = os.path.join(base, label.replace(" ", "-"))
+            shutil.copytree(template, root)
+            start = time.perf_counter()
+            fn(root)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<22} | {elapsed:>9.3f} | {args.skills / elapsed:>9.1f}")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
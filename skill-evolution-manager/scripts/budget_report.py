@@ -0,0 +1,70 @@
+"""
+Report evolution-section budget usage across all skills, without writing anything.
+
+Usage: python budget_report.py <skills_root> [--json]
+"""
+import os
+import sys
+import json
+import argparse
+
+from align_all import find_evolved_skills
+from evolution_store import EvolutionFileError, load_evolution
+from smart_stitch import estimate_tokens, render_evolution_block
+
+
+def skill_budget(skill_dir):
+    data = load_evolution(skill_dir)
+    _block, _digest, plan = render_evolution_block(data)
+    archived = sum(len(v) for v in plan["archived"].values())
+    kept = sum(len(v) for v in plan["kept"].values())
+    body = _block.split("\n", 4)[-1]
+    tokens = estimate_tokens(body)
+    max_tokens = plan["budget"]["max_tokens"]
+    return {
+        "name": os.path.basename(skill_dir),
+        "entries": kept + archived,
+        "kept": kept,
+        "archived": archived,
+        "tokens": tokens,
+        "bytes": len(body.encode("utf-8")),
+        "max_tokens": max_tokens,
+        "max_bytes": plan["budget"]["max_bytes"],
+        "usage": round(tokens / max_tokens, 3) if max_tokens else None,
+    }
+
+
+def budget_report(skills_root):
+    rows = []
+    for skill_dir in find_evolved_skills(skills_root):
+        try:
+            rows.append(skill_budget(skill_dir))
+        except EvolutionFileError as e:
+            rows.append({"name": os.path.basename(skill_dir), "error": str(e)})
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="budget_report.py")
+    parser.add_argument("skills_root", nargs="?", default=r"C:\Users\20515\.claude\skills")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.skills_root):
+        print(f"Error: {args.skills_root} not found")
+        sys.exit(1)
+
+    rows = budget_report(args.skills_root)
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        sys.exit(0)
+
+    print(f"{'Skill Name':<30} | {'Entries':>7} | {'Kept':>5} | {'Archived':>8} | {'Tokens':>6} | {'Budget':>6} | Usage")
+    print("-" * 88)
+    for r in sorted(rows, key=lambda r: r.get("usage") or 0, reverse=True):
+        if "error" in r:
+            print(f"{r['name']:<30} | error: {r['error']}")
+            continue
+        usage = f"{r['usage']:.0%}" if r["usage"] is not None else "-"
+        budget = r["max_tokens"] if r["max_tokens"] is not None else "-"
+        print(f"{r['name']:<30} | {r['entries']:>7} | {r['kept']:>5} | {r['archived']:>8} | {r['tokens']:>6} | {budget:>6} | {usage}")
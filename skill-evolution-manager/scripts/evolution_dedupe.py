@@ -0,0 +1,130 @@
+"""
+Deduplication helpers for evolution.json lists (preferences / fixes / contexts).
+
+- Exact pass: set lookup on a normalized key (NFKC folds full-width CJK forms to
+  half-width, then case, punctuation and whitespace are ignored).
+- Optional near-duplicate pass: MinHash signatures over character shingles with
+  LSH banding, so only candidate pairs are compared; candidates are confirmed with
+  exact Jaccard similarity against a threshold.
+"""
+import re
+import struct
+import hashlib
+import functools
+import unicodedata
+
+SHINGLE_SIZE = 3
+CJK_SHINGLE_SIZE = 2  # CJK text packs more meaning per character
+NUM_PERM = 64
+LSH_BANDS = 16  # 16 bands x 4 rows: pairs at ~0.7 Jaccard collide with high probability
+_SIG_STRUCT = struct.Struct(f"<{NUM_PERM}I")
+_WS_RE = re.compile(r"\s+")
+
+
+def item_text(item):
+    """The comparable text of a list entry (plain string, or a dict with a `text` field)."""
+    if isinstance(item, dict):
+        return str(item.get("text", ""))
+    return str(item)
+
+
+def normalize(text):
+    """Key used for exact dedup: NFKC, casefolded, punctuation dropped, whitespace collapsed."""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = "".join(" " if unicodedata.category(ch).startswith(("P", "S")) else ch for ch in text)
+    return _WS_RE.sub(" ", text).strip()
+
+
+def shingles(normalized):
+    """Character shingles; character-level so CJK text without spaces works too."""
+    compact = normalized.replace(" ", "")
+    cjk = sum(1 for ch in compact if unicodedata.east_asian_width(ch) == "W")
+    size = CJK_SHINGLE_SIZE if cjk * 3 > len(compact) else SHINGLE_SIZE
+    if len(compact) <= size:
+        return {compact} if compact else set()
+    return {compact[i:i + size] for i in range(len(compact) - size + 1)}
+
+
+def minhash(shingle_set):
+    """
+    MinHash signature. Each shingle is expanded into NUM_PERM independent 32-bit
+    hashes with one SHAKE-128 call; the per-position minimum is then taken in C
+    via zip/min instead of a Python loop per permutation.
+    """
+    if not shingle_set:
+        return (0,) * NUM_PERM
+    return tuple(map(min, zip(*map(_shingle_hashes, shingle_set))))
+
+
+@functools.lru_cache(maxsize=65536)
+def _shingle_hashes(shingle):
+    # Shingles repeat a lot across entries of one skill; hash each only once.
+    return _SIG_STRUCT.unpack(hashlib.shake_128(shingle.encode("utf-8")).digest(_SIG_STRUCT.size))
+
+
+def jaccard(a, b):
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def dedupe(items, near_dup_threshold=None):
+    """
+    Return (kept_items, merged) preserving first-seen order.
+    `merged` is a list of dicts {"item", "index", "kept", "kept_index", "reason", "similarity"}
+    where `index` is the dropped item's position in `items` and `kept_index` points
+    into kept_items.
+    """
+    kept = []
+    merged = []
+    by_key = {}
+
+    # Near-dup state
+    rows = NUM_PERM // LSH_BANDS
+    buckets = [{} for _ in range(LSH_BANDS)]
+    kept_shingles = []
+
+    for index, item in enumerate(items):
+        text = item_text(item)
+        key = normalize(text)
+        if key in by_key:
+            merged.append({
+                "item": text,
+                "index": index,
+                "kept": item_text(kept[by_key[key]]),
+                "kept_index": by_key[key],
+                "reason": "exact",
+                "similarity": 1.0,
+            })
+            continue
+
+        if near_dup_threshold is not None:
+            sh = shingles(key)
+            sig = minhash(sh)
+            bands = [sig[i * rows:(i + 1) * rows] for i in range(LSH_BANDS)]
+            candidates = set()
+            for band_idx, band in enumerate(bands):
+                candidates.update(buckets[band_idx].get(band, ()))
+            best = max(
+                ((jaccard(sh, kept_shingles[c]), c) for c in candidates),
+                default=(0.0, None),
+            )
+            if best[1] is not None and best[0] >= near_dup_threshold:
+                merged.append({
+                    "item": text,
+                    "index": index,
+                    "kept": item_text(kept[best[1]]),
+                    "kept_index": best[1],
+                    "reason": "near-duplicate",
+                    "similarity": round(best[0], 3),
+                })
+                continue
+            idx = len(kept)
+            for band_idx, band in enumerate(bands):
+                buckets[band_idx].setdefault(band, []).append(idx)
+            kept_shingles.append(sh)
+
+        by_key[key] = len(kept)
+        kept.append(item)
+
+    return kept, merged
@@ -0,0 +1,328 @@
+"""
+Versioned history of a skill's evolution.json.
+
+Every change is appended to `evolution.history.jsonl` next to evolution.json as a
+JSON-patch (RFC 6902 add/remove/replace) delta. Every SNAPSHOT_INTERVAL revisions
+the record also carries the full document, so rebuilding any revision applies at
+most SNAPSHOT_INTERVAL deltas. The log is append-only: a rollback is recorded as
+a new revision, so it can itself be undone.
+
+Usage:
+  python evolution_history.py <skill_dir> history [--json]
+  python evolution_history.py <skill_dir> diff <rev> [--against REV]
+  python evolution_history.py <skill_dir> rollback <rev>
+"""
+import os
+import sys
+import json
+import copy
+import hashlib
+import argparse
+import datetime
+
+from evolution_store import EvolutionFileError, evolution_lock, load_evolution, save_evolution
+
+HISTORY_FILE_NAME = "evolution.history.jsonl"
+SNAPSHOT_INTERVAL = 20
+
+
+def history_path(skill_dir):
+    return os.path.join(skill_dir, HISTORY_FILE_NAME)
+
+
+def doc_hash(doc):
+    canonical = json.dumps(doc, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+# --- JSON patch -------------------------------------------------------------
+
+def _escape(token):
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old, new, path=""):
+    """Smallest reasonable add/remove/replace patch turning `old` into `new`."""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+            else:
+                ops.extend(make_patch(old[key], value, f"{path}/{_escape(key)}"))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        # Trim the common prefix and suffix; lists mostly grow at the end or
+        # change a few entries in place (hit counters), so the middle is small.
+        start = 0
+        while start < len(old) and start < len(new) and old[start] == new[start]:
+            start += 1
+        end_old, end_new = len(old), len(new)
+        while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+            end_old -= 1
+            end_new -= 1
+        ops = []
+        common = min(end_old - start, end_new - start)
+        for i in range(start, start + common):
+            ops.extend(make_patch(old[i], new[i], f"{path}/{i}"))
+        for i in range(end_old - 1, start + common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for i in range(start + common, end_new):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _resolve(doc, path):
+    """Return (parent, last_token) for a JSON pointer; parent is None for the root."""
+    if path == "":
+        return None, None
+    tokens = [_unescape(t) for t in path.split("/")[1:]]
+    target = doc
+    for token in tokens[:-1]:
+        target = target[int(token)] if isinstance(target, list) else target[token]
+    return target, tokens[-1]
+
+
+def apply_patch(doc, patch):
+    """Apply add/remove/replace operations to a copy of `doc`."""
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        parent, token = _resolve(doc, op["path"])
+        if parent is None:
+            if op["op"] == "remove":
+                raise ValueError("cannot remove the document root")
+            doc = copy.deepcopy(op["value"])
+            continue
+        if isinstance(parent, list):
+            index = len(parent) if token == "-" else int(token)
+            if op["op"] == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[index]
+            elif op["op"] == "replace":
+                parent[index] = copy.deepcopy(op["value"])
+            else:
+                raise ValueError(f"unsupported patch op {op['op']!r}")
+        else:
+            if op["op"] in ("add", "replace"):
+                parent[token] = copy.deepcopy(op["value"])
+            elif op["op"] == "remove":
+                del parent[token]
+            else:
+                raise ValueError(f"unsupported patch op {op['op']!r}")
+    return doc
+
+
+# --- Log --------------------------------------------------------------------
+
+def read_log(skill_dir):
+    """All history records in revision order ([] when there is no history yet)."""
+    path = history_path(skill_dir)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    records = []
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError as e:
+            # A torn final line (crash mid-append) is dropped; anything else is corruption.
+            if lineno == len(lines):
+                break
+            raise EvolutionFileError(f"{path}:{lineno} is corrupt ({e})") from e
+    return records
+
+
+def _drop_torn_tail(path):
+    """Truncate a partial last line left by a crash mid-append, so the next record starts cleanly."""
+    with open(path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            idx = f.read(step).rfind(b"\n")
+            if idx != -1:
+                f.truncate(pos + idx + 1)
+                return
+        f.truncate(0)
+
+
+def _append(skill_dir, record):
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+    path = history_path(skill_dir)
+    with open(path, "ab") as f:
+        if f.tell() > 0:
+            _drop_torn_tail(path)
+        f.write(line.encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def rebuild(records, rev):
+    """The document as of revision `rev`, starting from the nearest snapshot at or before it."""
+    if not 0 <= rev < len(records):
+        raise EvolutionFileError(f"revision {rev} does not exist (history has 0..{len(records) - 1})")
+    base = rev
+    while "snapshot" not in records[base]:
+        base -= 1
+    doc = copy.deepcopy(records[base]["snapshot"])
+    for record in records[base + 1:rev + 1]:
+        doc = apply_patch(doc, record["patch"])
+    return doc
+
+
+def record_revision(skill_dir, before, after, source, records=None):
+    """
+    Append the change `before` -> `after` to the log. Call with the evolution lock held.
+    Starts the log with a snapshot of `before`, and records an extra "external edit"
+    revision first if evolution.json was changed outside these tools since the last one.
+    Returns the new revision number, or None when nothing changed.
+    """
+    if records is None:
+        records = read_log(skill_dir)
+    now = datetime.datetime.now().isoformat()
+    if not records:
+        records.append({"rev": 0, "time": now, "source": "initial", "hash": doc_hash(before), "snapshot": before})
+        _append(skill_dir, records[-1])
+    elif records[-1]["hash"] != doc_hash(before):
+        last = rebuild(records, len(records) - 1)
+        _append_delta(skill_dir, records, last, before, "external edit", now)
+
+    if doc_hash(after) == records[-1]["hash"]:
+        return None
+    return _append_delta(skill_dir, records, before, after, source, now)
+
+
+def _append_delta(skill_dir, records, before, after, source, now):
+    rev = len(records)
+    record = {"rev": rev, "time": now, "source": source, "hash": doc_hash(after), "patch": make_patch(before, after)}
+    if rev % SNAPSHOT_INTERVAL == 0:
+        record["snapshot"] = after
+    records.append(record)
+    _append(skill_dir, record)
+    return rev
+
+
+# --- Commands ---------------------------------------------------------------
+
+def _short(value, limit=80):
+    text = value.get("text", value) if isinstance(value, dict) else value
+    text = json.dumps(text, ensure_ascii=False) if not isinstance(text, str) else text
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def _summary(record):
+    if "patch" not in record:
+        return "snapshot"
+    counts = {}
+    for op in record["patch"]:
+        counts[op["op"]] = counts.get(op["op"], 0) + 1
+    return ", ".join(f"{n} {op}" for op, n in sorted(counts.items())) or "no changes"
+
+
+def show_history(skill_dir, as_json=False):
+    records = read_log(skill_dir)
+    rows = [
+        {"rev": r["rev"], "time": r["time"], "source": r["source"], "hash": r["hash"], "changes": _summary(r)}
+        for r in records
+    ]
+    if as_json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+        return True
+    if not rows:
+        print(f"No history recorded for {skill_dir}")
+        return True
+    print(f"{'Rev':>4} | {'Time':<19} | {'Source':<20} | Changes")
+    print("-" * 70)
+    for row in rows:
+        print(f"{row['rev']:>4} | {row['time'][:19]:<19} | {row['source'][:20]:<20} | {row['changes']}")
+    return True
+
+
+def show_diff(skill_dir, rev, against=None):
+    records = read_log(skill_dir)
+    against = rev - 1 if against is None else against
+    new = rebuild(records, rev)
+    old = rebuild(records, against) if against >= 0 else {}
+    patch = make_patch(old, new)
+    print(f"Changes from rev {against} to rev {rev} ({len(patch)} operation(s)):")
+    for op in patch:
+        parent, token = _resolve(old, op["path"]) if op["op"] != "add" else (None, None)
+        if op["op"] == "add":
+            print(f"+ {op['path']}: {_short(op['value'])}")
+        else:
+            previous = old if parent is None else parent[int(token)] if isinstance(parent, list) else parent[token]
+            if op["op"] == "remove":
+                print(f"- {op['path']}: {_short(previous)}")
+            else:
+                print(f"~ {op['path']}: {_short(previous)} -> {_short(op['value'])}")
+        old = apply_patch(old, [op])
+    return True
+
+
+def rollback(skill_dir, rev):
+    """Restore revision `rev` (recorded as a new revision) and re-stitch SKILL.md."""
+    from smart_stitch import stitch
+
+    with evolution_lock(skill_dir):
+        records = read_log(skill_dir)
+        target = rebuild(records, rev)
+        current = load_evolution(skill_dir)
+        save_evolution(skill_dir, target)
+        new_rev = record_revision(skill_dir, current, target, f"rollback to {rev}", records)
+
+    if new_rev is None:
+        print(f"evolution.json already matches rev {rev}; nothing to roll back")
+    else:
+        print(f"Rolled back to rev {rev} (recorded as rev {new_rev})")
+    status, message = stitch(skill_dir)
+    if status == "error":
+        print(f"Error: {message}", file=sys.stderr)
+        return False
+    print(message)
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="evolution_history.py")
+    parser.add_argument("skill_dir")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_history = sub.add_parser("history", help="List recorded revisions.")
+    p_history.add_argument("--json", action="store_true")
+    p_diff = sub.add_parser("diff", help="Show what a revision changed.")
+    p_diff.add_argument("rev", type=int)
+    p_diff.add_argument("--against", type=int, help="Compare with this revision instead of the previous one.")
+    p_rollback = sub.add_parser("rollback", help="Restore a revision and re-stitch SKILL.md.")
+    p_rollback.add_argument("rev", type=int)
+    args = parser.parse_args()
+
+    try:
+        if args.command == "history":
+            ok = show_history(args.skill_dir, args.json)
+        elif args.command == "diff":
+            ok = show_diff(args.skill_dir, args.rev, args.against)
+        else:
+            ok = rollback(args.skill_dir, args.rev)
+    except EvolutionFileError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        ok = False
+    sys.exit(0 if ok else 1)
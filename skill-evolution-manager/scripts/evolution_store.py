@@ -0,0 +1,122 @@
+"""
+Safe reading and writing of a skill's evolution.json.
+
+- `evolution_lock` takes an exclusive per-file lock (`evolution.json.lock`) so
+  overlapping merge runs serialize instead of clobbering each other.
+- `save_evolution` writes through a temp file and an atomic rename, so readers
+  never observe a truncated file.
+- `load_evolution` refuses a corrupt file (EvolutionFileError) instead of
+  silently starting over from `{}`.
+"""
+import os
+import json
+import time
+import tempfile
+import contextlib
+
+EVOLUTION_FILE_NAME = "evolution.json"
+LOCK_TIMEOUT_SECONDS = 30.0
+
+
+class EvolutionFileError(Exception):
+    """evolution.json cannot be used (corrupt, wrong shape, locked, or no such skill)."""
+
+
+def evolution_path(skill_dir):
+    return os.path.join(skill_dir, EVOLUTION_FILE_NAME)
+
+
+def load_evolution(skill_dir):
+    """Return the parsed evolution.json, `{}` if it does not exist yet."""
+    path = evolution_path(skill_dir)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise EvolutionFileError(f"{path} is unreadable or corrupt ({e}); fix or move it aside before merging") from e
+    if not isinstance(data, dict):
+        raise EvolutionFileError(f"{path} must contain a JSON object, found {type(data).__name__}")
+    return data
+
+
+def save_evolution(skill_dir, data):
+    """Atomically replace evolution.json with `data`."""
+    path = evolution_path(skill_dir)
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        delete=False,
+        dir=skill_dir,
+        prefix=f".{EVOLUTION_FILE_NAME}.",
+        suffix=".tmp",
+    ) as tmp:
+        json.dump(data, tmp, indent=2, ensure_ascii=False)
+        tmp.flush()
+        os.fsync(tmp.fileno())
+        tmp_path = tmp.name
+    try:
+        # NamedTemporaryFile creates 0600 files; keep the usual permissions.
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def _try_lock(fd):
+    if os.name == "nt":
+        import msvcrt
+
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    import fcntl
+
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+def _unlock(fd):
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+@contextlib.contextmanager
+def evolution_lock(skill_dir, timeout=LOCK_TIMEOUT_SECONDS):
+    """Hold an exclusive lock on the skill's evolution.json for the duration of the block."""
+    if not os.path.isdir(skill_dir):
+        raise EvolutionFileError(f"Skill directory {skill_dir} does not exist")
+    lock_path = evolution_path(skill_dir) + ".lock"
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + timeout
+        while not _try_lock(fd):
+            if time.monotonic() >= deadline:
+                raise EvolutionFileError(f"Timed out after {timeout:.0f}s waiting for {lock_path}")
+            time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
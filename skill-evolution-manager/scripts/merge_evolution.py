@@ -1,49 +1,79 @@
 import os
 import sys
+import copy
 import json
+import argparse
 import datetime
 
-def merge_evolution(skill_dir, new_data_json_str):
+from evolution_dedupe import dedupe, item_text, normalize
+from evolution_history import record_revision
+from evolution_store import EvolutionFileError, evolution_lock, load_evolution, save_evolution
+
+def as_entry(item, now=None):
     """
-    Merges new evolution data into existing evolution.json.
-    Deduplicates list items.
+    List entries are stored as {"text", "added_at", "last_confirmed", "hits"} so the
+    stitcher can rank them. Legacy plain strings are upgraded with unknown dates.
     """
-    evolution_json_path = os.path.join(skill_dir, "evolution.json")
-    
-    # Load existing or create new
-    if os.path.exists(evolution_json_path):
-        try:
-            with open(evolution_json_path, 'r', encoding='utf-8') as f:
-                current_data = json.load(f)
-        except Exception:
-            current_data = {}
-    else:
-        current_data = {}
+    if isinstance(item, dict):
+        entry = dict(item)
+        entry["text"] = item_text(item)
+        entry.setdefault("added_at", now)
+        entry.setdefault("last_confirmed", entry["added_at"])
+        entry.setdefault("hits", 1)
+        return entry
+    return {"text": str(item), "added_at": now, "last_confirmed": now, "hits": 1}
 
-    try:
-        new_data = json.loads(new_data_json_str)
-    except json.JSONDecodeError as e:
-        print(f"Error decoding new data JSON: {e}", file=sys.stderr)
-        return False
+def stored_keys(data):
+    """Normalized (list_key, text) of every list entry already in `data`."""
+    return {
+        (list_key, normalize(item_text(item)))
+        for list_key in ['preferences', 'fixes', 'contexts']
+        for item in data.get(list_key, [])
+    }
+
+def merge_data(current_data, new_data, near_dup_threshold=None, stored=None, confirmed=None):
+    """
+    Merges one evolution payload into `current_data` in place.
+    Returns the dedup report as a list of (list_key, merged_entry).
 
+    `stored` (entries present before the merge) and `confirmed` (entries already
+    confirmed by it) let several payloads of one merge share their bookkeeping;
+    by default both cover this payload only.
+    """
     # Merge logic
     # 1. Update timestamp
-    current_data['last_updated'] = datetime.datetime.now().isoformat()
-    
-    # 2. Merge Lists (preferences, fixes, contexts) with deduplication
+    now = datetime.datetime.now().isoformat()
+    current_data['last_updated'] = now
+
+    # 2. Merge Lists (preferences, fixes, contexts) with deduplication.
+    # Existing entries come first so they win over new wording; duplicates already
+    # stored in the file are cleaned up on the way. A payload entry matching an entry
+    # that was stored before this merge counts as a confirmation: its hit count and
+    # last_confirmed are bumped, at most once per merge. Duplicates within the stored
+    # list or within the payload confirm nothing, so re-running a merge adds one hit.
+    stored = stored_keys(current_data) if stored is None else stored
+    confirmed = set() if confirmed is None else confirmed
+    report = []
     for list_key in ['preferences', 'fixes', 'contexts']:
         if list_key in new_data:
-            existing_list = current_data.get(list_key, [])
+            existing_list = [as_entry(item) for item in current_data.get(list_key, [])]
             new_items = new_data[list_key]
             if isinstance(new_items, list):
-                # Simple dedupe by string equality
-                for item in new_items:
-                    if item not in existing_list:
-                        existing_list.append(item)
-                current_data[list_key] = existing_list
-                
+                new_entries = [as_entry(item, now) for item in new_items]
+                merged_list, merged = dedupe(existing_list + new_entries, near_dup_threshold)
+                for m in merged:
+                    kept = merged_list[m["kept_index"]]
+                    key = (list_key, normalize(kept["text"]))
+                    if m["index"] < len(existing_list) or key not in stored or key in confirmed:
+                        continue
+                    confirmed.add(key)
+                    kept["hits"] = int(kept.get("hits") or 1) + 1
+                    kept["last_confirmed"] = now
+                current_data[list_key] = merged_list
+                report.extend((list_key, m) for m in merged)
+
     # 3. Overwrite/Append Custom Prompts (Concatenate if exists to preserve history? Or overwrite?)
-    # Decision: Overwrite if provided, as prompts usually need to be coherent. 
+    # Decision: Overwrite if provided, as prompts usually need to be coherent.
     # Or, the Agent should have read the old one and combined it before sending here.
     # We assume Agent sends the FINAL desired state for custom_prompts if it wants to merge.
     if 'custom_prompts' in new_data:
@@ -53,18 +83,136 @@ def merge_evolution(skill_dir, new_data_json_str):
     if 'last_evolved_hash' in new_data:
         current_data['last_evolved_hash'] = new_data['last_evolved_hash']
 
-    # Save back
-    with open(evolution_json_path, 'w', encoding='utf-8') as f:
-        json.dump(current_data, f, indent=2, ensure_ascii=False)
-        
-    print(f"Successfully merged evolution data for {os.path.basename(skill_dir)}")
+    # 5. Per-skill size budget for the stitched section (see smart_stitch.py)
+    if isinstance(new_data.get('budget'), dict):
+        current_data['budget'] = new_data['budget']
+
+    return report
+
+def apply_updates(skill_dir, payloads, near_dup_threshold=None):
+    """
+    Merges several payloads into one skill under a single lock, load and atomic write,
+    recording the change as one revision in the history log (see evolution_history.py).
+    Raises EvolutionFileError when evolution.json is corrupt or locked.
+    """
+    with evolution_lock(skill_dir):
+        current_data = load_evolution(skill_dir)
+        before = copy.deepcopy(current_data)
+        report = []
+        stored = stored_keys(current_data)
+        confirmed = set()
+        for new_data in payloads:
+            report.extend(merge_data(current_data, new_data, near_dup_threshold, stored, confirmed))
+        save_evolution(skill_dir, current_data)
+        record_revision(skill_dir, before, current_data, "merge" if len(payloads) == 1 else f"merge x{len(payloads)}")
+    return report
+
+def print_report(skill_dir, report):
+    for list_key, m in report:
+        similarity = "" if m["reason"] == "exact" else f" {m['similarity']:.2f}"
+        print(f"  [{list_key}] merged ({m['reason']}{similarity}): \"{m['item']}\" -> \"{m['kept']}\"")
+    print(f"Successfully merged evolution data for {os.path.basename(os.path.normpath(skill_dir))} ({len(report)} duplicate(s) merged)")
+
+def merge_evolution(skill_dir, new_data_json_str, near_dup_threshold=None):
+    """
+    Merges new evolution data into existing evolution.json.
+    Deduplicates list items on normalized text (and, optionally, near-duplicates
+    above `near_dup_threshold` Jaccard similarity), printing what was merged.
+    """
+    try:
+        new_data = json.loads(new_data_json_str)
+    except json.JSONDecodeError as e:
+        print(f"Error decoding new data JSON: {e}", file=sys.stderr)
+        return False
+    if not isinstance(new_data, dict):
+        print("Error: new data JSON must be an object", file=sys.stderr)
+        return False
+
+    try:
+        report = apply_updates(skill_dir, [new_data], near_dup_threshold)
+    except EvolutionFileError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+
+    print_report(skill_dir, report)
     return True
 
+def read_bulk_records(stream, skills_root=None):
+    """
+    Parses a JSONL stream of {"skill": <dir or name>, "data": {...}} records.
+    Returns ({skill_dir: [payloads...]} in first-seen order, [error messages]).
+    """
+    grouped = {}
+    errors = []
+    for lineno, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            errors.append(f"line {lineno}: invalid JSON ({e})")
+            continue
+        if not isinstance(record, dict) or not isinstance(record.get("skill"), str) or not isinstance(record.get("data"), dict):
+            errors.append(f"line {lineno}: expected {{\"skill\": str, \"data\": object}}")
+            continue
+        skill = record["skill"]
+        skill_dir = os.path.join(skills_root, skill) if skills_root and not os.path.isabs(skill) else skill
+        grouped.setdefault(os.path.normpath(skill_dir), []).append(record["data"])
+    return grouped, errors
+
+def merge_bulk(stream, skills_root=None, near_dup_threshold=None):
+    """Bulk mode: one lock/load/write per skill no matter how many records it has."""
+    grouped, errors = read_bulk_records(stream, skills_root)
+    for message in errors:
+        print(f"Error: {message}", file=sys.stderr)
+
+    failed = 0
+    for skill_dir, payloads in grouped.items():
+        if not os.path.isdir(skill_dir):
+            print(f"Error: skill directory not found: {skill_dir}", file=sys.stderr)
+            failed += 1
+            continue
+        try:
+            report = apply_updates(skill_dir, payloads, near_dup_threshold)
+        except EvolutionFileError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        print_report(skill_dir, report)
+
+    print(f"\nBulk merge finished: {len(grouped) - failed}/{len(grouped)} skills updated, {len(errors)} bad record(s).")
+    return failed == 0 and not errors
+
 if __name__ == "__main__":
-    if len(sys.argv) < 3:
-        print("Usage: python merge_evolution.py <skill_dir> <json_string>")
-        sys.exit(1)
-        
-    skill_dir = sys.argv[1]
-    json_str = sys.argv[2]
-    merge_evolution(skill_dir, json_str)
+    parser = argparse.ArgumentParser(prog="merge_evolution.py")
+    parser.add_argument("skill_dir", nargs="?")
+    parser.add_argument("json_string", nargs="?")
+    parser.add_argument(
+        "--bulk",
+        metavar="FILE",
+        help="Read JSONL records {\"skill\": ..., \"data\": {...}} from FILE ('-' for stdin).",
+    )
+    parser.add_argument("--skills-root", help="Resolve relative `skill` names in --bulk records against this directory.")
+    parser.add_argument(
+        "--near-dup",
+        type=float,
+        nargs="?",
+        const=0.8,
+        default=None,
+        metavar="THRESHOLD",
+        help="Also merge near-duplicates with shingle similarity >= THRESHOLD (default when given: 0.8).",
+    )
+    args = parser.parse_args()
+
+    if args.bulk:
+        if args.bulk == "-":
+            ok = merge_bulk(sys.stdin, args.skills_root, args.near_dup)
+        else:
+            with open(args.bulk, "r", encoding="utf-8") as f:
+                ok = merge_bulk(f, args.skills_root, args.near_dup)
+    elif args.skill_dir and args.json_string:
+        ok = merge_evolution(args.skill_dir, args.json_string, args.near_dup)
+    else:
+        parser.error("either <skill_dir> <json_string> or --bulk FILE is required")
+    sys.exit(0 if ok else 1)
@@ -1,82 +1,307 @@
 import os
+import re
 import sys
 import json
-import re
+import hashlib
+import datetime
+import tempfile
 
-def stitch_skill(skill_dir):
+# Fixed sentinel that opens the auto-generated section. The section always runs to
+# the end of SKILL.md, so it is located with a plain rfind instead of a regex scan.
+SECTION_SENTINEL = "## User-Learned Best Practices & Constraints"
+# Embedded right under the sentinel; lets us detect "nothing changed" from the file tail.
+HASH_MARKER_PREFIX = "<!-- evolution-hash: "
+HASH_MARKER_SUFFIX = " -->"
+
+
+# Default size budget for the stitched section; override per skill with
+# {"budget": {"max_tokens": N, "max_bytes": M}} in evolution.json.
+DEFAULT_MAX_TOKENS = 1200
+ARCHIVE_REL_PATH = "references/evolution-archive.md"
+ARCHIVE_HEADER = "<!-- Auto-generated by skill-evolution-manager. Do not edit manually. -->"
+RECENCY_HALF_LIFE_DAYS = 30.0
+CJK_RE = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+LIST_SECTIONS = [
+    ("preferences", "User Preferences"),
+    ("fixes", "Known Fixes & Workarounds"),
+]
+
+
+def estimate_tokens(text):
+    """Rough token estimate: ~1 token per CJK character, ~4 characters per token otherwise."""
+    cjk = len(CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def entry_text(item):
+    return str(item.get("text", "")) if isinstance(item, dict) else str(item)
+
+
+def entry_score(item, now):
+    """Rank: confirmation count, decayed by how long ago the entry was last confirmed."""
+    if not isinstance(item, dict):
+        return 1.0
+    hits = float(item.get("hits") or 1)
+    stamp = item.get("last_confirmed") or item.get("added_at")
+    try:
+        age_days = max((now - datetime.datetime.fromisoformat(stamp)).total_seconds() / 86400, 0.0)
+    except (TypeError, ValueError):
+        age_days = RECENCY_HALF_LIFE_DAYS * 4  # unknown age: treat as old
+    return hits * 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+
+
+def plan_section(data, now=None):
+    """
+    Decide which list entries fit the section budget.
+    Returns {"kept": {list_key: [items]}, "archived": {list_key: [items]}, "budget": {...}}.
+    Entries are admitted strictly by rank until the budget runs out; kept entries
+    keep their stored order so the rendered section stays stable.
+    """
+    now = now or datetime.datetime.now()
+    budget = data.get("budget") if isinstance(data.get("budget"), dict) else {}
+    max_tokens = budget.get("max_tokens", DEFAULT_MAX_TOKENS)
+    max_bytes = budget.get("max_bytes")
+
+    # Fixed cost: everything that is always rendered
+    fixed = render_evolution_body(data, {k: [] for k, _ in LIST_SECTIONS}, archived_count=1)
+    used_tokens = estimate_tokens(fixed)
+    used_bytes = len(fixed.encode("utf-8"))
+
+    ranked = []
+    for list_key, title in LIST_SECTIONS:
+        items = data.get(list_key) or []
+        if items:
+            heading = f"\n### {title}"
+            used_tokens += estimate_tokens(heading)
+            used_bytes += len(heading.encode("utf-8")) + 1
+        for pos, item in enumerate(items):
+            ranked.append((entry_score(item, now), list_key, pos, item))
+    ranked.sort(key=lambda r: (-r[0], r[2]))
+
+    admitted = set()
+    for _score, list_key, pos, item in ranked:
+        line = f"- {entry_text(item)}\n"
+        tokens = estimate_tokens(line)
+        size = len(line.encode("utf-8"))
+        if (max_tokens is not None and used_tokens + tokens > max_tokens) or \
+                (max_bytes is not None and used_bytes + size > max_bytes):
+            break
+        used_tokens += tokens
+        used_bytes += size
+        admitted.add((list_key, pos))
+
+    kept = {}
+    archived = {}
+    for list_key, _title in LIST_SECTIONS:
+        items = data.get(list_key) or []
+        kept[list_key] = [it for pos, it in enumerate(items) if (list_key, pos) in admitted]
+        archived[list_key] = [it for pos, it in enumerate(items) if (list_key, pos) not in admitted]
+    return {
+        "kept": kept,
+        "archived": archived,
+        "budget": {"max_tokens": max_tokens, "max_bytes": max_bytes},
+    }
+
+
+def render_evolution_body(data, kept=None, archived_count=0):
+    """Markdown for the section below the hash marker."""
+    if kept is None:
+        kept = {list_key: data.get(list_key) or [] for list_key, _ in LIST_SECTIONS}
+    evolution_section = []
+    evolution_section.append("\n> **Auto-Generated Section**: This section is maintained by `skill-evolution-manager`. Do not edit manually.")
+
+    for list_key, title in LIST_SECTIONS:
+        if kept.get(list_key):
+            evolution_section.append(f"\n### {title}")
+            for item in kept[list_key]:
+                evolution_section.append(f"- {entry_text(item)}")
+
+    if data.get("custom_prompts"):
+        evolution_section.append("\n### Custom Instruction Injection")
+        evolution_section.append(f"\n{data['custom_prompts']}")
+
+    if archived_count:
+        evolution_section.append(
+            f"\n> {archived_count} lower-ranked entries are archived in [{ARCHIVE_REL_PATH}]({ARCHIVE_REL_PATH}). "
+            "Read it only when the entries above do not cover the situation."
+        )
+
+    return "\n".join(evolution_section)
+
+
+def render_archive(skill_name, archived):
+    lines = [
+        ARCHIVE_HEADER,
+        f"# Evolution Archive: {skill_name}",
+        "",
+        "Entries evicted from the `SKILL.md` evolution section by its size budget. "
+        "They are kept here so nothing learned is lost.",
+    ]
+    for list_key, title in LIST_SECTIONS:
+        if archived.get(list_key):
+            lines.append(f"\n## {title}\n")
+            for item in archived[list_key]:
+                meta = ""
+                if isinstance(item, dict):
+                    meta = f" _(hits: {item.get('hits', 1)}, last confirmed: {item.get('last_confirmed') or 'unknown'})_"
+                lines.append(f"- {entry_text(item)}{meta}")
+    return "\n".join(lines) + "\n"
+
+
+def render_evolution_block(data, now=None):
+    """
+    Full section (sentinel + hash marker + body), the body hash, and the plan
+    describing which entries were archived.
+    """
+    plan = plan_section(data, now)
+    archived_count = sum(len(v) for v in plan["archived"].values())
+    body = render_evolution_body(data, plan["kept"], archived_count)
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+    block = f"\n\n{SECTION_SENTINEL}\n{HASH_MARKER_PREFIX}{digest}{HASH_MARKER_SUFFIX}\n{body}"
+    return block, digest, plan
+
+
+def sync_archive(skill_dir, plan):
+    """Write references/evolution-archive.md when entries were evicted; remove a stale one otherwise."""
+    archive_path = os.path.join(skill_dir, *ARCHIVE_REL_PATH.split("/"))
+    archived = plan["archived"]
+    existing = None
+    if os.path.exists(archive_path):
+        with open(archive_path, "r", encoding="utf-8") as f:
+            existing = f.read()
+
+    if not any(archived.values()):
+        # Only delete files we generated ourselves
+        if existing is not None and existing.startswith(ARCHIVE_HEADER):
+            os.remove(archive_path)
+        return
+
+    content = render_archive(os.path.basename(os.path.normpath(skill_dir)), archived)
+    if content != existing:
+        os.makedirs(os.path.dirname(archive_path), exist_ok=True)
+        _atomic_write_text(archive_path, content)
+
+
+def _tail_is_current(skill_md_path, block):
+    """
+    Check whether SKILL.md already ends with `block` by reading only the file tail.
+    Both LF and CRLF line endings are accepted.
+    """
+    candidates = [block.encode("utf-8"), block.replace("\n", "\r\n").encode("utf-8")]
+    with open(skill_md_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        for expected in candidates:
+            if size < len(expected):
+                continue
+            f.seek(size - len(expected))
+            if f.read(len(expected)) == expected:
+                return True
+    return False
+
+
+def _atomic_write_text(path, content):
+    """Write via a temp file in the same directory, then rename over the target."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        newline="",
+        delete=False,
+        dir=directory,
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+    ) as tmp:
+        tmp.write(content)
+        tmp_path = tmp.name
+    try:
+        # NamedTemporaryFile creates 0600 files; keep the usual permissions.
+        try:
+            mode = os.stat(path).st_mode & 0o7777
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+
+
+def stitch(skill_dir):
     """
     Reads evolution.json and stitches it into SKILL.md under a dedicated section.
+    Returns (status, message) where status is one of
+    "updated", "appended", "unchanged", "skipped" (no evolution.json) or "error".
     """
     skill_md_path = os.path.join(skill_dir, "SKILL.md")
     evolution_json_path = os.path.join(skill_dir, "evolution.json")
 
     if not os.path.exists(skill_md_path):
-        print(f"Error: SKILL.md not found in {skill_dir}", file=sys.stderr)
-        return False
-        
+        return "error", f"SKILL.md not found in {skill_dir}"
+
     if not os.path.exists(evolution_json_path):
-        print(f"Info: No evolution.json found in {skill_dir}. Nothing to stitch.", file=sys.stderr)
-        return True
+        return "skipped", f"No evolution.json found in {skill_dir}. Nothing to stitch."
 
     try:
         with open(evolution_json_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
     except Exception as e:
-        print(f"Error parsing evolution.json: {e}", file=sys.stderr)
-        return False
+        return "error", f"Failed to parse evolution.json: {e}"
 
-    # Prepare the Markdown content block
-    evolution_section = []
-    evolution_section.append("\n\n## User-Learned Best Practices & Constraints")
-    evolution_section.append("\n> **Auto-Generated Section**: This section is maintained by `skill-evolution-manager`. Do not edit manually.")
-    
-    if data.get("preferences"):
-        evolution_section.append("\n### User Preferences")
-        for item in data["preferences"]:
-            evolution_section.append(f"- {item}")
-            
-    if data.get("fixes"):
-        evolution_section.append("\n### Known Fixes & Workarounds")
-        for item in data["fixes"]:
-            evolution_section.append(f"- {item}")
-            
-    if data.get("custom_prompts"):
-        evolution_section.append("\n### Custom Instruction Injection")
-        evolution_section.append(f"\n{data['custom_prompts']}")
-        
-    evolution_block = "\n".join(evolution_section)
+    evolution_block, digest, plan = render_evolution_block(data)
+    sync_archive(skill_dir, plan)
+
+    # Fast path: the hash-marked section at the end of the file is already current.
+    if _tail_is_current(skill_md_path, evolution_block):
+        return "unchanged", f"Evolution section in {skill_md_path} is up to date ({digest})"
 
-    # Read original SKILL.md
-    with open(skill_md_path, 'r', encoding='utf-8') as f:
+    # Read original SKILL.md, keeping its line endings
+    with open(skill_md_path, 'r', encoding='utf-8', newline='') as f:
         content = f.read()
+    newline = "\r\n" if "\r\n" in content else "\n"
+    if newline != "\n":
+        content = content.replace("\r\n", "\n")
+
+    # Replace the existing section (sentinel to end of file), or append if not found
+    idx = content.rfind("\n" + SECTION_SENTINEL)
+    if idx == -1 and content.startswith(SECTION_SENTINEL):
+        idx = 0
+    if idx != -1:
+        status = "updated"
+        new_content = content[:idx].rstrip("\n") + evolution_block
+    else:
+        status = "appended"
+        new_content = content.rstrip("\n") + evolution_block
 
-    # Regex to find existing User-Learned section and replace it, or append if not found
-    # Pattern looks for "## User-Learned Best Practices..." until end of file
-    pattern = r"(\n+## User-Learned Best Practices & Constraints.*$)"
-    
-    match = re.search(pattern, content, re.DOTALL)
-    
-    new_content = ""
-    if match:
-        # Replace existing section
+    _atomic_write_text(skill_md_path, new_content.replace("\n", newline))
+
+    return status, f"Successfully stitched evolution data into {skill_md_path}"
+
+def stitch_skill(skill_dir):
+    """
+    CLI-facing wrapper around stitch(): prints progress and returns True on success.
+    """
+    status, message = stitch(skill_dir)
+    if status == "error":
+        print(f"Error: {message}", file=sys.stderr)
+        return False
+    if status in ("skipped", "unchanged"):
+        print(f"Info: {message}", file=sys.stderr)
+        return True
+    if status == "updated":
         print("Updating existing evolution section...", file=sys.stderr)
-        new_content = content[:match.start()] + evolution_block
     else:
-        # Append to end
         print("Appending new evolution section...", file=sys.stderr)
-        new_content = content + evolution_block
-
-    # Write back
-    with open(skill_md_path, 'w', encoding='utf-8') as f:
-        f.write(new_content)
-        
-    print(f"Successfully stitched evolution data into {skill_md_path}")
+    print(message)
     return True
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print("Usage: python smart_stitch.py <skill_dir>")
         sys.exit(1)
-        
+
     target_dir = sys.argv[1]
     stitch_skill(target_dir)
@@ -0,0 +1,69 @@
+"""
+Benchmark: shutil.rmtree vs rename-into-trash (+ deferred purge) for skill deletion.
+
+Builds synthetic skill folders full of small files (default 100k, similar to a
+vendored node_modules) in a temporary skills root and times each strategy.
+
+Usage: python bench_delete.py [--files 100000] [--fanout 1000] [--root <tmp_dir>]
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+from delete_skill import delete_skill, purge_trash
+
+
+def build_tree(skill_dir, files, fanout):
+    """Create `files` small files spread over sub-directories of `fanout` entries."""
+    os.makedirs(skill_dir)
+    with open(os.path.join(skill_dir, "SKILL.md"), "w", encoding="utf-8") as f:
+        f.write("---\nname: bench\ndescription: benchmark skill\n---\n")
+    for i in range(files):
+        sub = os.path.join(skill_dir, "node_modules", f"pkg{i // fanout:05d}")
+        if i % fanout == 0:
+            os.makedirs(sub)
+        with open(os.path.join(sub, f"f{i}.js"), "w") as f:
+            f.write("module.exports = 1;\n")
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_delete.py")
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--fanout", type=int, default=1000)
+    parser.add_argument("--root", help="Directory to build the synthetic skills root in (default: system temp).")
+    args = parser.parse_args()
+
+    base = tempfile.mkdtemp(prefix="skill-delete-bench-", dir=args.root)
+    try:
+        print(f"Building 2 skills x {args.files} files in {base} ...")
+        build_tree(os.path.join(base, "rmtree-skill"), args.files, args.fanout)
+        build_tree(os.path.join(base, "trash-skill"), args.files, args.fanout)
+
+        t_rmtree = timed(shutil.rmtree, os.path.join(base, "rmtree-skill"))
+        # delete_skill prints its own status line; keep the report readable.
+        t_rename = timed(delete_skill, base, "trash-skill")
+        t_purge = timed(purge_trash, base, 0)
+
+        print()
+        print(f"{'strategy':<28} | {'seconds':>10}")
+        print("-" * 41)
+        print(f"{'rmtree (blocking)':<28} | {t_rmtree:>10.4f}")
+        print(f"{'rename to trash (blocking)':<28} | {t_rename:>10.4f}")
+        print(f"{'deferred purge (background)':<28} | {t_purge:>10.4f}")
+        if t_rename > 0:
+            print(f"\nUser-visible delete is {t_rmtree / t_rename:,.0f}x faster with rename-then-purge.")
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
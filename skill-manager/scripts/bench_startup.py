@@ -0,0 +1,227 @@
+"""
+Startup benchmark: import cost of the short-lived skill scripts, checked against a budget.
+
+Every entry of `startup_budget.json` names a script, its arguments and a `budget_ms`.
+Each one is run several times under `python -X importtime`; the self times of all
+imports are summed and the bare interpreter's own startup imports (`python -c pass`)
+are subtracted, so the budget covers only what the script itself pulls in.
+The run fails (exit code 1) when any script is over budget or exits non-zero.
+
+Argument placeholders:
+  {root}    the skills root (default: the repository this script lives in)
+  {tmp}     a scratch directory, removed afterwards
+  {skills}  a synthetic skills root of small SKILL.md-only skills, so index caches
+            are written there instead of into the real root
+
+Entries may list `setup` commands (same placeholders) that run once before timing;
+one untimed warm-up run per entry fills any caches the hot path relies on.
+
+Usage: python bench_startup.py [skills_root] [--runs 5] [--only NAME] [--json]
+                               [--budget startup_budget.json] [--record [--headroom 1.5] [--slack 5]]
+"""
+import os
+import sys
+import json
+import math
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+DEFAULT_BUDGET_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_budget.json")
+DEFAULT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SYNTHETIC_SKILLS = 40
+
+
+def build_skills_root(path, count):
+    """Create `count` minimal skills (frontmatter plus a short body) under `path`."""
+    for i in range(count):
+        skill_dir = os.path.join(path, f"bench-skill-{i:03d}")
+        os.makedirs(skill_dir)
+        with open(os.path.join(skill_dir, "SKILL.md"), "w", encoding="utf-8") as f:
+            f.write(
+                f"---\nname: bench-skill-{i:03d}\n"
+                f"description: Synthetic skill {i} used by the startup benchmark\n---\n\n"
+                f"# Bench skill {i}\n\nUse when measuring startup cost of skill scripts.\n"
+            )
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output.
+    Returns (total self microseconds, {top-level module: cumulative microseconds}, other stderr lines).
+    """
+    total = 0
+    top_level = {}
+    other = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the column header
+        total += int(parts[0])
+        name = parts[2][1:]
+        if not name.startswith(" "):
+            top_level[name] = top_level.get(name, 0) + int(parts[1])
+    return total, top_level, other
+
+
+def run_once(argv, cwd, env):
+    """Run one command under -X importtime. Returns (returncode, total_us, top_level, other_stderr)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime"] + argv,
+        cwd=cwd,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+    )
+    total, top_level, other = parse_importtime(proc.stderr)
+    return proc.returncode, total, top_level, other
+
+
+def median(values):
+    ordered = sorted(values)
+    mid = len(ordered) // 2
+    return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def expand(args, placeholders):
+    return [arg.format(**placeholders) for arg in args]
+
+
+def measure(entry, placeholders, runs, env, baseline_modules):
+    """Benchmark one budget entry. Returns a result dict."""
+    root = placeholders["root"]
+    result = {"name": entry["name"], "budget_ms": entry.get("budget_ms")}
+
+    for command in entry.get("setup", []):
+        argv = expand(command, placeholders)
+        argv[0] = os.path.join(root, argv[0])
+        proc = subprocess.run([sys.executable] + argv, cwd=placeholders["tmp"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if proc.returncode != 0:
+            result.update(status="error", error=f"setup failed: {proc.stderr.strip()[-300:]}")
+            return result
+
+    argv = expand(entry["argv"], placeholders)
+    argv[0] = os.path.join(root, argv[0])
+    samples = []
+    top_level = {}
+    for i in range(runs + 1):
+        code, total, top_level, other = run_once(argv, placeholders["tmp"], env)
+        if code != 0:
+            result.update(status="error", error=f"exit code {code}: {' '.join(other).strip()[-300:]}")
+            return result
+        if i:  # the first run only warms caches
+            samples.append(total)
+
+    heaviest = sorted(
+        ((name, us) for name, us in top_level.items() if name not in baseline_modules),
+        key=lambda item: -item[1],
+    )
+    result["import_ms"] = round(max(median(samples) - placeholders["baseline_us"], 0) / 1000, 1)
+    result["heaviest"] = [[name, round(us / 1000, 1)] for name, us in heaviest[:3]]
+    budget = result["budget_ms"]
+    result["status"] = "ok" if budget is None or result["import_ms"] <= budget else "over"
+    return result
+
+
+def print_report(results, baseline_ms):
+    print(f"Bare interpreter startup imports: {baseline_ms:.1f} ms (subtracted below)\n")
+    print(f"{'Script':<28} | {'Import ms':>9} | {'Budget':>6} | {'Status':<6} | Heaviest imports (cumulative ms)")
+    print("-" * 100)
+    for r in results:
+        budget = "-" if r.get("budget_ms") is None else f"{r['budget_ms']:g}"
+        if r["status"] == "error":
+            print(f"{r['name']:<28} | {'-':>9} | {budget:>6} | {'ERROR':<6} | {r['error']}")
+            continue
+        heaviest = ", ".join(f"{name} {ms:g}" for name, ms in r["heaviest"])
+        status = "OVER" if r["status"] == "over" else "ok"
+        print(f"{r['name']:<28} | {r['import_ms']:>9.1f} | {budget:>6} | {status:<6} | {heaviest}")
+
+
+def record_budgets(path, config, results, headroom, slack):
+    """
+    Write `measured x headroom + slack` (rounded up to a whole ms) back as each entry's budget.
+    The fixed slack keeps run-to-run noise from failing the small, fast scripts.
+    """
+    measured = {r["name"]: r["import_ms"] for r in results if r["status"] != "error"}
+    for entry in config["scripts"]:
+        if entry["name"] in measured:
+            entry["budget_ms"] = max(1, math.ceil(measured[entry["name"]] * headroom + slack))
+    # Budgets are only comparable on a similar machine and interpreter; keep a note of both.
+    config["recorded_with"] = f"Python {sys.version.split()[0]} on {sys.platform}"
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="bench_startup.py")
+    parser.add_argument("skills_root", nargs="?", default=DEFAULT_ROOT, help="Root that script paths are relative to.")
+    parser.add_argument("--budget", default=DEFAULT_BUDGET_FILE, help="Budget file (default: startup_budget.json next to this script).")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per script; the median is reported (default: 5).")
+    parser.add_argument("--only", action="append", help="Benchmark only the named entry (repeatable).")
+    parser.add_argument("--json", action="store_true", help="Output the results as JSON.")
+    parser.add_argument("--record", action="store_true", help="Rewrite budget_ms from this run's measurements.")
+    parser.add_argument("--headroom", type=float, default=1.5, help="Multiplier applied by --record (default: 1.5).")
+    parser.add_argument("--slack", type=float, default=5, help="Milliseconds added by --record on top of the multiplier (default: 5).")
+    args = parser.parse_args()
+
+    with open(args.budget, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    entries = [e for e in config["scripts"] if not args.only or e["name"] in args.only]
+    if not entries:
+        print("No matching entries in the budget file.", file=sys.stderr)
+        return 1
+
+    tmp = tempfile.mkdtemp(prefix="skill-startup-bench-")
+    # Measure against the regular bytecode cache, as a normal invocation would: a
+    # PYTHONPYCACHEPREFIX would make every run recompile the standard library.
+    env = dict(os.environ)
+    env.pop("PYTHONPYCACHEPREFIX", None)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    try:
+        placeholders = {"root": os.path.abspath(args.skills_root), "tmp": tmp, "skills": os.path.join(tmp, "skills")}
+        if any("{skills}" in arg for e in entries for arg in e["argv"] + sum(e.get("setup", []), [])):
+            build_skills_root(placeholders["skills"], SYNTHETIC_SKILLS)
+
+        baseline = []
+        baseline_modules = {}
+        for _ in range(args.runs):
+            _, total, baseline_modules, _ = run_once(["-c", "pass"], tmp, env)
+            baseline.append(total)
+        placeholders["baseline_us"] = median(baseline)
+
+        results = [measure(e, placeholders, args.runs, env, baseline_modules) for e in entries]
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps({"baseline_ms": round(placeholders["baseline_us"] / 1000, 1), "results": results},
+                         ensure_ascii=False, indent=2))
+    else:
+        print_report(results, placeholders["baseline_us"] / 1000)
+
+    if args.record:
+        record_budgets(args.budget, config, results, args.headroom, args.slack)
+        print(f"\nBudgets recorded in {args.budget} (x{args.headroom:g} + {args.slack:g} ms)")
+        return 0 if all(r["status"] != "error" for r in results) else 1
+
+    failed = [r["name"] for r in results if r["status"] != "ok"]
+    if failed:
+        print(f"\nOver budget or failed: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
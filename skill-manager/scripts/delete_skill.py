@@ -1,31 +1,250 @@
 import os
 import sys
+import time
 import shutil
+import argparse
+import datetime
+import subprocess
+
+# Deleted skills are renamed into this folder inside the skills root. Keeping it
+# on the same filesystem makes the delete a single atomic rename, however large
+# the skill folder is; the actual rmtree happens later in `purge`.
+TRASH_DIR_NAME = ".trash"
+TRASH_STAMP_FORMAT = "%Y%m%dT%H%M%S%f"
+DEFAULT_RETENTION_DAYS = 7
+
+
+def _trash_root(skills_root):
+    return os.path.join(skills_root, TRASH_DIR_NAME)
+
+
+def _parse_trash_entry(entry):
+    """Split a trash entry name `<skill>@<stamp>` into (skill_name, datetime)."""
+    name, sep, stamp = entry.rpartition("@")
+    if not sep:
+        return None, None
+    try:
+        return name, datetime.datetime.strptime(stamp, TRASH_STAMP_FORMAT)
+    except ValueError:
+        return None, None
+
+
+def _valid_skill_name(skill_name):
+    """A plain folder name: no path separators, no hidden/relative names."""
+    return bool(skill_name) and not skill_name.startswith(".") and not any(
+        sep and sep in skill_name for sep in (os.sep, os.altsep)
+    )
+
+
+def list_trash(skills_root):
+    """Return trashed skills as dicts, newest first."""
+    trash = _trash_root(skills_root)
+    if not os.path.isdir(trash):
+        return []
+
+    entries = []
+    for entry in os.listdir(trash):
+        name, deleted_at = _parse_trash_entry(entry)
+        if name is None:
+            continue
+        entries.append({
+            "name": name,
+            "deleted_at": deleted_at,
+            "path": os.path.join(trash, entry),
+        })
+    entries.sort(key=lambda e: e["deleted_at"], reverse=True)
+    return entries
+
 
 def delete_skill(skills_root, skill_name):
+    """
+    Move a skill into the trash. Instant and atomic; space is reclaimed by `purge`.
+    Returns the trash entry name (`<skill>@<stamp>`), or None on failure.
+    """
+    if not _valid_skill_name(skill_name):
+        print(f"Error: Invalid skill name '{skill_name}'")
+        return None
+
     skill_dir = os.path.join(skills_root, skill_name)
-    
     if not os.path.exists(skill_dir):
         print(f"Error: Skill '{skill_name}' not found at {skill_dir}")
+        return None
+
+    trash = _trash_root(skills_root)
+    stamp = datetime.datetime.now().strftime(TRASH_STAMP_FORMAT)
+    entry = f"{skill_name}@{stamp}"
+
+    try:
+        os.makedirs(trash, exist_ok=True)
+        os.rename(skill_dir, os.path.join(trash, entry))
+        print(f"Moved skill to trash: {skill_name} (undo with `undelete {skill_name}`)")
+        return entry
+    except Exception as e:
+        print(f"Error deleting skill '{skill_name}': {e}")
+        return None
+
+
+def delete_skills(skills_root, skill_names):
+    """Trash several skills. Returns (trash entry names created, number of skills that failed)."""
+    entries = []
+    failed = 0
+    for name in skill_names:
+        entry = delete_skill(skills_root, name)
+        if entry:
+            entries.append(entry)
+        else:
+            failed += 1
+    return entries, failed
+
+
+def undelete_skill(skills_root, skill_name):
+    """Restore the most recently trashed copy of a skill."""
+    if not _valid_skill_name(skill_name):
+        print(f"Error: Invalid skill name '{skill_name}'")
+        return False
+
+    candidates = [e for e in list_trash(skills_root) if e["name"] == skill_name]
+    if not candidates:
+        print(f"Error: Skill '{skill_name}' not found in trash")
         return False
-        
+
+    skill_dir = os.path.join(skills_root, skill_name)
+    if os.path.exists(skill_dir):
+        print(f"Error: Cannot restore '{skill_name}', {skill_dir} already exists")
+        return False
+
     try:
-        # Physical deletion
-        shutil.rmtree(skill_dir)
-        print(f"Successfully deleted skill: {skill_name}")
+        os.rename(candidates[0]["path"], skill_dir)
+        print(f"Restored skill: {skill_name}")
         return True
     except Exception as e:
-        print(f"Error deleting skill '{skill_name}': {e}")
+        print(f"Error restoring skill '{skill_name}': {e}")
         return False
 
+
+def purge_trash(skills_root, older_than_days=DEFAULT_RETENTION_DAYS, names=None, entries=None):
+    """
+    Permanently remove trashed skills older than `older_than_days`.
+    Pass 0 to purge everything. `names` limits the purge to those skills, `entries`
+    to those trash entries (`<skill>@<stamp>`). Returns the number of entries removed.
+    """
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=older_than_days)
+    purged = 0
+    for entry in list_trash(skills_root):
+        if names and entry["name"] not in names:
+            continue
+        if entries and os.path.basename(entry["path"]) not in entries:
+            continue
+        if entry["deleted_at"] > cutoff:
+            continue
+        try:
+            shutil.rmtree(entry["path"])
+            purged += 1
+        except Exception as e:
+            print(f"Error purging '{entry['name']}': {e}", file=sys.stderr)
+    return purged
+
+
+def spawn_background_purge(skills_root, older_than_days=DEFAULT_RETENTION_DAYS, names=None, entries=None):
+    """Run `purge` in a detached process so the caller returns immediately."""
+    command = [
+        sys.executable, os.path.abspath(__file__),
+        "--root", skills_root,
+        "purge", "--older-than", str(older_than_days),
+        *[arg for entry in entries or [] for arg in ("--entry", entry)],
+        *(names or []),
+    ]
+    kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL, "stdin": subprocess.DEVNULL}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen(command, **kwargs)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="delete_skill.py")
+    parser.add_argument("--root", default=r"C:\Users\20515\.claude\skills", help="Skills root directory.")
+    sub = parser.add_subparsers(dest="cmd")
+
+    p_delete = sub.add_parser("delete", help="Move one or more skills to the trash.")
+    p_delete.add_argument("names", nargs="+")
+    p_delete.add_argument(
+        "--now",
+        action="store_true",
+        help="Also purge the copies trashed by this command in the background (no undelete).",
+    )
+
+    p_undelete = sub.add_parser("undelete", help="Restore trashed skills.")
+    p_undelete.add_argument("names", nargs="+")
+
+    p_purge = sub.add_parser("purge", help="Permanently remove old entries from the trash.")
+    p_purge.add_argument("names", nargs="*", help="Only purge these skills (default: all).")
+    p_purge.add_argument(
+        "--older-than",
+        type=float,
+        default=DEFAULT_RETENTION_DAYS,
+        help=f"Only purge entries trashed more than N days ago (default: {DEFAULT_RETENTION_DAYS}, 0 = all).",
+    )
+    p_purge.add_argument(
+        "--entry",
+        action="append",
+        dest="entries",
+        help="Only purge this trash entry, `<skill>@<stamp>` (repeatable).",
+    )
+    p_purge.add_argument("--background", action="store_true", help="Run the purge in a detached process.")
+
+    sub.add_parser("trash", help="List skills currently in the trash.")
+    return parser
+
+
+def main(argv):
+    # Backwards compatible form: delete_skill.py <skill_name> [skills_root]
+    if argv and not argv[0].startswith("-") and argv[0] not in ("delete", "undelete", "purge", "trash"):
+        argv = (["--root", argv[1]] if len(argv) > 1 else []) + ["delete", argv[0]]
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.cmd is None:
+        parser.print_usage()
+        return 1
+
+    if args.cmd == "delete":
+        entries, failed = delete_skills(args.root, args.names)
+        if args.now and entries:
+            # Only the entries just created: older trashed copies stay restorable.
+            spawn_background_purge(args.root, older_than_days=0, entries=entries)
+        else:
+            # Opportunistically reclaim space from entries past the retention window.
+            cutoff = datetime.datetime.now() - datetime.timedelta(days=DEFAULT_RETENTION_DAYS)
+            if any(e["deleted_at"] <= cutoff for e in list_trash(args.root)):
+                spawn_background_purge(args.root)
+        return 1 if failed else 0
+
+    if args.cmd == "undelete":
+        failed = sum(0 if undelete_skill(args.root, n) else 1 for n in args.names)
+        return 1 if failed else 0
+
+    if args.cmd == "purge":
+        if args.background:
+            spawn_background_purge(args.root, args.older_than, args.names, args.entries)
+            print("Purge started in background.")
+            return 0
+        start = time.perf_counter()
+        purged = purge_trash(args.root, args.older_than, args.names, args.entries)
+        print(f"Purged {purged} trashed skill(s) in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    if args.cmd == "trash":
+        entries = list_trash(args.root)
+        if not entries:
+            print("Trash is empty.")
+        for e in entries:
+            print(f"{e['name']:<30} deleted {e['deleted_at']:%Y-%m-%d %H:%M:%S}")
+        return 0
+
+    return 1
+
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python delete_skill.py <skill_name> [skills_root]")
-        sys.exit(1)
-        
-    name = sys.argv[1]
-    root = r"C:\Users\20515\.claude\skills"
-    if len(sys.argv) > 2:
-        root = sys.argv[2]
-        
-    delete_skill(root, name)
+    sys.exit(main(sys.argv[1:]))
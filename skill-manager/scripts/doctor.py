@@ -0,0 +1,276 @@
+"""
+Health check for a skills root: frontmatter validity, broken relative links,
+and per-skill size / estimated token budgets.
+
+Skills are checked in parallel. Results are cached in `<skills_root>/.skill-doctor.json`
+keyed by a fingerprint of every file's path, size and mtime, so re-runs only
+re-check skills that changed. Links that leave the skill folder (`../other-skill/...`)
+are not covered by that fingerprint; their targets are stored with the result and
+re-checked on every run, cached or not.
+
+Usage: python doctor.py <skills_root> [--json] [--top 10] [--workers 8] [--no-cache]
+"""
+import os
+import re
+import sys
+import json
+import signal
+import argparse
+
+from skill_index import read_frontmatter
+
+CACHE_FILE_NAME = ".skill-doctor.json"
+CACHE_VERSION = 2
+
+# SKILL.md is loaded into context whenever the skill triggers; keep it lean.
+SKILL_MD_MAX_LINES = 500
+SKILL_MD_TOKEN_BUDGET = 5000
+# Any single markdown file (references included) above this is reported as bloat.
+FILE_TOKEN_BUDGET = 10000
+
+SKIP_DIRS = {".git", "node_modules", "__pycache__", ".venv", "venv"}
+LINK_RE = re.compile(r"!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+\"[^\"]*\")?\s*\)")
+FENCE_RE = re.compile(r"^(```|~~~).*?^\1", re.MULTILINE | re.DOTALL)
+CJK_RE = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+
+def estimate_tokens(text):
+    """Rough token estimate: ~1 token per CJK character, ~4 characters per token otherwise."""
+    cjk = len(CJK_RE.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def walk_files(skill_dir):
+    """Yield (relative_path, stat) for every file in a skill, skipping vendored/VCS dirs."""
+    for dirpath, dirnames, filenames in os.walk(skill_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            yield os.path.relpath(path, skill_dir), st
+
+
+def fingerprint(files):
+    import hashlib  # not at module level: search_skills.py imports this module for SKIP_DIRS
+
+    h = hashlib.blake2b(digest_size=16)
+    for rel, st in sorted(files, key=lambda f: f[0]):
+        h.update(f"{rel}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8", "surrogateescape"))
+    return h.hexdigest()
+
+
+def find_broken_links(skill_dir, rel_path, text):
+    """
+    Relative markdown links in `text`. Returns (links inside the skill whose target
+    does not exist, links leaving the skill). The latter carry `path`, the target
+    relative to the skill folder, and are checked by external_link_issues().
+    """
+    broken = []
+    external = []
+    base = os.path.dirname(os.path.join(skill_dir, rel_path))
+    body = FENCE_RE.sub("", text)  # links inside code samples are illustrative
+    for target in LINK_RE.findall(body):
+        if re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", target) or target.startswith(("#", "/")):
+            continue
+        path = target.split("#", 1)[0].split("?", 1)[0]
+        if not path:
+            continue
+        rel_target = os.path.relpath(os.path.join(base, path), skill_dir)
+        if rel_target == os.pardir or rel_target.startswith(os.pardir + os.sep):
+            external.append({"file": rel_path, "target": target, "path": rel_target})
+        elif not os.path.exists(os.path.join(base, path)):
+            broken.append({"file": rel_path, "target": target})
+    return broken, external
+
+
+def external_link_issues(skill_dir, external):
+    """Errors for links leaving the skill whose target is gone (checked on every run)."""
+    return [
+        {"level": "error", "message": f"{link['file']}: broken link -> {link['target']}"}
+        for link in external
+        if not os.path.exists(os.path.join(skill_dir, link["path"]))
+    ]
+
+
+def check_skill(skill_dir, files):
+    """Run all checks for one skill. `files` is the list from walk_files()."""
+    issues = []
+    broken_links = []
+    external_links = []
+    total_bytes = 0
+    context_tokens = 0
+    markdown = []
+
+    names = {rel for rel, _ in files}
+    if "SKILL.md" not in names:
+        if "skill.md" in names:
+            issues.append({"level": "error", "message": "SKILL.md is named `skill.md`; loaders expect `SKILL.md`"})
+        else:
+            issues.append({"level": "error", "message": "SKILL.md missing"})
+
+    for rel, st in files:
+        total_bytes += st.st_size
+        if not rel.lower().endswith(".md"):
+            continue
+        try:
+            with open(os.path.join(skill_dir, rel), "r", encoding="utf-8") as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            issues.append({"level": "warning", "message": f"{rel}: unreadable ({e})"})
+            continue
+        tokens = estimate_tokens(text)
+        context_tokens += tokens
+        markdown.append({"file": rel, "bytes": st.st_size, "lines": text.count("\n") + 1, "tokens": tokens})
+        broken, external = find_broken_links(skill_dir, rel, text)
+        broken_links.extend(broken)
+        external_links.extend(external)
+
+    skill_md = os.path.join(skill_dir, "SKILL.md")
+    if "SKILL.md" in names:
+        try:
+            meta = read_frontmatter(skill_md)
+            if meta is None:
+                issues.append({"level": "error", "message": "SKILL.md has no `---` frontmatter block"})
+            else:
+                for key in ("name", "description"):
+                    if not meta.get(key):
+                        issues.append({"level": "error", "message": f"frontmatter is missing `{key}`"})
+        except Exception as e:
+            detail = " ".join(str(e).split())
+            issues.append({"level": "error", "message": f"frontmatter YAML does not parse: {detail}"})
+
+    for md in markdown:
+        if md["file"] == "SKILL.md":
+            if md["lines"] > SKILL_MD_MAX_LINES:
+                issues.append({"level": "warning", "message": f"SKILL.md has {md['lines']} lines (> {SKILL_MD_MAX_LINES}); move detail into references/"})
+            if md["tokens"] > SKILL_MD_TOKEN_BUDGET:
+                issues.append({"level": "warning", "message": f"SKILL.md is ~{md['tokens']} tokens (> {SKILL_MD_TOKEN_BUDGET})"})
+        elif md["tokens"] > FILE_TOKEN_BUDGET:
+            issues.append({"level": "warning", "message": f"{md['file']} is ~{md['tokens']} tokens (> {FILE_TOKEN_BUDGET})"})
+
+    for link in broken_links:
+        issues.append({"level": "error", "message": f"{link['file']}: broken link -> {link['target']}"})
+
+    markdown.sort(key=lambda m: m["tokens"], reverse=True)
+    return {
+        "bytes": total_bytes,
+        "files": len(files),
+        "tokens": context_tokens,
+        "skill_md_tokens": next((m["tokens"] for m in markdown if m["file"] == "SKILL.md"), 0),
+        "largest_files": markdown[:3],
+        "issues": issues,
+        "external_links": external_links,
+    }
+
+
+def load_cache(skills_root):
+    try:
+        with open(os.path.join(skills_root, CACHE_FILE_NAME), "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache.get("skills", {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def save_cache(skills_root, skills):
+    path = os.path.join(skills_root, CACHE_FILE_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "skills": skills}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not write doctor cache: {e}", file=sys.stderr)
+
+
+def _diagnose(skill_dir, cached):
+    """Returns (result to report, cache entry, cache hit)."""
+    files = list(walk_files(skill_dir))
+    fp = fingerprint(files)
+    hit = bool(cached) and cached.get("fingerprint") == fp
+    if hit:
+        entry = cached
+    else:
+        entry = check_skill(skill_dir, files)
+        entry["fingerprint"] = fp
+    result = dict(entry, issues=entry["issues"] + external_link_issues(skill_dir, entry.get("external_links", [])))
+    return result, entry, hit
+
+
+def run_doctor(skills_root, workers=8, use_cache=True):
+    """Check every skill under `skills_root`. Returns {skill_name: result} and the cache-hit count."""
+    # Deferred so importers that only need SKIP_DIRS (search_skills.py) skip the executor
+    import concurrent.futures
+
+    cache = load_cache(skills_root) if use_cache else {}
+    names = sorted(
+        e.name for e in os.scandir(skills_root)
+        if e.is_dir() and not e.name.startswith(".")
+    )
+
+    results = {}
+    entries = {}
+    hits = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        future_to_name = {
+            executor.submit(_diagnose, os.path.join(skills_root, n), cache.get(n)): n
+            for n in names
+        }
+        for future in concurrent.futures.as_completed(future_to_name):
+            name = future_to_name[future]
+            try:
+                results[name], entries[name], hit = future.result()
+                hits += hit
+            except Exception as e:
+                results[name] = {"bytes": 0, "files": 0, "tokens": 0, "skill_md_tokens": 0,
+                                 "largest_files": [], "issues": [{"level": "error", "message": str(e)}]}
+
+    if use_cache:
+        save_cache(skills_root, entries)
+    return dict(sorted(results.items())), hits
+
+
+def print_report(results, hits, top):
+    errors = sum(1 for r in results.values() for i in r["issues"] if i["level"] == "error")
+    warnings = sum(1 for r in results.values() for i in r["issues"] if i["level"] == "warning")
+    print(f"Checked {len(results)} skills ({hits} unchanged, from cache): {errors} error(s), {warnings} warning(s)\n")
+
+    for name, r in results.items():
+        for issue in r["issues"]:
+            print(f"[{issue['level'].upper():<7}] {name}: {issue['message']}")
+
+    print(f"\nTop {top} skills by estimated context tokens (all markdown):")
+    print(f"{'Skill Name':<36} | {'Tokens':>8} | {'SKILL.md':>8} | {'Bytes':>10} | Largest file")
+    print("-" * 100)
+    ranked = sorted(results.items(), key=lambda kv: kv[1]["tokens"], reverse=True)[:top]
+    for name, r in ranked:
+        largest = r["largest_files"][0]["file"] if r["largest_files"] else "-"
+        print(f"{name:<36} | {r['tokens']:>8} | {r['skill_md_tokens']:>8} | {r['bytes']:>10} | {largest}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="doctor.py")
+    parser.add_argument("skills_root", nargs="?", default=r"C:\Users\20515\.claude\skills")
+    parser.add_argument("--json", action="store_true", help="Print the full result as JSON.")
+    parser.add_argument("--top", type=int, default=10, help="Number of biggest offenders to show.")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--no-cache", action="store_true", help="Re-check every skill and do not update the cache.")
+    args = parser.parse_args()
+    if hasattr(signal, "SIGPIPE"):
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)  # `| head` ends the output quietly
+
+    if not os.path.isdir(args.skills_root):
+        print(f"Error: {args.skills_root} not found")
+        sys.exit(1)
+
+    results, hits = run_doctor(args.skills_root, workers=args.workers, use_cache=not args.no_cache)
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        print_report(results, hits, args.top)
+    sys.exit(1 if any(i["level"] == "error" for r in results.values() for i in r["issues"]) else 0)
@@ -1,7 +1,12 @@
 import os
 import sys
-import yaml
 import io
+import re
+import json
+import argparse
+import unicodedata
+
+from skill_index import iter_skills
 
 # Force UTF-8 encoding for stdout to handle Chinese characters on Windows
 if hasattr(sys.stdout, 'reconfigure'):
@@ -10,52 +15,167 @@ else:
     # Fallback for older Python versions
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-def list_skills(skills_root):
+# wcwidth (optional) is looked up on first use: only the table output measures
+# character widths, and --json / --jsonl runs should not pay for the import.
+_wcwidth = None
+
+FIELDS = ["name", "title", "type", "version", "description", "github_url", "github_hash", "has_evolution", "dir"]
+
+# (field, header, display width, truncate) for the human-readable table. Only the
+# description is cut to fit; names are what users copy into other commands.
+TABLE_COLUMNS = [
+    ("name", "Skill Name", 20, False),
+    ("type", "Type", 12, False),
+    ("description", "Description", 40, True),
+    ("version", "Ver", 8, False),
+]
+
+
+def char_width(ch):
+    """Terminal cell width of a single character (CJK and full-width forms take 2)."""
+    global _wcwidth
+    if _wcwidth is None:
+        try:
+            from wcwidth import wcwidth as _wcwidth
+        except ImportError:
+            _wcwidth = False
+    if _wcwidth:
+        return max(_wcwidth(ch), 0)
+    if unicodedata.combining(ch):
+        return 0
+    return 2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+
+
+def pad(text, width):
+    """Pad `text` to at least `width` terminal cells, never cutting it."""
+    used = sum(char_width(ch) for ch in text)
+    return text + " " * max(width - used, 0)
+
+
+def fit(text, width):
+    """Truncate and pad `text` to exactly `width` terminal cells in a single pass."""
+    out = []
+    used = 0
+    limit = width - 3  # room for "..." if we have to cut
+    cut_at = None
+    for ch in text:
+        w = char_width(ch)
+        if cut_at is None and used + w > limit:
+            cut_at = (len(out), used)
+        if used + w > width:
+            n, used = cut_at
+            out = out[:n]
+            out.append("...")
+            used += 3
+            break
+        out.append(ch)
+        used += w
+    return "".join(out) + " " * (width - used)
+
+
+def version_key(version):
+    """Sort key for loose semantic versions ("1.10.0" > "1.9", "v2" -> 2)."""
+    parts = re.findall(r"\d+|[A-Za-z]+", str(version))
+    return [(0, int(p), "") if p.isdigit() else (1, 0, p.lower()) for p in parts]
+
+
+def parse_filters(filters):
+    parsed = []
+    for spec in filters or []:
+        key, sep, value = spec.partition("=")
+        negate = key.endswith("!")
+        key = key.rstrip("!").strip()
+        if not sep or key not in FIELDS:
+            raise ValueError(f"Invalid filter '{spec}' (expected FIELD=VALUE or FIELD!=VALUE, fields: {', '.join(FIELDS)})")
+        parsed.append((key, value.strip().lower(), negate))
+    return parsed
+
+
+def matches(record, filters):
+    for key, value, negate in filters:
+        hit = str(record.get(key) or "").lower() == value
+        if hit == negate:
+            return False
+    return True
+
+
+def render_table(records, fields):
+    columns = [c for c in TABLE_COLUMNS if c[0] in fields] or TABLE_COLUMNS
+    header = " | ".join(pad(title, width) for _, title, width, _ in columns).rstrip()
+    yield header
+    yield "-" * len(header)
+    for record in records:
+        yield " | ".join(
+            (fit if truncate else pad)(str(record.get(f) or ""), width) for f, _, width, truncate in columns
+        ).rstrip()
+
+
+def list_skills(skills_root, fmt="table", filters=None, sort=None, fields=None, use_cache=True):
     if not os.path.exists(skills_root):
         print(f"Error: {skills_root} not found")
         return
 
-    # Header with Description column
-    header = f"{'Skill Name':<20} | {'Type':<12} | {'Description':<40} | {'Ver':<8}"
-    print(header)
-    print("-" * len(header))
-
-    for item in os.listdir(skills_root):
-        skill_dir = os.path.join(skills_root, item)
-        if not os.path.isdir(skill_dir):
-            continue
-            
-        skill_md = os.path.join(skill_dir, "SKILL.md")
-        skill_type = "Standard"
-        version = "0.1.0"
-        description = "No description"
-        
-        if os.path.exists(skill_md):
-            try:
-                with open(skill_md, "r", encoding="utf-8") as f:
-                    content = f.read()
-                parts = content.split("---")
-                if len(parts) >= 3:
-                    meta = yaml.safe_load(parts[1])
-                    if "github_url" in meta:
-                        skill_type = "GitHub"
-                    version = str(meta.get("version", "0.1.0"))
-                    description = meta.get("description", "No description").replace('\n', ' ')
-            except:
-                pass
-        
-        # Simple truncation for display
-        if len(description) > 37:
-            display_desc = description[:37] + "..."
-        else:
-            display_desc = description
-            
-        # Using a fixed width but acknowledging that Chinese chars take 2 cells
-        # This is a basic fix, for perfect alignment one would need wcwidth
-        print(f"{item:<20} | {skill_type:<12} | {display_desc:<40} | {version:<8}")
+    fields = fields or FIELDS
+    parsed_filters = parse_filters(filters)
+    records = (r for r in iter_skills(skills_root, use_cache=use_cache) if matches(r, parsed_filters))
+
+    # Sorting needs the full set; without it, rows stream as skills are discovered.
+    if sort:
+        key = version_key if sort == "version" else (lambda v: str(v or "").lower())
+        records = iter(sorted(records, key=lambda r: key(r.get(sort))))
+
+    if fmt == "table":
+        for line in render_table(records, fields):
+            print(line, flush=True)
+        return
+
+    projected = ({f: r.get(f) for f in fields} for r in records)
+    if fmt == "jsonl":
+        for item in projected:
+            print(json.dumps(item, ensure_ascii=False), flush=True)
+        return
+
+    # --json: stream a JSON array element by element
+    first = True
+    print("[", end="")
+    for item in projected:
+        print(("\n  " if first else ",\n  ") + json.dumps(item, ensure_ascii=False), end="", flush=True)
+        first = False
+    print("\n]" if not first else "]")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="list_skills.py")
+    parser.add_argument("skills_root", nargs="?", default=r"C:\Users\20515\.claude\skills")
+    out = parser.add_mutually_exclusive_group()
+    out.add_argument("--json", dest="fmt", action="store_const", const="json", help="Output a JSON array.")
+    out.add_argument("--jsonl", dest="fmt", action="store_const", const="jsonl", help="Output one JSON object per line.")
+    parser.add_argument(
+        "--filter",
+        action="append",
+        metavar="FIELD=VALUE",
+        help="Keep skills whose field equals VALUE (case-insensitive). Use FIELD!=VALUE to exclude. Repeatable.",
+    )
+    parser.add_argument("--sort", choices=FIELDS, help="Sort by field (versions sort numerically).")
+    parser.add_argument("--fields", help=f"Comma-separated fields to output (default: all). Available: {','.join(FIELDS)}")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the metadata cache.")
+    parser.set_defaults(fmt="table")
+    return parser
+
 
 if __name__ == "__main__":
-    skills_path = r"C:\Users\20515\.claude\skills"
-    if len(sys.argv) > 1:
-        skills_path = sys.argv[1]
-    list_skills(skills_path)
+    parser = build_parser()
+    args = parser.parse_args()
+    fields = None
+    if args.fields:
+        fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in FIELDS]
+        if unknown:
+            parser.error(f"unknown field(s): {', '.join(unknown)}")
+    try:
+        list_skills(args.skills_root, args.fmt, args.filter, args.sort, fields, use_cache=not args.no_cache)
+    except ValueError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        # Output piped into `head` & co. that stopped reading early.
+        sys.stderr.close()
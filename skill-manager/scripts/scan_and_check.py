@@ -1,12 +1,13 @@
 import os
 import sys
-import yaml
 import json
-import subprocess
-import concurrent.futures
+
+from skill_index import iter_skills
 
 def get_remote_hash(url):
     """Fetch the latest commit hash from the remote repository."""
+    import subprocess
+
     try:
         # Using git ls-remote to avoid downloading the whole repo
         # Asking for HEAD specifically
@@ -27,53 +28,35 @@ def get_remote_hash(url):
         return None
 
 def scan_skills(skills_root):
-    """Scan all subdirectories for SKILL.md and extract metadata."""
+    """Scan all subdirectories for SKILL.md and extract metadata (via the cached skill index)."""
     skill_list = []
     
     if not os.path.exists(skills_root):
         print(f"Skills root not found: {skills_root}", file=sys.stderr)
         return []
 
-    for item in os.listdir(skills_root):
-        skill_dir = os.path.join(skills_root, item)
-        if not os.path.isdir(skill_dir):
-            continue
-            
-        skill_md = os.path.join(skill_dir, "SKILL.md")
-        if not os.path.exists(skill_md):
-            continue
-            
-        # Parse Frontmatter
-        try:
-            with open(skill_md, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            # Extract YAML between first two ---
-            parts = content.split('---')
-            if len(parts) < 3:
-                continue # Invalid format
-                
-            frontmatter = yaml.safe_load(parts[1])
-            
-            # Check if managed by github-to-skills
-            if 'github_url' in frontmatter:
-                skill_list.append({
-                    "name": frontmatter.get('name', item),
-                    "dir": skill_dir,
-                    "github_url": frontmatter['github_url'],
-                    "local_hash": frontmatter.get('github_hash', 'unknown'),
-                    "local_version": frontmatter.get('version', '0.0.0')
-                })
-        except Exception as e:
-            # print(f"Skipping {item}: {e}", file=sys.stderr)
-            pass
+    for record in iter_skills(skills_root):
+        # Check if managed by github-to-skills (the github_url key is present)
+        if record['type'] == 'GitHub':
+            skill_list.append({
+                "name": record['title'],
+                "dir": record['dir'],
+                "github_url": record['github_url'],
+                "local_hash": record['github_hash'] or 'unknown',
+                "local_version": record['version'] if record.get('version_declared') else '0.0.0'
+            })
             
     return skill_list
 
 def check_updates(skills):
     """Check for updates concurrently."""
     results = []
-    
+    if not skills:
+        return results
+
+    # Deferred: a root without github-managed skills never starts a thread or a process
+    import concurrent.futures
+
     with concurrent.futures.ThreadPoolExecutor(max_workers=5) as executor:
         # Create a map of future -> skill
         future_to_skill = {
@@ -0,0 +1,365 @@
+"""
+Full-text search across every skill's markdown (SKILL.md and references).
+
+The index lives in `<skills_root>/.skill-search.sqlite` (an SQLite FTS5 table, one row
+per file). Skills come from the cached skill_index scan; each markdown file is re-read
+only when its size/mtime changed and re-indexed only when its content hash changed.
+
+Fields: `name` and `description` (SKILL.md frontmatter) and `body` (markdown text).
+Hits are ranked with BM25 (name and description weigh more than body) and shown with
+line-anchored snippets. Text is normalized before indexing: lowercase, a trailing
+plural "s" dropped, and Chinese split into overlapping character bigrams, so Chinese
+words match without a dictionary.
+
+Query syntax:
+  word                 must appear in any field
+  "exact phrase"       words must be adjacent (Chinese words are matched as phrases too)
+  name:word            restrict to a field (name, description/desc, body)
+  description:"a b"    field + phrase
+  skill:NAME           only files of skills whose folder name contains NAME
+  -word                exclude files containing the word
+
+Usage: python search_skills.py [--root <skills_root>] <query...> [--limit 10] [--json] [--no-refresh] [--rebuild] [--stats]
+"""
+import os
+import re
+import sys
+import json
+import time
+import signal
+import sqlite3
+import argparse
+
+from skill_index import iter_skills
+from doctor import SKIP_DIRS
+
+INDEX_FILE_NAME = ".skill-search.sqlite"
+INDEX_VERSION = 1
+
+FIELD_ALIASES = {"name": "name", "title": "name", "description": "description", "desc": "description", "body": "body"}
+FIELD_WEIGHTS = (5.0, 3.0, 1.0)
+SNIPPET_LINES = 3
+SNIPPET_CHARS = 160
+# Merge FTS segments after large refreshes so later queries touch fewer b-trees.
+OPTIMIZE_AFTER = 200
+
+CJK_RUN_RE = re.compile(r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]{2,}")
+PLURAL_RE = re.compile(r"\b([a-z0-9_]{2,}[a-rt-z0-9_])s\b")
+WORD_RE = re.compile(r"\w+")
+QUERY_RE = re.compile(r'(-?)(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    skill TEXT NOT NULL,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER,
+    size INTEGER,
+    digest TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(name, description, body, tokenize = "unicode61 tokenchars '_'");
+"""
+
+
+def normalize(text):
+    """Index form of `text`: lowercase, plural "s" dropped, Chinese runs as space-separated bigrams."""
+    text = CJK_RUN_RE.sub(
+        lambda m: " " + " ".join(m.group()[i:i + 2] for i in range(len(m.group()) - 1)) + " ",
+        text.lower(),
+    )
+    return PLURAL_RE.sub(r"\1", text)
+
+
+def tokenize(text):
+    return WORD_RE.findall(normalize(text))
+
+
+def strip_frontmatter(text):
+    """Blank out a leading `---` block, keeping line numbers intact."""
+    if not text.startswith("---"):
+        return text
+    lines = text.split("\n")
+    for i in range(1, len(lines)):
+        if lines[i].rstrip() == "---":
+            return "\n" * (i + 1) + "\n".join(lines[i + 1:])
+    return text
+
+
+def walk_markdown(skill_dir):
+    """Yield (relative posix path, stat) for every .md file in a skill; only markdown is stat()ed."""
+    stack = [("", skill_dir)]
+    while stack:
+        prefix, top = stack.pop()
+        try:
+            with os.scandir(top) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append((f"{prefix}{entry.name}/", entry.path))
+                    elif entry.name.lower().endswith(".md"):
+                        try:
+                            yield prefix + entry.name, entry.stat()
+                        except OSError:
+                            continue
+        except OSError:
+            continue
+
+
+def open_index(skills_root, rebuild=False):
+    """Raises sqlite3.OperationalError when this SQLite build has no FTS5."""
+    path = os.path.join(skills_root, INDEX_FILE_NAME)
+    if rebuild:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if row is None or row[0] != INDEX_VERSION:
+        with conn:
+            conn.execute("DELETE FROM docs")
+            conn.execute("DELETE FROM files")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (INDEX_VERSION,))
+    return conn
+
+
+def _index_file(conn, file_id, record, path, text):
+    """Replace the FTS row of one file."""
+    name = description = ""
+    if path == f"{record['name']}/SKILL.md" and record["has_skill_md"]:
+        name = record["title"]
+        description = record["description"] if record["description"] != "No description" else ""
+    conn.execute("DELETE FROM docs WHERE rowid = ?", (file_id,))
+    conn.execute(
+        "INSERT INTO docs (rowid, name, description, body) VALUES (?, ?, ?, ?)",
+        (file_id, normalize(name), normalize(description), normalize(strip_frontmatter(text))),
+    )
+
+
+def file_digest(data):
+    """Content hash of a file whose stat changed; hashlib is not loaded while nothing has."""
+    import hashlib
+
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def refresh(conn, skills_root):
+    """
+    Bring the index in line with the skills root. Returns counts of
+    {"files", "reindexed", "removed"}.
+    """
+    known = {path: (fid, mtime_ns, size, digest) for fid, path, mtime_ns, size, digest in
+             conn.execute("SELECT id, path, mtime_ns, size, digest FROM files")}
+    seen = set()
+    reindexed = 0
+    with conn:
+        for record in iter_skills(skills_root):
+            skill = record["name"]
+            for rel, st in walk_markdown(record["dir"]):
+                path = f"{skill}/{rel}"
+                seen.add(path)
+                entry = known.get(path)
+                if entry and entry[1] == st.st_mtime_ns and entry[2] == st.st_size:
+                    continue
+                try:
+                    with open(os.path.join(record["dir"], rel), "rb") as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                digest = file_digest(data)
+                if entry and entry[3] == digest:
+                    conn.execute("UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?", (st.st_mtime_ns, st.st_size, entry[0]))
+                    continue
+                if entry:
+                    file_id = entry[0]
+                    conn.execute(
+                        "UPDATE files SET mtime_ns = ?, size = ?, digest = ? WHERE id = ?",
+                        (st.st_mtime_ns, st.st_size, digest, file_id),
+                    )
+                else:
+                    file_id = conn.execute(
+                        "INSERT INTO files (skill, path, mtime_ns, size, digest) VALUES (?, ?, ?, ?, ?)",
+                        (skill, path, st.st_mtime_ns, st.st_size, digest),
+                    ).lastrowid
+                _index_file(conn, file_id, record, path, data.decode("utf-8", "replace"))
+                reindexed += 1
+
+        removed = [entry[0] for path, entry in known.items() if path not in seen]
+        for file_id in removed:
+            conn.execute("DELETE FROM docs WHERE rowid = ?", (file_id,))
+            conn.execute("DELETE FROM files WHERE id = ?", (file_id,))
+        if reindexed + len(removed) >= OPTIMIZE_AFTER:
+            conn.execute("INSERT INTO docs (docs) VALUES ('optimize')")
+    return {"files": len(seen), "reindexed": reindexed, "removed": len(removed)}
+
+
+def parse_query(query):
+    """
+    Split a query into clauses {"tokens", "field" (None = any), "negate"} and skill filters.
+    A clause with several tokens (a quoted phrase, a Chinese word, "step-by-step") is a phrase.
+    """
+    clauses = []
+    skills = []
+    for negate, field, phrase, word in QUERY_RE.findall(query):
+        text = phrase or word
+        if field and field.lower() == "skill":
+            skills.append(text.lower())
+            continue
+        if field and field.lower() not in FIELD_ALIASES:
+            # Not a field name ("http://...", "step:1"): search the whole text
+            text = f"{field}:{text}"
+            field = ""
+        tokens = tokenize(text)
+        if tokens:
+            clauses.append({
+                "tokens": tokens,
+                "field": FIELD_ALIASES[field.lower()] if field else None,
+                "negate": bool(negate),
+            })
+    return clauses, skills
+
+
+def fts_expression(clauses):
+    """FTS5 MATCH expression for parsed clauses. Raises ValueError without positive clauses."""
+    def term(clause):
+        phrase = '"' + " ".join(clause["tokens"]) + '"'
+        return f"{clause['field']} : {phrase}" if clause["field"] else phrase
+
+    positive = [term(c) for c in clauses if not c["negate"]]
+    if not positive:
+        raise ValueError("query has no search terms")
+    expr = "(" + " AND ".join(positive) + ")"
+    for clause in clauses:
+        if clause["negate"]:
+            expr += f" NOT {term(clause)}"
+    return expr
+
+
+def _contains(tokens, phrase):
+    n = len(phrase)
+    return any(tokens[i:i + n] == phrase for i in range(len(tokens) - n + 1))
+
+
+def _snippets(skills_root, path, phrases):
+    """[(line_no, text)] for the first lines containing one of the phrases."""
+    out = []
+    try:
+        with open(os.path.join(skills_root, path), "r", encoding="utf-8", errors="replace") as f:
+            text = strip_frontmatter(f.read())
+    except OSError:
+        return out
+    for line_no, line in enumerate(text.split("\n"), 1):
+        tokens = tokenize(line)
+        if tokens and any(_contains(tokens, p) for p in phrases):
+            line = " ".join(line.split())
+            if len(line) > SNIPPET_CHARS:
+                line = line[:SNIPPET_CHARS - 3] + "..."
+            out.append((line_no, line))
+            if len(out) == SNIPPET_LINES:
+                break
+    return out
+
+
+def search(conn, skills_root, query, limit=10):
+    """
+    Ranked hits: [{"skill", "path", "score", "fields", "lines": [(line_no, text)]}].
+    Raises ValueError when the query has no positive terms.
+    """
+    clauses, skill_filters = parse_query(query)
+    sql = (
+        "SELECT f.skill, f.path, -bm25(docs, ?, ?, ?) AS score, docs.name, docs.description"
+        " FROM docs JOIN files f ON f.id = docs.rowid WHERE docs MATCH ?"
+    )
+    params = [*FIELD_WEIGHTS, fts_expression(clauses)]
+    if skill_filters:
+        sql += " AND (" + " OR ".join("instr(lower(f.skill), ?) > 0" for _ in skill_filters) + ")"
+        params.extend(skill_filters)
+    sql += " ORDER BY score DESC, f.path LIMIT ?"
+    params.append(limit)
+
+    phrases = [c["tokens"] for c in clauses if not c["negate"]]
+    body_phrases = [c["tokens"] for c in clauses if not c["negate"] and c["field"] in (None, "body")]
+    hits = []
+    for skill, path, score, name, description in conn.execute(sql, params):
+        lines = _snippets(skills_root, path, body_phrases) if body_phrases else []
+        fields = [
+            field for field, text in (("name", name), ("description", description))
+            if text and any(_contains(WORD_RE.findall(text), p) for p in phrases)
+        ]
+        if lines:
+            fields.append("body")
+        hits.append({"skill": skill, "path": path, "score": round(score, 3), "fields": fields, "lines": lines})
+    return hits
+
+
+# Prefix that hides `-word` query terms from argparse while keeping their position
+EXCLUDE_MARKER = "\0"
+
+
+def protect_exclusions(argv):
+    """
+    Mark `-word` query terms so argparse does not reject them as unknown options.
+    Only the exact short options `-h` / `-n` stay options; after `--` nothing is touched.
+    """
+    out = []
+    for i, arg in enumerate(argv):
+        if arg == "--":
+            return out + argv[i:]
+        if len(arg) > 1 and arg[0] == "-" and arg[1] != "-" and arg not in ("-h", "-n"):
+            arg = EXCLUDE_MARKER + arg
+        out.append(arg)
+    return out
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="search_skills.py")
+    parser.add_argument("--root", dest="skills_root", default=r"C:\Users\20515\.claude\skills", help="Skills root directory.")
+    parser.add_argument("query", nargs="+", help='Query terms; `-word` excludes, quote phrases ("a b").')
+    parser.add_argument("--limit", "-n", type=int, default=10, help="Number of files to show.")
+    parser.add_argument("--json", action="store_true", help="Print hits as JSON.")
+    parser.add_argument("--no-refresh", action="store_true", help="Query the index as is, without checking for changed files.")
+    parser.add_argument("--rebuild", action="store_true", help="Drop the index and re-index every file.")
+    parser.add_argument("--stats", action="store_true", help="Print refresh and query timings to stderr.")
+    args = parser.parse_args(protect_exclusions(sys.argv[1:]))
+    if hasattr(signal, "SIGPIPE"):
+        signal.signal(signal.SIGPIPE, signal.SIG_DFL)  # `| head` ends the output quietly
+    args.query = [q[len(EXCLUDE_MARKER):] if q.startswith(EXCLUDE_MARKER) else q for q in args.query]
+
+    if not os.path.isdir(args.skills_root):
+        print(f"Error: {args.skills_root} not found")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    try:
+        conn = open_index(args.skills_root, args.rebuild)
+    except sqlite3.OperationalError as e:
+        print(f"Error: could not open the search index (SQLite with FTS5 is required): {e}")
+        sys.exit(1)
+    try:
+        counts = None if args.no_refresh else refresh(conn, args.skills_root)
+        refreshed = time.perf_counter()
+        try:
+            hits = search(conn, args.skills_root, " ".join(args.query), args.limit)
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        queried = time.perf_counter()
+    finally:
+        conn.close()
+
+    if args.json:
+        print(json.dumps(hits, indent=2, ensure_ascii=False))
+    else:
+        if not hits:
+            print("No matches.")
+        for hit in hits:
+            print(f"{hit['path']}  [{', '.join(hit['fields'])}] score {hit['score']}")
+            for line_no, text in hit["lines"]:
+                print(f"  {line_no:>5}: {text}")
+    if args.stats:
+        if counts:
+            print(f"index: {counts['files']} files, {counts['reindexed']} re-indexed, {counts['removed']} removed", file=sys.stderr)
+        print(f"refresh {(refreshed - started) * 1000:.1f} ms, query {(queried - refreshed) * 1000:.1f} ms", file=sys.stderr)
+    sys.exit(0 if hits else 1)
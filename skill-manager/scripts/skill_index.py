@@ -0,0 +1,184 @@
+"""
+Cached metadata scan of a skills root, shared by the skill-manager scripts.
+
+Each skill's frontmatter is parsed once and stored in `<skills_root>/.skill-index.json`
+together with the SKILL.md / evolution.json mtime and size. Later scans only
+re-read skills whose files changed, and yield records as they are discovered so
+callers can stream output.
+"""
+import os
+import sys
+import json
+
+CACHE_FILE_NAME = ".skill-index.json"
+CACHE_VERSION = 3
+# Written by watch_index.py while it is serving the index from memory.
+WATCH_FILE_NAME = ".skill-watch.json"
+
+
+def read_frontmatter(skill_md):
+    """
+    Parse the leading YAML frontmatter of a SKILL.md.
+    Only reads up to the closing `---`, not the whole document.
+    Returns a dict, or None when the file has no frontmatter block.
+
+    PyYAML is imported here rather than at module level: warm scans are served from
+    the index cache and never parse frontmatter, so they skip the import entirely.
+    """
+    import yaml
+
+    with open(skill_md, "r", encoding="utf-8") as f:
+        first = f.readline()
+        if first.strip() != "---":
+            return None
+        lines = []
+        for line in f:
+            if line.rstrip() == "---":
+                break
+            lines.append(line)
+        else:
+            return None
+    meta = yaml.safe_load("".join(lines))
+    return meta if isinstance(meta, dict) else {}
+
+
+def build_record(skill_name, skill_dir, meta, has_evolution=False):
+    """Normalize frontmatter into the flat record every skill-manager command uses."""
+    has_skill_md = meta is not None
+    meta = meta or {}
+    description = meta.get("description") or "No description"
+    return {
+        "name": skill_name,
+        "title": str(meta.get("name", skill_name)),
+        "type": "GitHub" if "github_url" in meta else "Standard",
+        "version": str(meta.get("version", "0.1.0")),
+        "version_declared": "version" in meta,
+        "description": str(description).replace("\n", " ").strip(),
+        "github_url": meta.get("github_url"),
+        "github_hash": meta.get("github_hash"),
+        "has_skill_md": has_skill_md,
+        "has_evolution": has_evolution,
+        "dir": skill_dir,
+    }
+
+
+def _stat_file(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def stat_key(skill_dir):
+    """Change-detection key for a skill: (mtime, size) of SKILL.md and evolution.json."""
+    return [
+        _stat_file(os.path.join(skill_dir, "SKILL.md")),
+        _stat_file(os.path.join(skill_dir, "evolution.json")),
+    ]
+
+
+def load_cache(skills_root):
+    path = os.path.join(skills_root, CACHE_FILE_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+        if cache.get("version") == CACHE_VERSION:
+            return cache.get("skills", {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def save_cache(skills_root, entries):
+    path = os.path.join(skills_root, CACHE_FILE_NAME)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "skills": entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # A read-only skills root should not break listing, just caching.
+        print(f"Warning: could not write skill index cache: {e}", file=sys.stderr)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def query_watcher(skills_root, request=None, timeout=1.0):
+    """
+    Ask a running `watch_index.py` for the in-memory index.
+    Returns the decoded response, or None when no watcher is serving this root.
+    """
+    try:
+        with open(os.path.join(skills_root, WATCH_FILE_NAME), "r", encoding="utf-8") as f:
+            info = json.load(f)
+        import socket  # only once a watcher has advertised itself
+
+        payload = dict(request or {"cmd": "list"}, token=info["token"])
+        with socket.create_connection(("127.0.0.1", info["port"]), timeout=timeout) as conn:
+            conn.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(response, dict) or "error" in response:
+        return None
+    return response
+
+
+def scan_skill(skills_root, skill_name):
+    """Read one skill from disk (no cache). Returns (record, stat_key)."""
+    skill_dir = os.path.join(skills_root, skill_name)
+    skill_md = os.path.join(skill_dir, "SKILL.md")
+    key = stat_key(skill_dir)
+    meta = None
+    if key[0] is not None:
+        try:
+            meta = read_frontmatter(skill_md) or {}
+        except Exception:
+            # Unreadable or malformed frontmatter: still list the skill with defaults.
+            meta = {}
+    return build_record(skill_name, skill_dir, meta, has_evolution=key[1] is not None), key
+
+
+def iter_skills(skills_root, use_cache=True, use_watcher=True):
+    """
+    Yield one record per skill folder under `skills_root`, in directory order.
+    Hidden folders (e.g. `.trash`) are skipped. The cache is refreshed once the
+    generator is exhausted. When `watch_index.py` is running for this root, the
+    records come straight from its memory without touching the skill folders.
+    """
+    if use_cache and use_watcher:
+        served = query_watcher(skills_root)
+        if served is not None:
+            yield from served["skills"]
+            return
+
+    cache = load_cache(skills_root) if use_cache else {}
+    fresh = {}
+    dirty = False
+
+    with os.scandir(skills_root) as it:
+        for entry in it:
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+            cached = cache.get(entry.name)
+            key = stat_key(entry.path)
+            if cached is not None and cached.get("key") == key:
+                record = cached["record"]
+                record["dir"] = entry.path
+            else:
+                record, key = scan_skill(skills_root, entry.name)
+                dirty = True
+            fresh[entry.name] = {"key": key, "record": record}
+            yield record
+
+    if use_cache and (dirty or fresh.keys() != cache.keys()):
+        save_cache(skills_root, fresh)
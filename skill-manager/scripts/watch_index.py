@@ -0,0 +1,281 @@
+"""
+Keep the skill metadata index in memory and serve it to other skill-manager commands.
+
+On Linux the skills root is watched with inotify; elsewhere (or with --poll) the
+watcher falls back to periodically stat()ing SKILL.md / evolution.json. Only the
+skill whose files changed is re-parsed. While running, `list_skills.py` and
+`scan_and_check.py` get their records from this process over a localhost socket
+instead of scanning the disk.
+
+Usage: python watch_index.py <skills_root> [--poll] [--interval 2.0]
+"""
+import os
+import sys
+import json
+import time
+import signal
+import struct
+import secrets
+import argparse
+import threading
+import socketserver
+
+from skill_index import WATCH_FILE_NAME, iter_skills, scan_skill, save_cache, stat_key
+
+WATCHED_FILES = ("SKILL.md", "evolution.json")
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_CLOEXEC = 0x00080000
+
+ROOT_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+SKILL_MASK = IN_CLOSE_WRITE | IN_MODIFY | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class SkillIndex:
+    """Thread-safe in-memory {skill_name: record} map."""
+
+    def __init__(self, skills_root):
+        self.skills_root = skills_root
+        self.lock = threading.Lock()
+        self.records = {}
+        self.keys = {}
+        self.updates = 0
+
+    def load(self):
+        records = {r["name"]: r for r in iter_skills(self.skills_root, use_watcher=False)}
+        with self.lock:
+            self.records = records
+            self.keys = {name: stat_key(r["dir"]) for name, r in records.items()}
+
+    def refresh(self, skill_name):
+        """Re-read one skill (or drop it if its folder is gone). Returns True if the index changed."""
+        skill_dir = os.path.join(self.skills_root, skill_name)
+        if skill_name.startswith(".") or not os.path.isdir(skill_dir):
+            with self.lock:
+                removed = self.records.pop(skill_name, None) is not None
+                self.keys.pop(skill_name, None)
+                self.updates += removed
+            return removed
+
+        key = stat_key(skill_dir)
+        with self.lock:
+            if self.keys.get(skill_name) == key and skill_name in self.records:
+                return False
+        record, key = scan_skill(self.skills_root, skill_name)
+        with self.lock:
+            self.records[skill_name] = record
+            self.keys[skill_name] = key
+            self.updates += 1
+        return True
+
+    def snapshot(self):
+        with self.lock:
+            return [self.records[n] for n in sorted(self.records)]
+
+    def persist(self):
+        """Write the in-memory state through to the on-disk cache used when no watcher runs."""
+        with self.lock:
+            entries = {n: {"key": self.keys[n], "record": r} for n, r in self.records.items()}
+        save_cache(self.skills_root, entries)
+
+
+class InotifyWatcher:
+    """Minimal ctypes binding to Linux inotify: one watch on the root, one per skill folder."""
+
+    def __init__(self, index):
+        import ctypes
+        import ctypes.util
+
+        self.index = index
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.wd_to_skill = {}
+        self.root_wd = self._add_watch(index.skills_root, ROOT_MASK)
+        for entry in os.scandir(index.skills_root):
+            if entry.is_dir() and not entry.name.startswith("."):
+                self._watch_skill(entry.name)
+
+    def _add_watch(self, path, mask):
+        import ctypes
+
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def _watch_skill(self, name):
+        try:
+            wd = self._add_watch(os.path.join(self.index.skills_root, name), SKILL_MASK)
+        except OSError:
+            return  # folder vanished between listing and watching
+        self.wd_to_skill[wd] = name
+
+    def _rescan(self):
+        """
+        Events were dropped (the kernel queue overflowed): watch any skill folder that
+        appeared meanwhile and return every skill name so all of them are re-checked.
+        """
+        names = set()
+        for entry in os.scandir(self.index.skills_root):
+            if entry.is_dir() and not entry.name.startswith("."):
+                self._watch_skill(entry.name)
+                names.add(entry.name)
+        with self.index.lock:
+            return names | set(self.index.records)
+
+    def run(self):
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except InterruptedError:
+                continue
+            changed = set()
+            overflow = False
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                name = data[offset + EVENT_HEADER.size: offset + EVENT_HEADER.size + length]
+                name = os.fsdecode(name.rstrip(b"\0"))
+                offset += EVENT_HEADER.size + length
+
+                if mask & IN_Q_OVERFLOW:
+                    overflow = True
+                elif wd == self.root_wd:
+                    if not mask & IN_ISDIR or name.startswith("."):
+                        continue
+                    if mask & (IN_CREATE | IN_MOVED_TO):
+                        self._watch_skill(name)
+                    changed.add(name)
+                elif mask & IN_IGNORED:
+                    self.wd_to_skill.pop(wd, None)
+                elif wd in self.wd_to_skill and (name in WATCHED_FILES or mask & IN_DELETE_SELF):
+                    changed.add(self.wd_to_skill[wd])
+
+            if overflow:
+                changed |= self._rescan()
+            if any([self.index.refresh(n) for n in changed]):
+                self.index.persist()
+
+
+class PollingWatcher:
+    """Fallback for platforms without inotify: stat the watched files every `interval` seconds."""
+
+    def __init__(self, index, interval):
+        self.index = index
+        self.interval = interval
+
+    def run(self):
+        root = self.index.skills_root
+        while True:
+            time.sleep(self.interval)
+            try:
+                names = {e.name for e in os.scandir(root) if e.is_dir() and not e.name.startswith(".")}
+            except OSError:
+                continue
+            with self.index.lock:
+                known = set(self.index.records)
+            changed = [self.index.refresh(n) for n in names | known]
+            if any(changed):
+                self.index.persist()
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """One JSON request line in, one JSON response out."""
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8"))
+        except ValueError:
+            request = {}
+        if not secrets.compare_digest(str(request.get("token", "")), self.server.token):
+            response = {"error": "unauthorized"}
+        elif request.get("cmd") == "list":
+            response = {"skills": self.server.index.snapshot()}
+        elif request.get("cmd") == "get":
+            with self.server.index.lock:
+                record = self.server.index.records.get(request.get("name"))
+            response = {"skill": record} if record else {"error": "not found"}
+        elif request.get("cmd") == "stats":
+            with self.server.index.lock:
+                response = {"skills": len(self.server.index.records), "updates": self.server.index.updates}
+        else:
+            response = {"error": f"unknown command {request.get('cmd')!r}"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8"))
+
+
+class QueryServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(skills_root, poll=False, interval=2.0):
+    index = SkillIndex(skills_root)
+    index.load()
+
+    watcher = None
+    if not poll and sys.platform.startswith("linux"):
+        try:
+            watcher = InotifyWatcher(index)
+            mode = "inotify"
+        except OSError as e:
+            print(f"inotify unavailable ({e}); falling back to polling", file=sys.stderr)
+    if watcher is None:
+        watcher = PollingWatcher(index, interval)
+        mode = f"polling every {interval}s"
+    threading.Thread(target=watcher.run, daemon=True).start()
+
+    server = QueryServer(("127.0.0.1", 0), QueryHandler)
+    server.index = index
+    server.token = secrets.token_hex(16)
+
+    # The token authenticates queries, so only the owner may read it: create the file
+    # 0600 (a fresh temp file, as an existing file would keep its old mode) and swap it in.
+    watch_file = os.path.join(skills_root, WATCH_FILE_NAME)
+    tmp_file = f"{watch_file}.{os.getpid()}.tmp"
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"port": server.server_address[1], "pid": os.getpid(), "token": server.token}, f)
+    os.replace(tmp_file, watch_file)
+
+    def shutdown(*_):
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, shutdown)
+    print(f"Watching {skills_root} ({len(index.records)} skills, {mode}); serving on 127.0.0.1:{server.server_address[1]}")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.remove(watch_file)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="watch_index.py")
+    parser.add_argument("skills_root", nargs="?", default=r"C:\Users\20515\.claude\skills")
+    parser.add_argument("--poll", action="store_true", help="Force the polling fallback instead of inotify.")
+    parser.add_argument("--interval", type=float, default=2.0, help="Polling interval in seconds.")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.skills_root):
+        print(f"Error: {args.skills_root} not found")
+        sys.exit(1)
+    serve(os.path.abspath(args.skills_root), poll=args.poll, interval=args.interval)
@@ -6,16 +6,30 @@
  * Usage:
  *   ./render-graphs.js <skill-directory>           # Render each diagram separately
  *   ./render-graphs.js <skill-directory> --combine # Combine all into one diagram
+ *   ./render-graphs.js --all [skills-root]         # Every skill with diagrams (default root: ..)
+ *
+ * Options:
+ *   --jobs N   Run at most N `dot` processes at once (default: CPU count)
+ *   --force    Re-render even when the cached SVG is up to date
  *
  * Extracts all ```dot blocks from SKILL.md and renders to SVG.
  * Useful for helping your human partner visualize the process flows.
  *
+ * Each output directory keeps a `.render-cache.json` manifest mapping every SVG to
+ * the hash of the DOT source it was rendered from (for --combine, the hash of the
+ * combined source). Unchanged diagrams are skipped without starting `dot`.
+ *
  * Requires: graphviz (dot) installed on system
  */
 
 const fs = require('fs');
+const os = require('os');
 const path = require('path');
-const { execSync } = require('child_process');
+const crypto = require('crypto');
+const { execSync, spawn } = require('child_process');
+
+const CACHE_FILE = '.render-cache.json';
+const CACHE_VERSION = 1;
 
 function extractDotBlocks(markdown) {
   const blocks = [];
@@ -67,102 +81,238 @@ ${bodies.join('\n\n')}
 }`;
 }
 
-function renderToSvg(dotContent) {
+function hashDot(dotContent) {
+  return crypto.createHash('sha256').update('svg\0').update(dotContent).digest('hex');
+}
+
+function loadCache(outputDir) {
   try {
-    return execSync('dot -Tsvg', {
-      input: dotContent,
-      encoding: 'utf-8',
-      maxBuffer: 10 * 1024 * 1024
-    });
-  } catch (err) {
-    console.error('Error running dot:', err.message);
-    if (err.stderr) console.error(err.stderr.toString());
-    return null;
+    const cache = JSON.parse(fs.readFileSync(path.join(outputDir, CACHE_FILE), 'utf-8'));
+    if (cache.version === CACHE_VERSION && cache.files) return cache.files;
+  } catch {
+    // Missing or unreadable manifest: everything renders
   }
+  return {};
 }
 
-function main() {
-  const args = process.argv.slice(2);
-  const combine = args.includes('--combine');
-  const skillDirArg = args.find(a => !a.startsWith('--'));
-
-  if (!skillDirArg) {
-    console.error('Usage: render-graphs.js <skill-directory> [--combine]');
-    console.error('');
-    console.error('Options:');
-    console.error('  --combine    Combine all diagrams into one SVG');
-    console.error('');
-    console.error('Example:');
-    console.error('  ./render-graphs.js ../subagent-driven-development');
-    console.error('  ./render-graphs.js ../subagent-driven-development --combine');
-    process.exit(1);
-  }
+function saveCache(outputDir, files) {
+  const cachePath = path.join(outputDir, CACHE_FILE);
+  const tmpPath = `${cachePath}.${process.pid}.tmp`;
+  fs.writeFileSync(tmpPath, JSON.stringify({ version: CACHE_VERSION, files }, null, 1));
+  fs.renameSync(tmpPath, cachePath);
+}
+
+function renderToSvg(dotContent) {
+  return new Promise(resolve => {
+    const child = spawn('dot', ['-Tsvg'], { stdio: ['pipe', 'pipe', 'pipe'] });
+    const out = [];
+    const err = [];
+    child.stdout.on('data', chunk => out.push(chunk));
+    child.stderr.on('data', chunk => err.push(chunk));
+    child.on('error', e => resolve({ svg: null, error: e.message }));
+    child.on('close', code => {
+      if (code === 0) {
+        resolve({ svg: Buffer.concat(out).toString('utf-8'), error: null });
+      } else {
+        resolve({ svg: null, error: Buffer.concat(err).toString('utf-8').trim() || `dot exited with ${code}` });
+      }
+    });
+    child.stdin.on('error', () => {}); // dot may exit before reading all input
+    child.stdin.end(dotContent);
+  });
+}
 
-  const skillDir = path.resolve(skillDirArg);
+async function runPool(jobs, limit, worker) {
+  let next = 0;
+  const runners = Array.from({ length: Math.min(limit, jobs.length) }, async () => {
+    while (next < jobs.length) {
+      const job = jobs[next++];
+      await worker(job);
+    }
+  });
+  await Promise.all(runners);
+}
+
+/**
+ * Collect the render jobs of one skill. Each job is
+ * { skill, outputDir, file, dot, hash, extraFiles } and is marked cached when
+ * the manifest hash matches and the SVG still exists.
+ */
+function planSkill(skillDir, combine, force) {
   const skillFile = path.join(skillDir, 'SKILL.md');
   const skillName = path.basename(skillDir).replace(/-/g, '_');
+  const blocks = extractDotBlocks(fs.readFileSync(skillFile, 'utf-8'));
+  if (blocks.length === 0) return null;
 
-  if (!fs.existsSync(skillFile)) {
-    console.error(`Error: ${skillFile} not found`);
-    process.exit(1);
+  const outputDir = path.join(skillDir, 'diagrams');
+  const cache = loadCache(outputDir);
+  const jobs = [];
+
+  if (combine) {
+    const combined = combineGraphs(blocks, skillName);
+    jobs.push({
+      file: `${skillName}_combined.svg`,
+      dot: combined,
+      // Also write the dot source for debugging
+      extraFiles: { [`${skillName}_combined.dot`]: combined },
+    });
+  } else {
+    for (const block of blocks) {
+      jobs.push({ file: `${block.name}.svg`, dot: block.content, extraFiles: {} });
+    }
   }
 
-  // Check if dot is available
+  for (const job of jobs) {
+    job.skill = path.basename(skillDir);
+    job.outputDir = outputDir;
+    job.hash = hashDot(job.dot);
+    job.cached = !force && cache[job.file] === job.hash && fs.existsSync(path.join(outputDir, job.file));
+  }
+  return { skill: path.basename(skillDir), blocks: blocks.length, outputDir, cache, jobs };
+}
+
+function ensureDot() {
   try {
-    execSync('which dot', { encoding: 'utf-8' });
+    execSync('dot -V', { stdio: 'ignore' });
   } catch {
     console.error('Error: graphviz (dot) not found. Install with:');
     console.error('  brew install graphviz    # macOS');
     console.error('  apt install graphviz     # Linux');
     process.exit(1);
   }
+}
+
+/**
+ * Render every uncached job of `plans` and update their caches. Returns the
+ * overall { rendered, cached, failed } counts; each plan gets its own on plan.stats.
+ */
+async function renderPlans(plans, jobsLimit, verbose) {
+  const pending = plans.flatMap(plan => plan.jobs.filter(job => !job.cached));
+  if (pending.length > 0) ensureDot();
 
-  const markdown = fs.readFileSync(skillFile, 'utf-8');
-  const blocks = extractDotBlocks(markdown);
+  const stats = { rendered: 0, cached: 0, failed: 0 };
+  const planBySkill = new Map(plans.map(plan => [plan.skill, plan]));
 
-  if (blocks.length === 0) {
-    console.log('No ```dot blocks found in', skillFile);
-    process.exit(0);
+  for (const plan of plans) {
+    plan.stats = { rendered: 0, cached: 0, failed: 0 };
+    for (const job of plan.jobs) {
+      if (!job.cached) continue;
+      stats.cached++;
+      plan.stats.cached++;
+      if (verbose) console.log(`  Cached: ${job.file}`);
+    }
   }
 
-  console.log(`Found ${blocks.length} diagram(s) in ${path.basename(skillDir)}/SKILL.md`);
+  await runPool(pending, jobsLimit, async job => {
+    const { svg, error } = await renderToSvg(job.dot);
+    const plan = planBySkill.get(job.skill);
+    if (svg === null) {
+      stats.failed++;
+      plan.stats.failed++;
+      delete plan.cache[job.file];
+      console.error(`  Failed: ${plans.length > 1 ? `${job.skill}/` : ''}${job.file}`);
+      if (error) console.error(`    ${error.split('\n').join('\n    ')}`);
+      return;
+    }
+    fs.mkdirSync(job.outputDir, { recursive: true });
+    fs.writeFileSync(path.join(job.outputDir, job.file), svg);
+    for (const [name, content] of Object.entries(job.extraFiles)) {
+      fs.writeFileSync(path.join(job.outputDir, name), content);
+    }
+    plan.cache[job.file] = job.hash;
+    stats.rendered++;
+    plan.stats.rendered++;
+    if (verbose) console.log(`  Rendered: ${job.file}`);
+  });
 
-  const outputDir = path.join(skillDir, 'diagrams');
-  if (!fs.existsSync(outputDir)) {
-    fs.mkdirSync(outputDir);
+  for (const plan of plans) {
+    if (plan.jobs.some(job => !job.cached)) {
+      fs.mkdirSync(plan.outputDir, { recursive: true });
+      saveCache(plan.outputDir, plan.cache);
+    }
   }
+  return stats;
+}
 
-  if (combine) {
-    // Combine all graphs into one
-    const combined = combineGraphs(blocks, skillName);
-    const svg = renderToSvg(combined);
-    if (svg) {
-      const outputPath = path.join(outputDir, `${skillName}_combined.svg`);
-      fs.writeFileSync(outputPath, svg);
-      console.log(`  Rendered: ${skillName}_combined.svg`);
+function usage() {
+  console.error('Usage: render-graphs.js <skill-directory> [--combine] [--jobs N] [--force]');
+  console.error('       render-graphs.js --all [skills-root] [--combine] [--jobs N] [--force]');
+  console.error('');
+  console.error('Options:');
+  console.error('  --combine    Combine all diagrams into one SVG');
+  console.error('  --all        Render every skill under skills-root (default: parent of this directory)');
+  console.error('  --jobs N     Maximum concurrent dot processes (default: CPU count)');
+  console.error('  --force      Ignore the render cache');
+  console.error('');
+  console.error('Example:');
+  console.error('  ./render-graphs.js ../subagent-driven-development');
+  console.error('  ./render-graphs.js ../subagent-driven-development --combine');
+  console.error('  ./render-graphs.js --all');
+  process.exit(1);
+}
 
-      // Also write the dot source for debugging
-      const dotPath = path.join(outputDir, `${skillName}_combined.dot`);
-      fs.writeFileSync(dotPath, combined);
-      console.log(`  Source: ${skillName}_combined.dot`);
-    } else {
-      console.error('  Failed to render combined diagram');
+async function main() {
+  const args = process.argv.slice(2);
+  const combine = args.includes('--combine');
+  const all = args.includes('--all');
+  const force = args.includes('--force');
+  let jobsLimit = os.cpus().length || 1;
+  const positional = [];
+
+  for (let i = 0; i < args.length; i++) {
+    if (args[i] === '--jobs') {
+      jobsLimit = parseInt(args[++i], 10);
+      if (!(jobsLimit > 0)) usage();
+    } else if (!args[i].startsWith('--')) {
+      positional.push(args[i]);
     }
-  } else {
-    // Render each separately
-    for (const block of blocks) {
-      const svg = renderToSvg(block.content);
-      if (svg) {
-        const outputPath = path.join(outputDir, `${block.name}.svg`);
-        fs.writeFileSync(outputPath, svg);
-        console.log(`  Rendered: ${block.name}.svg`);
-      } else {
-        console.error(`  Failed: ${block.name}`);
-      }
+  }
+
+  const started = Date.now();
+
+  if (all) {
+    const root = path.resolve(positional[0] || path.join(__dirname, '..'));
+    const skillDirs = fs.readdirSync(root, { withFileTypes: true })
+      .filter(e => e.isDirectory() && !e.name.startsWith('.'))
+      .map(e => path.join(root, e.name))
+      .filter(dir => fs.existsSync(path.join(dir, 'SKILL.md')))
+      .sort();
+    const plans = skillDirs.map(dir => planSkill(dir, combine, force)).filter(Boolean);
+    if (plans.length === 0) {
+      console.log('No ```dot blocks found under', root);
+      process.exit(0);
+    }
+
+    const stats = await renderPlans(plans, jobsLimit, false);
+    for (const plan of plans) {
+      const { rendered, cached, failed } = plan.stats;
+      console.log(`  ${plan.skill}: ${plan.blocks} diagram(s), ${rendered} rendered, ${cached} cached${failed ? `, ${failed} failed` : ''}`);
     }
+    console.log(`\n${plans.length} skill(s): ${stats.rendered} rendered, ${stats.cached} cached, ${stats.failed} failed (${Date.now() - started} ms)`);
+    process.exit(stats.failed ? 1 : 0);
+  }
+
+  if (!positional[0]) usage();
+
+  const skillDir = path.resolve(positional[0]);
+  const skillFile = path.join(skillDir, 'SKILL.md');
+
+  if (!fs.existsSync(skillFile)) {
+    console.error(`Error: ${skillFile} not found`);
+    process.exit(1);
+  }
+
+  const plan = planSkill(skillDir, combine, force);
+  if (!plan) {
+    console.log('No ```dot blocks found in', skillFile);
+    process.exit(0);
   }
 
-  console.log(`\nOutput: ${outputDir}/`);
+  console.log(`Found ${plan.blocks} diagram(s) in ${path.basename(skillDir)}/SKILL.md`);
+  const stats = await renderPlans([plan], jobsLimit, true);
+  console.log(`\n${stats.rendered} rendered, ${stats.cached} cached, ${stats.failed} failed (${Date.now() - started} ms)`);
+  console.log(`Output: ${plan.outputDir}/`);
+  process.exit(stats.failed ? 1 : 0);
 }
 
 main();
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Generate Bean / DAO / Service classes for many tables in one run.
+
+Input is either CREATE TABLE DDL (one or more statements per file, e.g. `SHOW CREATE
+TABLE` or `mysqldump --no-data` output) or the column listing printed by
+`--print-schema-query`, run through wh-drg-mysql's `mysql_query.py`. Every table is
+parsed into a typed model and rendered from `references/*-template.java`, following
+the annotation rules in SKILL.md.
+
+Tables are rendered in a thread pool, and a file is only rewritten when its content
+changed (ignoring the `@date` line). A manifest in the output root records a hash of
+each table's model and options, so unchanged tables are skipped without rendering.
+
+Usage:
+  python generate_beans.py --ddl tables.sql --package com.whxx.drg.dip --out src/main/java
+  python mysql_query.py --sql "$(python generate_beans.py --print-schema-query)" > columns.tsv
+  python generate_beans.py --columns-tsv columns.tsv --package com.whxx.drg.dip --out src/main/java [--table t1 t2]
+"""
+import argparse
+import csv
+import datetime as dt
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+REFERENCES_DIR = Path(__file__).resolve().parent.parent / "references"
+TEMPLATE_PACKAGE = "com.whxx.drg.dip"
+MANIFEST_FILE_NAME = ".sql-bean-generator.json"
+GENERATOR_VERSION = 1
+
+# SKILL.md "数据类型映射", extended to the other MySQL types
+JAVA_TYPES = {
+    "varchar": "String",
+    "char": "String",
+    "text": "String",
+    "tinytext": "String",
+    "mediumtext": "String",
+    "longtext": "String",
+    "json": "String",
+    "enum": "String",
+    "set": "String",
+    "tinyint": "Integer",
+    "smallint": "Integer",
+    "mediumint": "Integer",
+    "int": "Integer",
+    "integer": "Integer",
+    "bigint": "Long",
+    "decimal": "BigDecimal",
+    "numeric": "BigDecimal",
+    "float": "Float",
+    "double": "Double",
+    "bit": "Boolean",
+    "datetime": "LocalDateTime",
+    "timestamp": "LocalDateTime",
+    "date": "LocalDate",
+    "time": "LocalTime",
+    "year": "Integer",
+    "blob": "byte[]",
+    "longblob": "byte[]",
+    "mediumblob": "byte[]",
+    "binary": "byte[]",
+    "varbinary": "byte[]",
+}
+EXTRA_IMPORTS = {"LocalDate": "java.time.LocalDate", "LocalTime": "java.time.LocalTime"}
+STRING_TYPES = {"varchar", "char"}
+
+# Columns the bean template always declares (SKILL.md "标准字段")
+STANDARD_COLUMNS = {"create_time", "create_by", "update_time", "update_by", "remark", "del"}
+
+SCHEMA_QUERY = """SELECT c.TABLE_NAME, t.TABLE_COMMENT, c.COLUMN_NAME, c.DATA_TYPE, c.COLUMN_TYPE,
+  c.CHARACTER_MAXIMUM_LENGTH, c.IS_NULLABLE, c.COLUMN_KEY, c.EXTRA, c.COLUMN_COMMENT
+FROM information_schema.COLUMNS c
+JOIN information_schema.TABLES t ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME
+WHERE c.TABLE_SCHEMA = DATABASE() AND t.TABLE_TYPE = 'BASE TABLE'
+ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION;"""
+
+
+@dataclass
+class Column:
+    name: str
+    data_type: str
+    length: int | None = None
+    nullable: bool = True
+    comment: str = ""
+    primary: bool = False
+    auto_increment: bool = False
+
+    @property
+    def java_type(self) -> str:
+        return JAVA_TYPES.get(self.data_type, "String")
+
+    @property
+    def label(self) -> str:
+        return self.comment or self.name
+
+
+@dataclass
+class Table:
+    name: str
+    comment: str = ""
+    columns: list[Column] = field(default_factory=list)
+
+    def fingerprint(self) -> str:
+        return hashlib.sha256(json.dumps(asdict(self), ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+# ---------------------------------------------------------------- DDL parsing
+
+CREATE_RE = re.compile(r"CREATE\s+(?:TEMPORARY\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?((?:`[^`]+`|\w+)(?:\s*\.\s*(?:`[^`]+`|\w+))?)\s*\(", re.I)
+TYPE_RE = re.compile(r"(\w+)\s*(?:\(([^)]*)\))?", re.S)
+KEY_PREFIXES = ("PRIMARY", "KEY", "INDEX", "UNIQUE", "CONSTRAINT", "FULLTEXT", "SPATIAL", "FOREIGN", "CHECK")
+
+
+def _unquote_name(name: str) -> str:
+    return name.split(".")[-1].strip().strip("`").strip()
+
+
+def _read_string(text: str, i: int) -> tuple[str, int]:
+    """Read a quoted SQL string starting at text[i]; returns (value, index after the closing quote)."""
+    quote = text[i]
+    out = []
+    i += 1
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            nxt = text[i + 1]
+            out.append({"n": "\n", "t": "\t", "r": "\r", "0": "\0"}.get(nxt, nxt))
+            i += 2
+            continue
+        if ch == quote:
+            if i + 1 < len(text) and text[i + 1] == quote:
+                out.append(quote)
+                i += 2
+                continue
+            return "".join(out), i + 1
+        out.append(ch)
+        i += 1
+    raise ValueError("unterminated string literal")
+
+
+def _matching_paren(text: str, start: int) -> int:
+    """Index of the `)` closing the `(` at text[start], skipping quoted strings."""
+    depth = 0
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if ch in "'\"":
+            _, i = _read_string(text, i)
+            continue
+        if ch == "`":
+            i = text.index("`", i + 1) + 1
+            continue
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError("unbalanced parentheses in CREATE TABLE")
+
+
+def _statement_end(text: str, i: int) -> int:
+    """Index of the `;` ending the statement (or len(text)), skipping quoted strings."""
+    while i < len(text):
+        ch = text[i]
+        if ch in "'\"":
+            _, i = _read_string(text, i)
+            continue
+        if ch == ";":
+            return i
+        i += 1
+    return i
+
+
+def _split_top_level(body: str) -> list[str]:
+    parts, depth, start, i = [], 0, 0, 0
+    while i < len(body):
+        ch = body[i]
+        if ch in "'\"":
+            _, i = _read_string(body, i)
+            continue
+        if ch == "`":
+            i = body.index("`", i + 1) + 1
+            continue
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            parts.append(body[start:i].strip())
+            start = i + 1
+        i += 1
+    parts.append(body[start:].strip())
+    return [p for p in parts if p]
+
+
+def _comment_of(text: str) -> str:
+    """Value of a `COMMENT 'x'` / `COMMENT = 'x'` clause, or ''."""
+    i = 0
+    while True:
+        m = re.compile(r"\bCOMMENT\s*=?\s*(['\"])", re.I).search(text, i)
+        if not m:
+            return ""
+        # Make sure the match is not inside an earlier string (e.g. a DEFAULT value)
+        before = text[: m.start()]
+        if before.count("'") % 2 == 0:
+            return _read_string(text, m.start(1))[0]
+        i = m.end()
+
+
+def _parse_column(item: str) -> Column:
+    if item.startswith("`"):
+        end = item.index("`", 1)
+        name, rest = item[1:end], item[end + 1 :].strip()
+    else:
+        name, _, rest = item.partition(" ")
+        rest = rest.strip()
+    m = TYPE_RE.match(rest)
+    if not m:
+        raise ValueError(f"cannot parse column definition: {item}")
+    data_type = m.group(1).lower()
+    args = (m.group(2) or "").split(",")
+    length = int(args[0]) if args[0].strip().isdigit() else None
+    upper = rest[m.end() :].upper()
+    # Only look at the part outside quoted strings for keywords
+    keywords = re.sub(r"'(?:[^'\\]|\\.|'')*'", "''", upper)
+    return Column(
+        name=name,
+        data_type=data_type,
+        length=length,
+        nullable="NOT NULL" not in keywords,
+        comment=_comment_of(rest[m.end() :]),
+        primary="PRIMARY KEY" in keywords,
+        auto_increment="AUTO_INCREMENT" in keywords,
+    )
+
+
+def parse_ddl(text: str) -> list[Table]:
+    tables = []
+    pos = 0
+    while True:
+        m = CREATE_RE.search(text, pos)
+        if not m:
+            break
+        open_idx = m.end() - 1
+        close_idx = _matching_paren(text, open_idx)
+        end = _statement_end(text, close_idx + 1)
+        table = Table(name=_unquote_name(m.group(1)), comment=_comment_of(text[close_idx + 1 : end]))
+        primary: list[str] = []
+        for item in _split_top_level(text[open_idx + 1 : close_idx]):
+            head = item.split(None, 1)[0].upper()
+            if head in KEY_PREFIXES:
+                pk = re.match(r"(?:CONSTRAINT\s+\S+\s+)?PRIMARY\s+KEY\s*(?:\w+\s*)?\(([^)]*)\)", item, re.I)
+                if pk:
+                    primary = [_unquote_name(c.split("(")[0]) for c in pk.group(1).split(",")]
+                continue
+            table.columns.append(_parse_column(item))
+        for column in table.columns:
+            column.primary = column.primary or column.name in primary
+        tables.append(table)
+        pos = end
+    return tables
+
+
+def parse_columns_tsv(text: str) -> list[Table]:
+    """Tab-separated output of SCHEMA_QUERY (mysql --batch, with header)."""
+    tables: dict[str, Table] = {}
+    reader = csv.DictReader(text.splitlines(), delimiter="\t", quoting=csv.QUOTE_NONE)
+    for row in reader:
+        row = {k.upper(): (v if v != "NULL" else "") for k, v in row.items() if k}
+        name = row["TABLE_NAME"]
+        table = tables.setdefault(name, Table(name=name, comment=row.get("TABLE_COMMENT", "")))
+        length = row.get("CHARACTER_MAXIMUM_LENGTH", "")
+        table.columns.append(
+            Column(
+                name=row["COLUMN_NAME"],
+                data_type=row["DATA_TYPE"].lower(),
+                length=int(length) if length.isdigit() else None,
+                nullable=row.get("IS_NULLABLE", "YES").upper() == "YES",
+                comment=row.get("COLUMN_COMMENT", ""),
+                primary=row.get("COLUMN_KEY", "").upper() == "PRI",
+                auto_increment="auto_increment" in row.get("EXTRA", "").lower(),
+            )
+        )
+    return list(tables.values())
+
+
+# ---------------------------------------------------------------- rendering
+
+
+def class_name(table: str, strip_prefix: str = "") -> str:
+    if strip_prefix and table.startswith(strip_prefix):
+        table = table[len(strip_prefix) :]
+    return "".join(part[:1].upper() + part[1:] for part in re.split(r"[_\W]+", table) if part)
+
+
+def field_name(column: str) -> str:
+    name = class_name(column)
+    return name[:1].lower() + name[1:] if name else column
+
+
+def _java_str(text: str) -> str:
+    return " ".join(text.split()).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _doc(text: str) -> str:
+    return " ".join(text.split()).replace("*/", "* /")
+
+
+@dataclass(frozen=True)
+class Templates:
+    bean_head: str
+    bean_tail: str
+    dao: str
+    service: str
+
+    @classmethod
+    def load(cls, references: Path = REFERENCES_DIR) -> "Templates":
+        bean = (references / "bean-template.java").read_text(encoding="utf-8")
+        # Header up to serialVersionUID, then the example fields, then the standard fields block
+        head_end = bean.index("\n", bean.index("serialVersionUID")) + 1
+        tail_start = bean.rindex("    /**", 0, bean.index("* 创建时间"))
+        return cls(
+            bean_head=bean[:head_end],
+            bean_tail=bean[tail_start:],
+            dao=(references / "dao-template.java").read_text(encoding="utf-8"),
+            service=(references / "service-template.java").read_text(encoding="utf-8"),
+        )
+
+    def fingerprint(self) -> str:
+        return hashlib.sha256("\0".join((self.bean_head, self.bean_tail, self.dao, self.service)).encode("utf-8")).hexdigest()
+
+
+def _field_block(column: Column) -> str:
+    label = _java_str(column.label)
+    lines = ["    /**", f"     * {_doc(column.label)}", "     */"]
+    if column.primary:
+        id_type = "AUTO" if column.auto_increment else "ASSIGN_ID"
+        lines.append(f'    @TableId(value = "{column.name}", type = IdType.{id_type})')
+    else:
+        lines.append(f'    @TableField(value = "{column.name}")')
+    lines.append(f'    @ApiModelProperty(value = "{label}")')
+    if column.data_type in STRING_TYPES and column.length:
+        lines.append(f'    @Size(max = {column.length}, message = "{label}最大长度要小于 {column.length}")')
+    if not column.nullable and not column.auto_increment:
+        if column.java_type == "String":
+            lines.append(f'    @NotBlank(message = "{label}不能为空")')
+        else:
+            lines.append(f'    @NotNull(message = "{label}不能为null")')
+    lines.append(f"    private {column.java_type} {field_name(column.name)};")
+    return "\n".join(lines) + "\n"
+
+
+def render_table(table: Table, templates: Templates, package: str, strip_prefix: str, author: str, date: str) -> dict[str, str]:
+    """{relative path: content} for the table's Bean, DAO and Service."""
+    bean = class_name(table.name, strip_prefix)
+    dao, service = f"{bean}Dao", f"{bean}Service"
+    description = _java_str(_doc(table.comment or table.name))
+    values = {
+        "{ClassName}": bean,
+        "{BeanClassName}": bean,
+        "{DaoClassName}": dao,
+        "{ServiceClassName}": service,
+        "{表描述}": description,
+        "{表名}": table.name,
+        "{生成日期}": date,
+        TEMPLATE_PACKAGE: package,
+    }
+
+    def fill(text: str) -> str:
+        text = re.sub(r"@author(\s+)wcs", lambda m: f"@author{m.group(1)}{author}", text)
+        for key, value in values.items():
+            text = text.replace(key, value)
+        return text
+
+    head = fill(templates.bean_head)
+    extra = sorted({EXTRA_IMPORTS[c.java_type] for c in table.columns if c.java_type in EXTRA_IMPORTS})
+    if extra:
+        anchor = "import java.time.LocalDateTime;\n"
+        head = head.replace(anchor, anchor + "".join(f"import {imp};\n" for imp in extra), 1)
+    fields = [_field_block(c) for c in table.columns if c.name not in STANDARD_COLUMNS]
+    bean_source = head + "\n" + "\n".join(fields) + ("\n" if fields else "") + fill(templates.bean_tail)
+
+    base = package.replace(".", "/")
+    return {
+        f"{base}/bean/{bean}.java": bean_source,
+        f"{base}/dao/{dao}.java": fill(templates.dao),
+        f"{base}/service/{service}.java": fill(templates.service),
+    }
+
+
+DATE_LINE_RE = re.compile(r"^\s*\*\s*@date.*$", re.M)
+
+
+def _same_except_date(old: str, new: str) -> bool:
+    return DATE_LINE_RE.sub("", old) == DATE_LINE_RE.sub("", new)
+
+
+def write_if_changed(path: Path, content: str) -> str:
+    """'created', 'updated' or 'unchanged'. The @date line alone never triggers a rewrite."""
+    try:
+        old = path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        old = None
+    if old is not None and _same_except_date(old, content):
+        return "unchanged"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(content, encoding="utf-8")
+    os.replace(tmp, path)
+    return "updated" if old is not None else "created"
+
+
+def generate(
+    tables: list[Table],
+    out_dir: Path,
+    package: str,
+    *,
+    strip_prefix: str = "",
+    author: str = "wcs",
+    workers: int = 8,
+    dry_run: bool = False,
+    use_manifest: bool = True,
+) -> dict[str, object]:
+    started = time.perf_counter()
+    templates = Templates.load()
+    date = dt.date.today().isoformat()
+    options = f"{GENERATOR_VERSION}\0{package}\0{strip_prefix}\0{author}\0{templates.fingerprint()}"
+    manifest_path = out_dir / MANIFEST_FILE_NAME
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if use_manifest else {}
+    except (OSError, ValueError):
+        manifest = {}
+
+    def one(table: Table) -> tuple[str, str, dict[str, str]]:
+        key = hashlib.sha256(f"{options}\0{table.fingerprint()}".encode("utf-8")).hexdigest()
+        entry = manifest.get(table.name)
+        if entry and entry.get("key") == key and all((out_dir / rel).exists() for rel in entry.get("files", [])):
+            return table.name, key, {rel: "cached" for rel in entry["files"]}
+        files = render_table(table, templates, package, strip_prefix, author, date)
+        if dry_run:
+            statuses = {}
+            for rel, content in files.items():
+                path = out_dir / rel
+                old = path.read_text(encoding="utf-8") if path.exists() else None
+                statuses[rel] = "unchanged" if old is not None and _same_except_date(old, content) else ("update" if old else "create")
+            return table.name, key, statuses
+        return table.name, key, {rel: write_if_changed(out_dir / rel, content) for rel, content in files.items()}
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        results = list(pool.map(one, tables))
+
+    counts: dict[str, int] = {}
+    changed_files = []
+    for name, key, statuses in results:
+        for rel, status in statuses.items():
+            counts[status] = counts.get(status, 0) + 1
+            if status in ("created", "updated", "create", "update"):
+                changed_files.append(rel)
+        if not dry_run:
+            manifest[name] = {"key": key, "files": sorted(statuses)}
+    if not dry_run and use_manifest:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        tmp = manifest_path.with_name(f".{manifest_path.name}.tmp")
+        tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, manifest_path)
+    return {
+        "tables": len(tables),
+        "files": counts,
+        "changed": sorted(changed_files),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="generate_beans.py", description="Generate Bean/DAO/Service classes from table definitions.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--ddl", nargs="+", help="SQL files with CREATE TABLE statements.")
+    source.add_argument("--columns-tsv", help="Output of --print-schema-query from mysql_query.py (tab separated, with header).")
+    source.add_argument("--print-schema-query", action="store_true", help="Print the information_schema query and exit.")
+    parser.add_argument("--package", help="Base Java package, e.g. com.whxx.drg.dip.")
+    parser.add_argument("--out", default=".", help="Source root the package directories are created under (default: .).")
+    parser.add_argument("--table", nargs="+", help="Only these tables.")
+    parser.add_argument("--strip-prefix", default="", help="Table name prefix left out of class names, e.g. t_.")
+    parser.add_argument("--author", default="wcs")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing.")
+    parser.add_argument("--force", action="store_true", help="Ignore the manifest and re-render every table.")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.print_schema_query:
+        print(SCHEMA_QUERY)
+        return 0
+    if not args.package:
+        parser.error("--package is required")
+
+    try:
+        if args.ddl:
+            tables = [t for path in args.ddl for t in parse_ddl(Path(path).read_text(encoding="utf-8"))]
+        else:
+            tables = parse_columns_tsv(Path(args.columns_tsv).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"解析失败：{e}", file=sys.stderr)
+        return 2
+    if args.table:
+        wanted = set(args.table)
+        missing = wanted - {t.name for t in tables}
+        if missing:
+            print(f"未找到表：{', '.join(sorted(missing))}", file=sys.stderr)
+            return 2
+        tables = [t for t in tables if t.name in wanted]
+    if not tables:
+        print("没有找到 CREATE TABLE 语句或列信息。", file=sys.stderr)
+        return 2
+
+    report = generate(
+        tables,
+        Path(args.out),
+        args.package,
+        strip_prefix=args.strip_prefix,
+        author=args.author,
+        workers=args.workers,
+        dry_run=args.dry_run,
+        use_manifest=not args.force,
+    )
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for rel in report["changed"]:
+            print(rel)
+        summary = ", ".join(f"{n} {status}" for status, n in sorted(report["files"].items()))
+        print(f"{report['tables']} tables: {summary} ({report['elapsed_ms']} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
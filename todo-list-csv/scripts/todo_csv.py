@@ -4,19 +4,24 @@ CSV TODO tracker for the `todo-list-csv` skill.
 
 Create a "{任务名} TO DO list.csv" file in the project root, mark rows DONE as work completes,
 and delete the file when everything is finished.
+
+Taskmaster layouts are understood too (LITE `id,task,status,completed_at,notes` and the
+FULL `.codex-tasks/<task-name>/TODO.csv` with validation gates); `verify` runs the
+FULL-mode `validation_command`s and `resume` prints a bounded recovery brief from a
+summary file that each write keeps up to date.
 """
 
 from __future__ import annotations
 
+# Only what every command needs is imported here; `status` and friends run close to
+# bare-interpreter startup. subprocess, tempfile, json, hashlib and the executor are
+# imported inside the functions that use them.
 import argparse
 import csv
 import datetime as dt
-import json
 import os
 import re
-import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
 
@@ -24,12 +29,138 @@ CSV_HEADER = ["id", "item", "status", "done_at", "notes"]
 STATUS_TODO = "TODO"
 STATUS_IN_PROGRESS = "IN_PROGRESS"
 STATUS_DONE = "DONE"
+STATUS_FAILED = "FAILED"
+
+FULL_CSV_NAME = "TODO.csv"
+PROGRESS_FILE_NAME = "PROGRESS.md"
+VERIFY_TIMEOUT_SECONDS = 600.0
+VERIFY_CACHE_MAX_ENTRIES = 500
+
+SPEC_FILE_NAME = "SPEC.md"
+RESUME_STATE_VERSION = 1
+RESUME_MAX_DECISIONS = 20
+RESUME_MAX_TRANSITIONS = 20
+RESUME_MAX_FAILING = 10
+RESUME_LINE_CHARS = 200
+RESUME_BRIEF_MAX_CHARS = 4000
+RECOVERY_SCAN_BYTES = 16 * 1024
+PROGRESS_ANCHOR_BYTES = 64
+# Unfilled PROGRESS_TEMPLATE.md values such as `<title>` or `#N`
+TEMPLATE_PLACEHOLDER_RE = re.compile(r"<[^<>\n]+>|#N\b|IN_PROGRESS \| BLOCKED")
+
+
+class Schema:
+    """
+    A CSV layout. Rows are always handled with the canonical keys of `CSV_HEADER`
+    (plus the FULL-only verification columns); `item_col` / `done_col` name the
+    columns that hold `item` / `done_at` in the file itself.
+
+    A plain slotted class rather than a dataclass: `dataclasses` drags in `inspect`,
+    which costs as much to import as argparse. The three layouts below are the
+    only instances and are compared by identity.
+    """
+
+    __slots__ = ("name", "header", "item_col", "done_col", "timestamp_format", "statuses")
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        header: tuple[str, ...],
+        item_col: str,
+        done_col: str,
+        timestamp_format: str | None,  # None = ISO 8601 with offset
+        statuses: frozenset[str],
+    ) -> None:
+        self.name = name
+        self.header = header
+        self.item_col = item_col
+        self.done_col = done_col
+        self.timestamp_format = timestamp_format
+        self.statuses = statuses
+
+    def __repr__(self) -> str:
+        return f"Schema(name={self.name!r})"
+
+    @property
+    def has_validation(self) -> bool:
+        return "validation_command" in self.header
+
+    def from_file(self, row: dict[str, str]) -> dict[str, str]:
+        out = {k: row.get(k) or "" for k in self.header}
+        out["item"] = out.pop(self.item_col) if self.item_col != "item" else out["item"]
+        out["done_at"] = out.pop(self.done_col) if self.done_col != "done_at" else out["done_at"]
+        return out
+
+    def to_file(self, row: dict[str, str]) -> dict[str, str]:
+        canonical = {self.item_col: "item", self.done_col: "done_at"}
+        out = {col: row.get(canonical.get(col, col), "") for col in self.header}
+        if "retry_count" in out and not out["retry_count"]:
+            out["retry_count"] = "0"
+        return out
+
+
+# `todo-list-csv` layout ("{任务名} TO DO list.csv" in the project root)
+LITE_SCHEMA = Schema(
+    name="lite",
+    header=tuple(CSV_HEADER),
+    item_col="item",
+    done_col="done_at",
+    timestamp_format=None,
+    statuses=frozenset({STATUS_TODO, STATUS_IN_PROGRESS, STATUS_DONE}),
+)
+# taskmaster LITE mode
+TASKMASTER_LITE_SCHEMA = Schema(
+    name="taskmaster-lite",
+    header=("id", "task", "status", "completed_at", "notes"),
+    item_col="task",
+    done_col="completed_at",
+    timestamp_format="%Y-%m-%d %H:%M",
+    statuses=frozenset({STATUS_TODO, STATUS_IN_PROGRESS, STATUS_DONE}),
+)
+# taskmaster FULL mode (.codex-tasks/<task-name>/TODO.csv)
+FULL_SCHEMA = Schema(
+    name="full",
+    header=(
+        "id",
+        "task",
+        "status",
+        "acceptance_criteria",
+        "validation_command",
+        "completed_at",
+        "retry_count",
+        "notes",
+    ),
+    item_col="task",
+    done_col="completed_at",
+    timestamp_format="%Y-%m-%d %H:%M",
+    statuses=frozenset({STATUS_TODO, STATUS_IN_PROGRESS, STATUS_DONE, STATUS_FAILED}),
+)
+SCHEMAS = {s.name: s for s in (LITE_SCHEMA, TASKMASTER_LITE_SCHEMA, FULL_SCHEMA)}
 
 
 def _now_iso() -> str:
     return dt.datetime.now().astimezone().replace(microsecond=0).isoformat()
 
 
+def _timestamp(schema: Schema) -> str:
+    if schema.timestamp_format is None:
+        return _now_iso()
+    return dt.datetime.now().strftime(schema.timestamp_format)
+
+
+def _csv_path(file: str, *, task_dir: bool = False) -> Path:
+    """
+    `--file` may point at the CSV itself or at an existing taskmaster task directory.
+    Any other path is used as given; `task_dir` (init of a FULL task) also maps a
+    not-yet-created `.codex-tasks/<task-name>` path without a `.csv` suffix to its TODO.csv.
+    """
+    path = Path(file).resolve()
+    if path.is_dir() or (task_dir and not path.exists() and path.suffix.lower() != ".csv"):
+        return path / FULL_CSV_NAME
+    return path
+
+
 def _sanitize_title(title: str, *, max_len: int = 80) -> str:
     cleaned = title.strip()
     cleaned = cleaned.replace(os.sep, "-")
@@ -44,6 +175,8 @@ def _sanitize_title(title: str, *, max_len: int = 80) -> str:
 
 
 def _git_root(cwd: Path) -> Path | None:
+    import subprocess
+
     try:
         out = subprocess.check_output(
             ["git", "rev-parse", "--show-toplevel"],
@@ -117,17 +250,25 @@ def _ensure_single_in_progress(
     return rows, changed
 
 
-def _read_rows(path: Path) -> list[dict[str, str]]:
+def _read_table(path: Path) -> tuple[Schema, list[dict[str, str]]]:
+    """Read a CSV in any known layout; rows come back with canonical keys."""
     with path.open("r", encoding="utf-8", newline="") as f:
         reader = csv.DictReader(f)
-        if reader.fieldnames != CSV_HEADER:
-            raise ValueError(
-                f"Unexpected CSV header in {path}: {reader.fieldnames!r} (expected {CSV_HEADER!r})"
-            )
-        return [dict(row) for row in reader]
+        header = tuple(reader.fieldnames or ())
+        schema = next((s for s in SCHEMAS.values() if s.header == header), None)
+        if schema is None:
+            expected = " or ".join(repr(list(s.header)) for s in SCHEMAS.values())
+            raise ValueError(f"Unexpected CSV header in {path}: {list(header)!r} (expected {expected})")
+        return schema, [schema.from_file(row) for row in reader]
+
+
+def _read_rows(path: Path) -> list[dict[str, str]]:
+    return _read_table(path)[1]
 
 
-def _atomic_write(path: Path, rows: list[dict[str, str]]) -> None:
+def _atomic_write(path: Path, rows: list[dict[str, str]], schema: Schema = LITE_SCHEMA) -> None:
+    import tempfile
+
     path.parent.mkdir(parents=True, exist_ok=True)
     with tempfile.NamedTemporaryFile(
         "w",
@@ -139,11 +280,23 @@ def _atomic_write(path: Path, rows: list[dict[str, str]]) -> None:
         suffix=".tmp",
     ) as tmp:
         tmp_path = Path(tmp.name)
-        writer = csv.DictWriter(tmp, fieldnames=CSV_HEADER)
+        writer = csv.DictWriter(tmp, fieldnames=list(schema.header))
         writer.writeheader()
         for row in rows:
-            writer.writerow({k: row.get(k, "") for k in CSV_HEADER})
+            writer.writerow(schema.to_file(row))
     tmp_path.replace(path)
+    _record_transition(path, rows, schema)
+
+
+def _write_json_atomic(path: Path, data: object) -> None:
+    import json
+    import tempfile
+
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", delete=False, dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp"
+    ) as tmp:
+        json.dump(data, tmp, ensure_ascii=False, indent=1)
+    Path(tmp.name).replace(path)
 
 
 def cmd_path(args: argparse.Namespace) -> int:
@@ -154,38 +307,53 @@ def cmd_path(args: argparse.Namespace) -> int:
 
 def cmd_init(args: argparse.Namespace) -> int:
     root = _project_root(args.root)
-    path = Path(args.file).resolve() if args.file else _todo_csv_path(title=args.title, root=root)
+    schema = SCHEMAS[args.schema]
+    if args.file:
+        path = _csv_path(args.file, task_dir=schema is FULL_SCHEMA)
+    else:
+        path = _todo_csv_path(title=args.title, root=root)
     if path.exists() and not args.force:
         print(f"Refusing to overwrite existing file: {path}", file=sys.stderr)
         return 2
+    if (args.acceptance or args.validate) and not schema.has_validation:
+        print(f"--acceptance/--validate need the full schema (got {schema.name})", file=sys.stderr)
+        return 2
 
     rows: list[dict[str, str]] = []
     for idx, item in enumerate(args.item, start=1):
         status = STATUS_TODO
         if idx == 1 and not args.no_in_progress:
             status = STATUS_IN_PROGRESS
-        rows.append(
-            {
-                "id": str(idx),
-                "item": item.strip(),
-                "status": status,
-                "done_at": "",
-                "notes": "",
-            }
-        )
+        rows.append(_new_row(idx, item, status, args))
 
-    _atomic_write(path, rows)
+    _atomic_write(path, rows, schema)
     print(path)
     return 0
 
 
+def _new_row(item_id: int, item: str, status: str, args: argparse.Namespace) -> dict[str, str]:
+    return {
+        "id": str(item_id),
+        "item": item.strip(),
+        "status": status,
+        "done_at": "",
+        "notes": "",
+        "acceptance_criteria": args.acceptance or "",
+        "validation_command": args.validate or "",
+        "retry_count": "0",
+    }
+
+
 def cmd_add(args: argparse.Namespace) -> int:
-    path = Path(args.file).resolve()
+    path = _csv_path(args.file)
     if not path.exists():
         print(f"CSV not found: {path}", file=sys.stderr)
         return 2
 
-    rows = _read_rows(path)
+    schema, rows = _read_table(path)
+    if (args.acceptance or args.validate) and not schema.has_validation:
+        print(f"--acceptance/--validate need the full schema (got {schema.name})", file=sys.stderr)
+        return 2
     next_id = 1
     for row in rows:
         try:
@@ -194,18 +362,10 @@ def cmd_add(args: argparse.Namespace) -> int:
             pass
 
     for item in args.item:
-        rows.append(
-            {
-                "id": str(next_id),
-                "item": item.strip(),
-                "status": STATUS_TODO,
-                "done_at": "",
-                "notes": "",
-            }
-        )
+        rows.append(_new_row(next_id, item, STATUS_TODO, args))
         next_id += 1
 
-    _atomic_write(path, rows)
+    _atomic_write(path, rows, schema)
     return 0
 
 
@@ -221,7 +381,7 @@ def _mark(
         print(f"CSV not found: {path}", file=sys.stderr)
         return 2
 
-    rows = _read_rows(path)
+    schema, rows = _read_table(path)
     updated = False
     for row in rows:
         if row.get("id") == str(item_id):
@@ -234,7 +394,7 @@ def _mark(
                 print(f"Allowed current status: {sorted(require_current_status)}", file=sys.stderr)
                 return 2
             row["status"] = status
-            row["done_at"] = _now_iso() if status == STATUS_DONE else ""
+            row["done_at"] = _timestamp(schema) if status == STATUS_DONE else ""
             if notes is not None:
                 row["notes"] = notes
             updated = True
@@ -244,14 +404,14 @@ def _mark(
         print(f"id not found: {item_id}", file=sys.stderr)
         return 2
 
-    _atomic_write(path, rows)
+    _atomic_write(path, rows, schema)
     return 0
 
 
 def cmd_done(args: argparse.Namespace) -> int:
-    require = None if args.force else {STATUS_IN_PROGRESS}
+    require = None if args.force else {STATUS_IN_PROGRESS, STATUS_FAILED}
     return _mark(
-        Path(args.file).resolve(),
+        _csv_path(args.file),
         item_id=args.id,
         status=STATUS_DONE,
         notes=args.notes,
@@ -261,7 +421,7 @@ def cmd_done(args: argparse.Namespace) -> int:
 
 def cmd_todo(args: argparse.Namespace) -> int:
     return _mark(
-        Path(args.file).resolve(),
+        _csv_path(args.file),
         item_id=args.id,
         status=STATUS_TODO,
         notes=args.notes,
@@ -270,12 +430,13 @@ def cmd_todo(args: argparse.Namespace) -> int:
 
 
 def cmd_start(args: argparse.Namespace) -> int:
-    path = Path(args.file).resolve()
+    path = _csv_path(args.file)
     if not path.exists():
         print(f"CSV not found: {path}", file=sys.stderr)
         return 2
 
-    rows = _sorted_rows(_read_rows(path))
+    schema, rows = _read_table(path)
+    rows = _sorted_rows(rows)
     target = next((r for r in rows if r.get("id") == str(args.id)), None)
     if target is None:
         print(f"id not found: {args.id}", file=sys.stderr)
@@ -305,25 +466,29 @@ def cmd_start(args: argparse.Namespace) -> int:
         changed = True
 
     if changed:
-        _atomic_write(path, rows)
+        _atomic_write(path, rows, schema)
     return 0
 
 
 def cmd_advance(args: argparse.Namespace) -> int:
-    path = Path(args.file).resolve()
+    path = _csv_path(args.file)
     if not path.exists():
         print(f"CSV not found: {path}", file=sys.stderr)
         return 2
 
-    rows = _sorted_rows(_read_rows(path))
-    current_idx = next((i for i, r in enumerate(rows) if r.get("status") == STATUS_IN_PROGRESS), None)
+    schema, rows = _read_table(path)
+    rows = _sorted_rows(rows)
+    current_idx = next(
+        (i for i, r in enumerate(rows) if r.get("status") in (STATUS_IN_PROGRESS, STATUS_FAILED)),
+        None,
+    )
     if current_idx is None:
         print("No IN_PROGRESS item found; run `start` first.", file=sys.stderr)
         return 2
 
     current = rows[current_idx]
     current["status"] = STATUS_DONE
-    current["done_at"] = _now_iso()
+    current["done_at"] = _timestamp(schema)
     if args.notes is not None:
         current["notes"] = args.notes
 
@@ -332,31 +497,34 @@ def cmd_advance(args: argparse.Namespace) -> int:
         next_row["status"] = STATUS_IN_PROGRESS
         next_row["done_at"] = ""
 
-    _atomic_write(path, rows)
+    _atomic_write(path, rows, schema)
     return 0
 
 
 def _plan_status_for_csv_status(status: str) -> str:
     if status == STATUS_DONE:
         return "completed"
-    if status == STATUS_IN_PROGRESS:
+    if status in (STATUS_IN_PROGRESS, STATUS_FAILED):
         return "in_progress"
     return "pending"
 
 
 def cmd_plan(args: argparse.Namespace) -> int:
-    path = Path(args.file).resolve()
+    import json
+
+    path = _csv_path(args.file)
     if not path.exists():
         print(f"CSV not found: {path}", file=sys.stderr)
         return 2
 
-    rows_original = _sorted_rows(_read_rows(path))
+    schema, rows_original = _read_table(path)
+    rows_original = _sorted_rows(rows_original)
     rows_for_plan, changed = _ensure_single_in_progress(
         [dict(r) for r in rows_original],
         promote_first_todo=args.normalize,
     )
     if args.normalize and changed:
-        _atomic_write(path, rows_for_plan)
+        _atomic_write(path, rows_for_plan, schema)
 
     # Ensure plan output always has a single in_progress when there are pending items.
     if not any(r.get("status") == STATUS_IN_PROGRESS for r in rows_for_plan) and any(
@@ -385,7 +553,7 @@ def cmd_plan(args: argparse.Namespace) -> int:
 
 
 def cmd_status(args: argparse.Namespace) -> int:
-    path = Path(args.file).resolve()
+    path = _csv_path(args.file)
     if not path.exists():
         print(f"CSV not found: {path}", file=sys.stderr)
         return 2
@@ -394,7 +562,10 @@ def cmd_status(args: argparse.Namespace) -> int:
     total = len(rows)
     done = sum(1 for r in rows if r.get("status") == STATUS_DONE)
     in_progress = next((r for r in rows if r.get("status") == STATUS_IN_PROGRESS), None)
+    failed = [r.get("id") for r in rows if r.get("status") == STATUS_FAILED]
     suffix = f" (IN_PROGRESS: {in_progress.get('id')})" if in_progress else ""
+    if failed:
+        suffix += f" (FAILED: {', '.join(failed)})"
     print(f"{done}/{total} DONE{suffix}")
     if args.verbose:
         for r in rows:
@@ -403,23 +574,617 @@ def cmd_status(args: argparse.Namespace) -> int:
 
 
 def cmd_cleanup(args: argparse.Namespace) -> int:
-    path = Path(args.file).resolve()
+    path = _csv_path(args.file)
     if not path.exists():
         return 0
 
     rows = _read_rows(path)
-    if not rows:
-        path.unlink(missing_ok=True)
-        return 0
-
     if all(r.get("status") == STATUS_DONE for r in rows):
-        path.unlink(missing_ok=True)
+        for leftover in (path, _verify_cache_path(path), _resume_state_path(path)):
+            leftover.unlink(missing_ok=True)
         return 0
 
     print("Not all items are DONE; refusing to delete.", file=sys.stderr)
     return 2
 
 
+def _task_root(csv_path: Path) -> Path:
+    """Project root that validation commands run in."""
+    task_dir = csv_path.parent
+    if task_dir.parent.name == ".codex-tasks":
+        return task_dir.parent.parent
+    return _git_root(task_dir) or task_dir
+
+
+def _verify_cache_path(csv_path: Path) -> Path:
+    return csv_path.parent / f".{csv_path.stem}.verify-cache.json"
+
+
+def _tree_state(root: Path, exclude: set[Path]) -> str:
+    """
+    Fingerprint of the working tree a validation command can observe.
+    In git: HEAD plus (path, size, mtime) of every dirty or untracked file, which stays
+    cheap on large repos. Elsewhere: (path, size, mtime) of every non-hidden file.
+    Tracker files (the CSV, PROGRESS.md, the cache) are excluded so bookkeeping
+    writes do not invalidate cached passes.
+    """
+    import hashlib
+    import subprocess
+
+    h = hashlib.sha256()
+    excluded = {str(p) for p in exclude}
+
+    def add_file(path: Path, flags: bytes = b"") -> None:
+        if str(path) in excluded:
+            return
+        h.update(flags)
+        try:
+            st = path.stat()
+            h.update(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8", "surrogateescape"))
+        except OSError:
+            h.update(f"{path}\0missing\n".encode("utf-8", "surrogateescape"))
+
+    toplevel = _git_root(root)
+    if toplevel is not None:
+        # Porcelain paths are relative to the repository top level, not to `root`
+        # (which may be a subdirectory); resolve both sides so `exclude` matches.
+        toplevel = toplevel.resolve()
+        excluded = {str(p.resolve()) for p in exclude}
+        try:
+            head = subprocess.run(
+                ["git", "rev-parse", "HEAD"], cwd=str(root), capture_output=True, text=True
+            ).stdout.strip()
+            status = subprocess.run(
+                ["git", "status", "--porcelain=v1", "-z", "--untracked-files=all", "--", "."],
+                cwd=str(root),
+                capture_output=True,
+                check=True,
+            ).stdout
+        except (OSError, subprocess.CalledProcessError):
+            status = None
+        if status is not None:
+            h.update(f"git:{head}\n".encode("utf-8"))
+            entries = status.split(b"\0")
+            i = 0
+            while i < len(entries):
+                entry = entries[i]
+                i += 1
+                if len(entry) < 4:
+                    continue
+                if entry[:1] in (b"R", b"C"):
+                    i += 1  # the rename/copy source follows as its own entry
+                rel = os.fsdecode(entry[3:])
+                add_file(toplevel / rel, entry[:2])
+            return h.hexdigest()
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for name in sorted(filenames):
+            add_file(Path(dirpath) / name)
+    return h.hexdigest()
+
+
+def _gate_key(command: str, tree_state: str) -> str:
+    import hashlib
+
+    return hashlib.sha256(f"{command}\0{tree_state}".encode("utf-8")).hexdigest()
+
+
+def _load_verify_cache(path: Path) -> dict[str, dict]:
+    import json
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_verify_cache(path: Path, cache: dict[str, dict]) -> None:
+    # Keep the newest entries only
+    items = sorted(cache.items(), key=lambda kv: kv[1].get("passed_at", ""))[-VERIFY_CACHE_MAX_ENTRIES:]
+    _write_json_atomic(path, dict(items))
+
+
+def _run_gate(command: str, *, cwd: Path, timeout: float) -> dict[str, object]:
+    """Run one validation command in its own process group; kill the whole group on timeout."""
+    import signal
+    import subprocess
+    import time
+
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        command,
+        shell=True,
+        cwd=str(cwd),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.DEVNULL,
+        text=True,
+        errors="replace",
+        start_new_session=os.name != "nt",
+    )
+    timed_out = False
+    try:
+        output, _ = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        if os.name != "nt":
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        proc.kill()
+        output, _ = proc.communicate()
+    lines = [line for line in (output or "").splitlines() if line.strip()]
+    return {
+        "passed": not timed_out and proc.returncode == 0,
+        "exit_code": None if timed_out else proc.returncode,
+        "timed_out": timed_out,
+        "duration": round(time.monotonic() - started, 2),
+        "output_tail": lines[-5:],
+        "cached": False,
+    }
+
+
+def _failure_summary(result: dict[str, object], timeout: float) -> str:
+    if result["timed_out"]:
+        return f"timed out after {timeout:g}s"
+    tail = result["output_tail"][-1] if result["output_tail"] else ""
+    summary = f"exit {result['exit_code']}"
+    return f"{summary}: {tail[:200]}" if tail else summary
+
+
+def _append_progress(progress_path: Path, rows_by_id: dict[str, dict[str, str]], results, timeout: float) -> None:
+    stamp = dt.datetime.now().strftime("%Y-%m-%d %H:%M")
+    lines = [f"\n## Validation run: {stamp}\n"]
+    for item_id, command, result in results:
+        row = rows_by_id.get(item_id, {})
+        if result["passed"]:
+            how = "cached" if result["cached"] else f"{result['duration']}s"
+            lines.append(f"- **#{item_id} {row.get('item', '')}**: PASS (`{command}`, {how})")
+        else:
+            lines.append(
+                f"- **#{item_id} {row.get('item', '')}**: FAIL (`{command}`, {_failure_summary(result, timeout)}); "
+                f"status {row.get('status')}, retry_count {row.get('retry_count')}"
+            )
+    with progress_path.open("a", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def cmd_verify(args: argparse.Namespace) -> int:
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = _csv_path(args.file)
+    if not path.exists():
+        print(f"CSV not found: {path}", file=sys.stderr)
+        return 2
+
+    schema, rows = _read_table(path)
+    if not schema.has_validation:
+        print(f"{path} uses the {schema.name} layout, which has no validation_command column.", file=sys.stderr)
+        return 2
+
+    wanted = {str(i) for i in args.id} if args.id else None
+    gates = [
+        (r["id"], r["validation_command"].strip())
+        for r in _sorted_rows(rows)
+        if r.get("validation_command", "").strip()
+        and (r["id"] in wanted if wanted else r.get("status") in (STATUS_IN_PROGRESS, STATUS_FAILED, STATUS_DONE))
+    ]
+    if not gates:
+        print("No validation commands to run.")
+        return 0
+
+    root = Path(args.cwd).resolve() if args.cwd else _task_root(path)
+    cache_path = _verify_cache_path(path)
+    progress_path = path.parent / PROGRESS_FILE_NAME
+    state = _tree_state(root, {path, cache_path, progress_path, _resume_state_path(path)})
+    cache = {} if args.no_cache else _load_verify_cache(cache_path)
+
+    results: dict[str, dict[str, object]] = {}
+    pending = []
+    for item_id, command in gates:
+        if _gate_key(command, state) in cache:
+            results[item_id] = {"passed": True, "cached": True, "duration": 0.0, "output_tail": []}
+        else:
+            pending.append((item_id, command))
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        futures = {
+            item_id: pool.submit(_run_gate, command, cwd=root, timeout=args.timeout)
+            for item_id, command in pending
+        }
+        for item_id, future in futures.items():
+            results[item_id] = future.result()
+
+    # Re-read: the commands may have taken a while and the CSV may have moved on
+    schema, rows = _read_table(path)
+    rows_by_id = {r.get("id"): r for r in rows}
+    ordered = [(item_id, command, results[item_id]) for item_id, command in gates]
+    for item_id, command, result in ordered:
+        row = rows_by_id.get(item_id)
+        if row is None:
+            continue
+        if result["passed"]:
+            if not result["cached"]:
+                cache[_gate_key(command, state)] = {"command": command, "passed_at": _now_iso()}
+            if row.get("status") in (STATUS_IN_PROGRESS, STATUS_FAILED):
+                row["status"] = STATUS_DONE
+                row["done_at"] = _timestamp(schema)
+        else:
+            row["status"] = STATUS_FAILED
+            row["done_at"] = ""
+            retries = row.get("retry_count") or "0"
+            row["retry_count"] = str(int(retries) + 1 if _is_int(retries) else 1)
+            note = f"verify {_now_iso()}: {_failure_summary(result, args.timeout)}"
+            row["notes"] = f"{row['notes']} | {note}" if row.get("notes") else note
+
+    _atomic_write(path, rows, schema)
+    if not args.no_cache:
+        _save_verify_cache(cache_path, cache)
+    if schema is FULL_SCHEMA or progress_path.exists():
+        _append_progress(progress_path, rows_by_id, ordered, args.timeout)
+
+    if args.json:
+        payload = [{"id": i, "command": c, **r} for i, c, r in ordered]
+        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        for item_id, command, result in ordered:
+            if result["passed"]:
+                how = "cached" if result["cached"] else f"{result['duration']}s"
+                print(f"PASS #{item_id} ({how}): {command}")
+            else:
+                row = rows_by_id.get(item_id, {})
+                print(f"FAIL #{item_id} (retry_count={row.get('retry_count')}): {command} -> {_failure_summary(result, args.timeout)}")
+                for line in result["output_tail"]:
+                    print(f"    {line}")
+    return 0 if all(r["passed"] for _, _, r in ordered) else 1
+
+
+def _resume_state_path(csv_path: Path) -> Path:
+    return csv_path.parent / f".{csv_path.stem}.resume.json"
+
+
+def _file_stat(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _clip(text: object, limit: int = RESUME_LINE_CHARS) -> str:
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def _last_note(notes: str) -> str:
+    return _clip((notes or "").split(" | ")[-1])
+
+
+def _task_summary(rows: list[dict[str, str]]) -> dict[str, object]:
+    """The parts of the CSV a recovering agent needs: counts, resume point and failing gates."""
+    rows = _sorted_rows(rows)
+    current = next((r for r in rows if r.get("status") == STATUS_IN_PROGRESS), None)
+    current = current or next((r for r in rows if r.get("status") == STATUS_FAILED), None)
+    current = current or next((r for r in rows if r.get("status") != STATUS_DONE), None)
+    later = rows[rows.index(current) + 1 :] if current is not None else []
+    next_row = next((r for r in later if r.get("status") == STATUS_TODO), None)
+    failing = [r for r in rows if r.get("status") == STATUS_FAILED]
+
+    def gate(row: dict[str, str]) -> dict[str, str]:
+        return {
+            "id": row.get("id", ""),
+            "item": _clip(row.get("item")),
+            "status": row.get("status", ""),
+            "acceptance": _clip(row.get("acceptance_criteria")),
+            "validate": _clip(row.get("validation_command")),
+            "retry_count": row.get("retry_count", ""),
+            "last_note": _last_note(row.get("notes", "")),
+        }
+
+    return {
+        "total": len(rows),
+        "done": sum(1 for r in rows if r.get("status") == STATUS_DONE),
+        "current": gate(current) if current is not None else None,
+        "next": {"id": next_row.get("id", ""), "item": _clip(next_row.get("item"))} if next_row else None,
+        "failing": [gate(r) for r in failing[:RESUME_MAX_FAILING]],
+        "failing_total": len(failing),
+    }
+
+
+def _markdown_section(lines: list[str], title: str) -> list[str]:
+    """Non-empty bullet lines of a `## title` section."""
+    out: list[str] = []
+    inside = False
+    for line in lines:
+        if line.startswith("## "):
+            inside = line[3:].strip().lower() == title.lower()
+            continue
+        if inside:
+            if line.strip() == "---":
+                break
+            bullet = line.strip()
+            if bullet.startswith(("- ", "* ")) and bullet[2:].strip() not in ("", "[ ]"):
+                out.append(_clip(bullet[2:]))
+    return out
+
+
+def _spec_summary(spec_path: Path) -> dict[str, object] | None:
+    import hashlib
+
+    try:
+        data = spec_path.read_bytes()
+    except OSError:
+        return None
+    lines = data.decode("utf-8", "replace").splitlines()
+    return {
+        "stat": _file_stat(spec_path),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "goals": _markdown_section(lines, "Goals")[:5],
+        "done_when": _markdown_section(lines, "Done-When")[:5],
+    }
+
+
+def _spec_changed(spec_path: Path, spec: dict[str, object] | None) -> bool:
+    """Compare by stat first and only hash SPEC.md when its size or mtime moved."""
+    import hashlib
+
+    current_stat = _file_stat(spec_path)
+    if spec is None or current_stat is None:
+        return (spec is None) != (current_stat is None)
+    if spec.get("stat") == current_stat:
+        return False
+    try:
+        digest = hashlib.sha256(spec_path.read_bytes()).hexdigest()
+    except OSError:
+        return True
+    if digest != spec.get("sha256"):
+        return True
+    spec["stat"] = current_stat  # touched, not edited
+    return False
+
+
+def _scan_progress(text: str, heading: str, decisions: list[dict[str, str]]) -> str:
+    """Collect `Decision:` bullets (with their `## ` section) from PROGRESS.md text; returns the last heading."""
+    for line in text.splitlines():
+        if line.startswith("## "):
+            heading = line[3:].strip()
+            continue
+        bullet = line.strip().lstrip("-* ").replace("**", "")
+        if bullet[:9].lower() == "decision:":
+            value = bullet[9:].strip()
+            if value and value not in ("...", "…"):
+                decisions.append({"section": _clip(heading, 80), "text": _clip(value)})
+    del decisions[:-RESUME_MAX_DECISIONS]
+    return heading
+
+
+def _refresh_progress(progress_path: Path, progress: dict[str, object] | None) -> dict[str, object]:
+    """
+    Bring the PROGRESS.md part of the summary up to date. The Context Recovery Block is
+    re-read from the head of the file (bounded); decisions are parsed only from the bytes
+    appended since the last scan, as long as the bytes just before the old end are unchanged.
+    Anything else (truncation, edits in the middle) falls back to a full scan. `scan` records
+    which case applied: "missing", "first", "incremental" or "rescan".
+    """
+    import hashlib
+
+    empty = {"offset": 0, "anchor": "", "heading": "", "decisions": [], "recovery": [], "parsed_bytes": 0, "scan": "missing"}
+    if not progress_path.exists():
+        return empty
+    with progress_path.open("rb") as f:
+        head = f.read(RECOVERY_SCAN_BYTES)
+        size = f.seek(0, os.SEEK_END)
+        previous = b""
+        state = dict(empty)
+        # Without a previous offset there is nothing that could have been edited
+        state["scan"] = "rescan" if progress and int(progress.get("offset", 0)) > 0 else "first"
+        if state["scan"] == "rescan" and int(progress["offset"]) <= size:
+            offset = int(progress["offset"])
+            start = max(0, offset - PROGRESS_ANCHOR_BYTES)
+            f.seek(start)
+            previous = f.read(offset - start)
+            if hashlib.sha256(previous).hexdigest() == progress.get("anchor"):
+                state.update(
+                    offset=offset,
+                    heading=progress.get("heading", ""),
+                    decisions=list(progress.get("decisions", [])),
+                    scan="incremental",
+                )
+            else:
+                previous = b""
+        f.seek(state["offset"])
+        data = f.read()
+
+    # Only whole lines are consumed; a half-written last line is picked up next time
+    end = data.rfind(b"\n") + 1
+    state["heading"] = _scan_progress(data[:end].decode("utf-8", "replace"), state["heading"], state["decisions"])
+    state["offset"] += end
+    state["anchor"] = hashlib.sha256((previous + data[:end])[-PROGRESS_ANCHOR_BYTES:]).hexdigest()
+    state["parsed_bytes"] = end
+    head_lines = head.decode("utf-8", "replace").splitlines()
+    state["recovery"] = [
+        line for line in _markdown_section(head_lines, "Context Recovery Block") if not TEMPLATE_PLACEHOLDER_RE.search(line)
+    ][:8]
+    return state
+
+
+def _build_resume_state(csv_path: Path, schema: Schema, rows: list[dict[str, str]]) -> dict[str, object]:
+    # SPEC.md / PROGRESS.md only belong to the CSV in a taskmaster FULL task directory
+    task_files = schema is FULL_SCHEMA
+    return {
+        "version": RESUME_STATE_VERSION,
+        "schema": schema.name,
+        "csv": _file_stat(csv_path),
+        "statuses": {r.get("id", ""): r.get("status", "") for r in rows},
+        "tasks": _task_summary(rows),
+        "transitions": [],
+        "spec": _spec_summary(csv_path.parent / SPEC_FILE_NAME) if task_files else None,
+        "progress": _refresh_progress(csv_path.parent / PROGRESS_FILE_NAME, None) if task_files else None,
+        "updated_at": _now_iso(),
+    }
+
+
+def _load_resume_state(path: Path) -> dict[str, object] | None:
+    import json
+
+    try:
+        state = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get("version") != RESUME_STATE_VERSION or state.get("schema") not in SCHEMAS:
+        return None
+    return state
+
+
+def _record_transition(csv_path: Path, rows: list[dict[str, str]], schema: Schema) -> None:
+    """
+    Keep the resume summary in step with a CSV write made by this tool. FULL task
+    directories always get one; other layouts only once `resume` has created it.
+    """
+    state_path = _resume_state_path(csv_path)
+    state = _load_resume_state(state_path)
+    try:
+        if state is None:
+            if schema is not FULL_SCHEMA:
+                return
+            state = _build_resume_state(csv_path, schema, rows)
+        else:
+            previous = state.get("statuses", {})
+            stamp = dt.datetime.now().strftime("%Y-%m-%d %H:%M")
+            transitions = state.setdefault("transitions", [])
+            for row in _sorted_rows(rows):
+                before, after = previous.get(row.get("id", "")), row.get("status", "")
+                if before != after:
+                    transitions.append(f"{stamp} #{row.get('id')} {before or 'NEW'} -> {after}")
+            del transitions[:-RESUME_MAX_TRANSITIONS]
+            state.update(
+                schema=schema.name,
+                csv=_file_stat(csv_path),
+                statuses={r.get("id", ""): r.get("status", "") for r in rows},
+                tasks=_task_summary(rows),
+                updated_at=_now_iso(),
+            )
+        _write_json_atomic(state_path, state)
+    except OSError:
+        # The summary is only a cache; a stale one is detected and rebuilt by `resume`
+        pass
+
+
+def _resume_brief(csv_path: Path, state: dict[str, object], *, recent: int, how: str) -> dict[str, object]:
+    progress = state.get("progress") or {}
+    spec = state.get("spec") or {}
+    return {
+        "file": str(csv_path),
+        "schema": state.get("schema"),
+        "spec_sha256": spec.get("sha256"),
+        "goals": spec.get("goals", []),
+        "done_when": spec.get("done_when", []),
+        **state["tasks"],
+        "recovery_block": progress.get("recovery", []),
+        "last_progress_entry": progress.get("heading", ""),
+        "decisions": progress.get("decisions", [])[-recent:] if recent > 0 else [],
+        "transitions": state.get("transitions", [])[-recent:] if recent > 0 else [],
+        "summary": how,
+    }
+
+
+def _format_brief(brief: dict[str, object], max_chars: int) -> str:
+    lines = [f"Task: {brief['file']} ({brief['schema']})"]
+    if brief["spec_sha256"]:
+        lines.append(f"Spec: sha256 {brief['spec_sha256'][:12]}")
+    for title, key in (("Goals", "goals"), ("Done-when", "done_when")):
+        if brief[key]:
+            lines.append(f"{title}:")
+            lines.extend(f"  - {g}" for g in brief[key])
+    lines.append(f"Progress: {brief['done']}/{brief['total']} DONE")
+    current = brief["current"]
+    if current:
+        retry = f" retry_count={current['retry_count']}" if current["retry_count"] not in ("", "0") else ""
+        lines.append(f"Current: #{current['id']} {current['item']} [{current['status']}]{retry}")
+        for label, key in (("Acceptance", "acceptance"), ("Validate", "validate"), ("Last note", "last_note")):
+            if current[key]:
+                lines.append(f"  {label}: {current[key]}")
+    else:
+        lines.append("Current: none (all rows DONE)")
+    if brief["next"]:
+        lines.append(f"Next: #{brief['next']['id']} {brief['next']['item']}")
+    if brief["failing_total"]:
+        lines.append(f"Failing gates ({brief['failing_total']}):")
+        for g in brief["failing"]:
+            note = f" -> {g['last_note']}" if g["last_note"] else ""
+            lines.append(f"  #{g['id']} {g['item']} (retry_count={g['retry_count']}): {g['validate']}{note}")
+    if brief["recovery_block"]:
+        lines.append("Recovery block (PROGRESS.md):")
+        lines.extend(f"  - {line}" for line in brief["recovery_block"])
+    if brief["last_progress_entry"]:
+        lines.append(f"Last PROGRESS.md entry: {brief['last_progress_entry']}")
+    if brief["decisions"]:
+        lines.append("Recent decisions:")
+        lines.extend(f"  - [{d['section']}] {d['text']}" for d in brief["decisions"])
+    if brief["transitions"]:
+        lines.append("Recent transitions:")
+        lines.extend(f"  - {t}" for t in brief["transitions"])
+    lines.append(f"Summary: {brief['summary']}")
+
+    text = "\n".join(lines)
+    if len(text) > max_chars:
+        text = text[: max(0, max_chars - 40)].rsplit("\n", 1)[0] + f"\n… (brief truncated at {max_chars} chars)"
+    return text
+
+
+def cmd_resume(args: argparse.Namespace) -> int:
+    import json
+
+    path = _csv_path(args.file)
+    if not path.exists():
+        print(f"CSV not found: {path}", file=sys.stderr)
+        return 2
+
+    state_path = _resume_state_path(path)
+    state = None if args.rebuild else _load_resume_state(state_path)
+    reason = None
+    if state is None:
+        reason = "--rebuild" if args.rebuild else "no summary yet"
+    elif state.get("csv") != _file_stat(path):
+        reason = f"{path.name} changed outside todo_csv.py"
+    elif state.get("schema") == FULL_SCHEMA.name and _spec_changed(path.parent / SPEC_FILE_NAME, state.get("spec")):
+        reason = f"{SPEC_FILE_NAME} changed"
+
+    if reason is not None:
+        schema, rows = _read_table(path)
+        transitions = state.get("transitions", []) if state else []
+        state = _build_resume_state(path, schema, rows)
+        state["transitions"] = transitions
+        how = f"rebuilt ({reason})"
+    else:
+        how = "incremental"
+        if state.get("schema") == FULL_SCHEMA.name:
+            state["progress"] = _refresh_progress(path.parent / PROGRESS_FILE_NAME, state.get("progress"))
+            scan = state["progress"].get("scan")
+            if scan == "rescan":
+                how = f"incremental ({PROGRESS_FILE_NAME} was edited, rescanned)"
+            elif scan == "first":
+                how = f"incremental (first scan of {PROGRESS_FILE_NAME})"
+            elif scan == "missing":
+                how = f"incremental (no {PROGRESS_FILE_NAME})"
+            else:
+                how = f"incremental ({state['progress']['parsed_bytes']} new bytes of {PROGRESS_FILE_NAME})"
+    _write_json_atomic(state_path, state)
+
+    brief = _resume_brief(path, state, recent=args.recent, how=how)
+    if args.json:
+        json.dump(brief, sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        print(_format_brief(brief, args.max_chars))
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="todo_csv.py")
     sub = p.add_subparsers(dest="cmd", required=True)
@@ -440,11 +1205,21 @@ def build_parser() -> argparse.ArgumentParser:
         help="Do not set the first item to IN_PROGRESS (default: first item is IN_PROGRESS).",
     )
     p_init.add_argument("--item", nargs="+", default=[], help="One or more TODO items.")
+    p_init.add_argument(
+        "--schema",
+        choices=sorted(SCHEMAS),
+        default=LITE_SCHEMA.name,
+        help="CSV layout: lite (todo-list-csv), taskmaster-lite, or full (taskmaster FULL mode TODO.csv).",
+    )
+    p_init.add_argument("--acceptance", help="acceptance_criteria for the given items (full schema).")
+    p_init.add_argument("--validate", help="validation_command for the given items (full schema).")
     p_init.set_defaults(fn=cmd_init)
 
     p_add = sub.add_parser("add", help="Append TODO items.")
     p_add.add_argument("--file", required=True)
     p_add.add_argument("--item", nargs="+", required=True)
+    p_add.add_argument("--acceptance", help="acceptance_criteria for the added items (full schema).")
+    p_add.add_argument("--validate", help="validation_command for the added items (full schema).")
     p_add.set_defaults(fn=cmd_add)
 
     p_start = sub.add_parser("start", help="Set exactly one item as IN_PROGRESS.")
@@ -491,6 +1266,30 @@ def build_parser() -> argparse.ArgumentParser:
     p_status.add_argument("--verbose", action="store_true")
     p_status.set_defaults(fn=cmd_status)
 
+    p_verify = sub.add_parser(
+        "verify",
+        help="Run validation_command gates (full schema) in parallel and update status/retry_count.",
+    )
+    p_verify.add_argument("--file", required=True, help="TODO.csv or its .codex-tasks/<task-name>/ directory.")
+    p_verify.add_argument("--id", type=int, nargs="+", help="Only these rows (default: IN_PROGRESS, FAILED and DONE rows).")
+    p_verify.add_argument("--jobs", type=int, default=min(4, os.cpu_count() or 1), help="Commands run in parallel.")
+    p_verify.add_argument("--timeout", type=float, default=VERIFY_TIMEOUT_SECONDS, help="Per-command timeout in seconds.")
+    p_verify.add_argument("--cwd", help="Directory to run commands in (default: the project root).")
+    p_verify.add_argument("--no-cache", action="store_true", help="Ignore and do not record cached passes.")
+    p_verify.add_argument("--json", action="store_true")
+    p_verify.set_defaults(fn=cmd_verify)
+
+    p_resume = sub.add_parser(
+        "resume",
+        help="Print a bounded context-recovery brief from an incrementally maintained summary.",
+    )
+    p_resume.add_argument("--file", required=True, help="TODO CSV or its .codex-tasks/<task-name>/ directory.")
+    p_resume.add_argument("--recent", type=int, default=5, help="Decisions and transitions to show.")
+    p_resume.add_argument("--max-chars", type=int, default=RESUME_BRIEF_MAX_CHARS, help="Upper bound on the brief size.")
+    p_resume.add_argument("--rebuild", action="store_true", help="Ignore the stored summary and rebuild it.")
+    p_resume.add_argument("--json", action="store_true")
+    p_resume.set_defaults(fn=cmd_resume)
+
     p_cleanup = sub.add_parser("cleanup", help="Delete CSV if all items are DONE.")
     p_cleanup.add_argument("--file", required=True)
     p_cleanup.set_defaults(fn=cmd_cleanup)
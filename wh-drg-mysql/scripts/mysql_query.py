@@ -93,6 +93,228 @@ def _build_mysql_command(
     return command
 
 
+class Target:
+    """
+    One database from a targets file. Plain slotted classes rather than dataclasses:
+    `dataclasses` imports `inspect`, which the single-query path should not pay for.
+    """
+
+    __slots__ = ("name", "host", "port", "user", "password", "database", "timeout")
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        host: str,
+        port: int,
+        user: str,
+        password: str | None,
+        database: str,
+        timeout: float,
+    ) -> None:
+        self.name = name
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.database = database
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f"Target(name={self.name!r}, host={self.host!r}, port={self.port}, database={self.database!r})"
+
+
+class TargetResult:
+    __slots__ = ("target", "status", "header", "rows", "elapsed_ms", "error")
+
+    def __init__(
+        self,
+        target: Target,
+        status: str,  # ok / error / timeout
+        header: str | None,
+        rows: list[str],
+        elapsed_ms: float,
+        error: str = "",
+    ) -> None:
+        self.target = target
+        self.status = status
+        self.header = header
+        self.rows = rows
+        self.elapsed_ms = elapsed_ms
+        self.error = error
+
+
+def _load_targets(
+    path: str,
+    defaults: dict[str, object],
+    timeout: float,
+    only: list[str] | None,
+) -> list[Target]:
+    """
+    Targets file (JSON): {"defaults": {...}, "targets": [{"name", "host", ...}]} or a bare list.
+    Each entry may set host/port/user/password/database/timeout; credentials can be
+    referenced via user_env/password_env instead of being written into the file.
+    """
+    import json
+
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise FileNotFoundError(f"无法读取 targets 文件：{path}（{exc}）") from exc
+    except ValueError as exc:
+        raise ValueError(f"targets 文件不是合法的 JSON：{path}（{exc}）") from exc
+
+    file_defaults: dict[str, object] = {}
+    entries = data
+    if isinstance(data, dict):
+        file_defaults = data.get("defaults") or {}
+        entries = data.get("targets")
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("targets 文件中没有目标（需要 targets 列表）")
+
+    targets: list[Target] = []
+    seen: set[str] = set()
+    for index, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            raise ValueError(f"第 {index} 个目标不是对象")
+        merged = {**defaults, **file_defaults, **entry}
+        for key in ("user", "password"):
+            env_name = merged.get(f"{key}_env")
+            if env_name:
+                value = os.environ.get(str(env_name))
+                if value is None:
+                    raise ValueError(f"目标 {merged.get('name', index)} 引用的环境变量 {env_name} 未设置")
+                merged[key] = value
+        name = str(merged.get("name") or merged.get("host") or f"target{index}")
+        if not merged.get("host"):
+            raise ValueError(f"目标 {name} 缺少 host")
+        if name in seen:
+            raise ValueError(f"目标名称重复：{name}")
+        seen.add(name)
+        try:
+            targets.append(
+                Target(
+                    name=name,
+                    host=str(merged["host"]),
+                    port=int(merged["port"]),
+                    user=str(merged["user"]),
+                    password=None if merged.get("password") is None else str(merged["password"]),
+                    database=str(merged["database"]),
+                    timeout=float(merged.get("timeout") or timeout),
+                )
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ValueError(f"目标 {name} 配置无效：{exc}") from exc
+
+    if only:
+        missing = set(only) - seen
+        if missing:
+            raise ValueError(f"targets 文件中不存在：{', '.join(sorted(missing))}")
+        targets = [t for t in targets if t.name in only]
+    return targets
+
+
+def _query_target(
+    mysql_executable: str,
+    target: Target,
+    sql: bytes,
+    no_header: bool,
+) -> TargetResult:
+    import math
+    import time
+
+    defaults_file = _write_defaults_file(
+        host=target.host,
+        port=target.port,
+        user=target.user,
+        password=target.password,
+    )
+    started = time.perf_counter()
+    try:
+        command = _build_mysql_command(
+            mysql_executable=mysql_executable,
+            defaults_file=defaults_file,
+            database=target.database,
+            no_header=no_header,
+        )
+        command.append(f"--connect-timeout={max(1, math.ceil(target.timeout))}")
+        try:
+            completed = subprocess.run(command, input=sql, capture_output=True, timeout=target.timeout, check=False)
+        except subprocess.TimeoutExpired:
+            elapsed = (time.perf_counter() - started) * 1000
+            return TargetResult(target, "timeout", None, [], elapsed, f"超时（{target.timeout:g}s）")
+        except OSError as exc:
+            elapsed = (time.perf_counter() - started) * 1000
+            return TargetResult(target, "error", None, [], elapsed, str(exc))
+        elapsed = (time.perf_counter() - started) * 1000
+
+        if completed.returncode != 0:
+            message = completed.stderr.decode("utf-8", "replace").strip() or f"mysql 退出码 {completed.returncode}"
+            return TargetResult(target, "error", None, [], elapsed, message)
+        lines = completed.stdout.decode("utf-8", "replace").splitlines()
+        if no_header or not lines:
+            return TargetResult(target, "ok", None, lines, elapsed)
+        return TargetResult(target, "ok", lines[0], lines[1:], elapsed)
+    finally:
+        try:
+            Path(defaults_file).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def _print_target_summary(results: list[TargetResult], total_ms: float) -> None:
+    width = max([len("target")] + [len(r.target.name) for r in results])
+    print(f"{'target':<{width}}  {'status':<7}  {'rows':>6}  {'ms':>9}  error", file=sys.stderr)
+    for result in sorted(results, key=lambda r: r.target.name):
+        error = result.error.splitlines()[0] if result.error else ""
+        print(
+            f"{result.target.name:<{width}}  {result.status:<7}  {len(result.rows):>6}  {result.elapsed_ms:>9.1f}  {error}",
+            file=sys.stderr,
+        )
+    ok = sum(1 for r in results if r.status == "ok")
+    slowest = max(results, key=lambda r: r.elapsed_ms)
+    print(
+        f"{len(results)} 个目标：{ok} 成功，{len(results) - ok} 失败；"
+        f"总耗时 {total_ms:.1f} ms，最慢 {slowest.target.name}（{slowest.elapsed_ms:.1f} ms）",
+        file=sys.stderr,
+    )
+
+
+def _run_targets(
+    mysql_executable: str,
+    targets: list[Target],
+    sql: bytes,
+    no_header: bool,
+    concurrency: int,
+) -> int:
+    """
+    Run `sql` against every target with at most `concurrency` mysql clients at once.
+    Rows are printed as each target finishes, prefixed with a `target` column.
+    """
+    # Only --targets runs need these; a single query keeps to the mysql client's startup
+    import time
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    started = time.perf_counter()
+    results: list[TargetResult] = []
+    last_header: str | None = None
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = [pool.submit(_query_target, mysql_executable, t, sql, no_header) for t in targets]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.status != "ok":
+                continue
+            if result.header is not None and result.header != last_header:
+                sys.stdout.write(f"target\t{result.header}\n")
+                last_header = result.header
+            sys.stdout.writelines(f"{result.target.name}\t{row}\n" for row in result.rows)
+            sys.stdout.flush()
+
+    _print_target_summary(results, (time.perf_counter() - started) * 1000)
+    return 0 if all(r.status == "ok" for r in results) else 1
+
+
 def main() -> int:
     default_host = _first_env("WH_DRG_MYSQL_HOST", "MYSQL_HOST") or "127.0.0.1"
     default_port = _env_int("WH_DRG_MYSQL_PORT", "MYSQL_PORT") or 3306
@@ -122,6 +344,12 @@ def main() -> int:
 
     parser.add_argument("--no-header", action="store_true", help="Suppress column names.")
 
+    targets_group = parser.add_argument_group("multiple databases")
+    targets_group.add_argument("--targets", default=None, help="JSON targets file; run the query against every target.")
+    targets_group.add_argument("--only", nargs="+", default=None, help="Only these target names.")
+    targets_group.add_argument("--concurrency", type=int, default=4, help="Targets queried at once (default: 4).")
+    targets_group.add_argument("--timeout", type=float, default=30.0, help="Per-target timeout in seconds (default: 30).")
+
     args = parser.parse_args()
 
     sql: str | None = None
@@ -135,6 +363,28 @@ def main() -> int:
         sql_file = args.sql_file
 
     mysql_executable = _resolve_mysql_executable(args.mysql_exe)
+
+    if args.targets:
+        targets = _load_targets(
+            args.targets,
+            defaults={
+                "port": args.port,
+                "user": args.user,
+                "password": args.password,
+                "database": args.database,
+            },
+            timeout=args.timeout,
+            only=args.only,
+        )
+        if sql is not None:
+            sql_bytes = sql.encode("utf-8")
+        else:
+            sql_path = Path(sql_file or "")
+            if not sql_path.exists():
+                raise FileNotFoundError(f"SQL 文件不存在：{sql_path}")
+            sql_bytes = sql_path.read_bytes()
+        return _run_targets(mysql_executable, targets, sql_bytes, args.no_header, args.concurrency)
+
     defaults_file = _write_defaults_file(
         host=args.host,
         port=args.port,